@@ -1,82 +1,582 @@
-"""
-Algebra Module
-Contains algebraic operations and equation solving capabilities.
-"""
-import numpy as np
-from typing import List, Tuple, Union
-
-class Algebra:
-    @staticmethod
-    def solve_quadratic(a: float, b: float, c: float) -> Tuple[float, float]:
-        """
-        Solve quadratic equation ax² + bx + c = 0
-        Returns tuple of solutions (x1, x2)
-        Raises:
-            ValueError: If equation has no real solutions
-        """
-        discriminant = b**2 - 4*a*c
-        if discriminant < 0:
-            raise ValueError("No real solutions exist")
-        
-        x1 = (-b + np.sqrt(discriminant)) / (2*a)
-        x2 = (-b - np.sqrt(discriminant)) / (2*a)
-        return x1, x2
-
-    @staticmethod
-    def solve_linear_system(coefficients: List[List[float]], constants: List[float]) -> List[float]:
-        """
-        Solve system of linear equations using numpy
-        Args:
-            coefficients: Matrix of coefficients
-            constants: Vector of constants
-        Returns:
-            List of solutions
-        Raises:
-            ValueError: If system has no solution or infinite solutions
-        """
-        try:
-            return list(np.linalg.solve(np.array(coefficients), np.array(constants)))
-        except np.linalg.LinAlgError:
-            raise ValueError("System has no unique solution")
-
-    @staticmethod
-    def polynomial_roots(coefficients: List[float]) -> List[float]:
-        """
-        Find roots of a polynomial
-        Args:
-            coefficients: List of coefficients [an, an-1, ..., a1, a0]
-        Returns:
-            List of roots (may include complex numbers)
-        """
-        return list(np.roots(coefficients))
-
-    @staticmethod
-    def matrix_operations(matrix_a: List[List[float]], matrix_b: List[List[float]], operation: str) -> List[List[float]]:
-        """
-        Perform matrix operations
-        Args:
-            matrix_a: First matrix
-            matrix_b: Second matrix
-            operation: One of 'add', 'subtract', 'multiply'
-        Returns:
-            Resulting matrix
-        Raises:
-            ValueError: If matrices have incompatible dimensions
-        """
-        a = np.array(matrix_a)
-        b = np.array(matrix_b)
-        
-        if operation == 'add':
-            if a.shape != b.shape:
-                raise ValueError("Matrices must have same dimensions for addition")
-            return (a + b).tolist()
-        elif operation == 'subtract':
-            if a.shape != b.shape:
-                raise ValueError("Matrices must have same dimensions for subtraction")
-            return (a - b).tolist()
-        elif operation == 'multiply':
-            if a.shape[1] != b.shape[0]:
-                raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
-            return np.matmul(a, b).tolist()
-        else:
-            raise ValueError("Invalid operation. Must be 'add', 'subtract', or 'multiply'")
+"""
+Algebra Module
+Contains algebraic operations and equation solving capabilities.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import warnings
+from collections import OrderedDict
+import numpy as np
+from typing import List, Optional, Tuple, Union
+from numpy.typing import ArrayLike
+import instrument
+from lazy import lazy_import
+
+# SciPy sub-packages load on first use; most operations only need NumPy
+io = lazy_import('scipy.io')
+linalg = lazy_import('scipy.linalg')
+sparse = lazy_import('scipy.sparse')
+sparse_linalg = lazy_import('scipy.sparse.linalg')
+
+# Systems up to this size are solved directly even when sparse
+_DIRECT_SOLVE_MAX_SIZE = 5000
+# Above this fill ratio a sparse matrix gains little from iterative methods
+_DIRECT_SOLVE_MIN_DENSITY = 0.05
+
+
+@functools.lru_cache(maxsize=None)
+def _rtol_keyword() -> str:
+    """Name of the iterative solvers' tolerance argument (SciPy 1.12 renamed tol to rtol)."""
+    return 'rtol' if 'rtol' in inspect.signature(sparse_linalg.cg).parameters else 'tol'
+
+
+def _is_sparse(value) -> bool:
+    """sparse.issparse that does not load scipy.sparse for dense inputs."""
+    return type(value).__module__.startswith('scipy.sparse') and sparse.issparse(value)
+
+
+class Algebra:
+    @staticmethod
+    def solve_quadratic(a: float, b: float, c: float) -> Tuple[float, float]:
+        """
+        Solve quadratic equation ax² + bx + c = 0
+        Returns tuple of solutions (x1, x2)
+        Raises:
+            ValueError: If equation has no real solutions or a is zero
+        """
+        if a == 0:
+            raise ValueError("Not a quadratic equation: a must be non-zero")
+        discriminant = b**2 - 4*a*c
+        if discriminant < 0:
+            raise ValueError("No real solutions exist")
+
+        x1, x2 = Algebra.solve_quadratic_batch(a, b, c)
+        return x1[()], x2[()]
+
+    @staticmethod
+    def solve_quadratic_batch(a: ArrayLike, b: ArrayLike, c: ArrayLike,
+                              complex_roots: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Solve many quadratic equations ax² + bx + c = 0 at once
+        Uses the cancellation-free form q = -(b + sign(b)·sqrt(b² - 4ac)) / 2,
+        x = q / a and x = c / q.
+        Args:
+            a, b, c: Coefficient arrays (broadcast against each other)
+            complex_roots: Return complex roots instead of NaN when the
+                           discriminant is negative
+        Returns:
+            Tuple of root arrays (x1, x2) with x1 the '+sqrt' root, as in
+            solve_quadratic. Without complex_roots, NaN marks equations with
+            no real solution. When a == 0 the single linear root -c/b is
+            returned in x1 and x2 is NaN (both NaN if b is also zero).
+        """
+        a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+        dtype = complex if complex_roots else float
+        discriminant = (b * b - 4 * a * c).astype(dtype)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            root = np.sqrt(discriminant)
+            # copysign and signbit agree on the sign of b, including b == -0.0
+            negative = np.signbit(b)
+            q = -0.5 * (b + np.copysign(1.0, b) * root)
+            near, far = q / a, c / q
+            plus = np.where(negative, near, far)
+            minus = np.where(negative, far, near)
+            # q == 0 only when b == c == 0, so both roots are zero
+            plus = np.where(q == 0, 0.0, plus)
+            minus = np.where(q == 0, 0.0, minus)
+
+            linear = a == 0
+            plus = np.where(linear, -c / b, plus)
+            minus = np.where(linear, np.nan, minus)
+            plus = np.where(linear & (b == 0), np.nan, plus)
+        return plus, minus
+
+    @staticmethod
+    def solve_linear_system(coefficients: List[List[float]], constants: List[float],
+                            use_cache: bool = True) -> List[float]:
+        """
+        Solve system of linear equations
+        Args:
+            coefficients: Matrix of coefficients
+            constants: Vector of constants, or an (n, m) matrix of m right-hand sides
+            use_cache: Reuse the factorization of a previously seen coefficient matrix
+        Returns:
+            List of solutions
+        Raises:
+            ValueError: If system has no solution or infinite solutions
+        """
+        if _is_sparse(coefficients):
+            return list(Algebra.solve_sparse_system(coefficients, constants)['solution'])
+        if use_cache:
+            solver = factorization_cache.get(coefficients)
+        else:
+            solver = LinearSolver(coefficients)
+        return list(solver.solve(constants))
+
+    @staticmethod
+    def load_sparse_matrix(source, shape: Optional[Tuple[int, int]] = None) -> 'sparse.csr_matrix':
+        """
+        Build a CSR matrix from COO triplets, a file, or an existing matrix
+        Args:
+            source: (rows, cols, values) triplets, a path to a .npz (scipy.sparse.save_npz)
+                    or Matrix Market .mtx file, a scipy.sparse matrix, or a dense array
+            shape: Matrix shape for triplets (inferred from the largest indices if omitted)
+        Returns:
+            Matrix in CSR format
+        """
+        if sparse.issparse(source):
+            return source.tocsr()
+        if isinstance(source, (str, os.PathLike)):
+            if os.fspath(source).endswith('.npz'):
+                return sparse.load_npz(source).tocsr()
+            return sparse.csr_matrix(io.mmread(source))
+        if isinstance(source, tuple) and len(source) == 3:
+            rows, cols, values = (np.asarray(part) for part in source)
+            # Duplicate (row, col) entries are summed, as in finite-element assembly
+            return sparse.coo_matrix((values.astype(float), (rows, cols)), shape=shape).tocsr()
+        return sparse.csr_matrix(np.asarray(source, dtype=float))
+
+    @staticmethod
+    def solve_sparse_system(coefficients, constants: ArrayLike, method: str = 'auto',
+                            preconditioner: Optional[str] = 'auto', tol: float = 1e-8,
+                            maxiter: Optional[int] = None) -> dict:
+        """
+        Solve a sparse system of linear equations
+        Args:
+            coefficients: Anything accepted by load_sparse_matrix
+            constants: Vector of constants
+            method: 'auto', 'direct', 'cg', 'gmres' or 'bicgstab'; 'auto' solves
+                    small or dense-ish systems directly, uses CG for symmetric
+                    matrices with a positive diagonal and GMRES otherwise
+            preconditioner: 'auto', 'jacobi', 'ilu' or None (iterative methods only)
+            tol: Relative residual target for iterative methods
+            maxiter: Maximum number of iterations for iterative methods
+        Returns:
+            Dictionary with 'solution', 'method', 'iterations', 'residual'
+            (relative residual norm) and 'converged'
+        Raises:
+            ValueError: If the matrix is not square or the direct solve fails
+        """
+        matrix = Algebra.load_sparse_matrix(coefficients)
+        rhs = np.asarray(constants, dtype=float)
+        n = matrix.shape[0]
+        if matrix.shape[1] != n:
+            raise ValueError("Coefficient matrix must be square")
+        if rhs.shape != (n,):
+            raise ValueError("Number of constants must match the number of equations")
+
+        if method == 'auto':
+            method = Algebra._choose_sparse_method(matrix)
+        if method not in ('direct', 'cg', 'gmres', 'bicgstab'):
+            raise ValueError("Invalid method. Choose 'auto', 'direct', 'cg', 'gmres', or 'bicgstab'")
+
+        iterations = 0
+        if method == 'direct':
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', sparse_linalg.MatrixRankWarning)
+                try:
+                    solution = sparse_linalg.spsolve(matrix.tocsc(), rhs)
+                except (RuntimeError, sparse_linalg.MatrixRankWarning):
+                    raise ValueError("System has no unique solution")
+            converged = True
+        else:
+            if preconditioner == 'auto':
+                preconditioner = 'jacobi' if method == 'cg' else 'ilu'
+            operator = Algebra._preconditioner(matrix, preconditioner)
+
+            def count(*_):
+                nonlocal iterations
+                iterations += 1
+
+            solver = getattr(sparse_linalg, method)
+            options = {_rtol_keyword(): tol, 'maxiter': maxiter, 'M': operator, 'callback': count}
+            if method == 'gmres':
+                # Count inner iterations rather than restart cycles
+                options['callback_type'] = 'pr_norm'
+            solution, info = solver(matrix, rhs, **options)
+            converged = info == 0
+
+        norm = np.linalg.norm(rhs)
+        residual = np.linalg.norm(rhs - matrix @ solution) / (norm if norm > 0 else 1.0)
+        return {
+            'solution': solution,
+            'method': method,
+            'iterations': iterations,
+            'residual': float(residual),
+            'converged': bool(converged)
+        }
+
+    @staticmethod
+    def _choose_sparse_method(matrix: 'sparse.csr_matrix') -> str:
+        """Pick a solver from the size, density and symmetry of a sparse matrix."""
+        n = matrix.shape[0]
+        density = matrix.nnz / float(n * n) if n else 1.0
+        if n <= _DIRECT_SOLVE_MAX_SIZE or density >= _DIRECT_SOLVE_MIN_DENSITY:
+            return 'direct'
+        asymmetry = abs(matrix - matrix.T)
+        if asymmetry.nnz == 0 or asymmetry.max() <= 1e-12 * abs(matrix).max():
+            if np.all(matrix.diagonal() > 0):
+                return 'cg'
+        return 'gmres'
+
+    @staticmethod
+    def _preconditioner(matrix: 'sparse.csr_matrix', kind: Optional[str]):
+        """Build a preconditioner operator approximating the inverse of matrix."""
+        if kind is None:
+            return None
+        if kind == 'ilu':
+            try:
+                ilu = sparse_linalg.spilu(matrix.tocsc(), drop_tol=1e-4, fill_factor=10)
+                return sparse_linalg.LinearOperator(matrix.shape, ilu.solve)
+            except RuntimeError:
+                # Singular incomplete factors; Jacobi is always available
+                kind = 'jacobi'
+        if kind == 'jacobi':
+            diagonal = matrix.diagonal()
+            inverse = np.where(diagonal != 0, 1.0 / np.where(diagonal != 0, diagonal, 1.0), 1.0)
+            return sparse.diags(inverse)
+        raise ValueError("Invalid preconditioner. Choose 'auto', 'jacobi', 'ilu', or None")
+
+    @staticmethod
+    def polynomial_roots(coefficients: List[float]) -> List[float]:
+        """
+        Find roots of a polynomial
+        Args:
+            coefficients: List of coefficients [an, an-1, ..., a1, a0]
+        Returns:
+            List of roots (may include complex numbers)
+        """
+        return list(np.roots(coefficients))
+
+    @staticmethod
+    def polynomial_roots_batch(coefficients: ArrayLike, polish: bool = False,
+                               iterations: int = 2) -> np.ndarray:
+        """
+        Find roots of many polynomials of the same degree at once
+        Degrees 1 and 2 use closed forms; higher degrees use one stacked
+        eigenvalue solve over all companion matrices.
+        Args:
+            coefficients: Array of shape (k, degree + 1), highest degree first
+            polish: Refine the roots with Newton steps on the original polynomials
+            iterations: Number of Newton steps when polishing
+        Returns:
+            Complex array of shape (k, degree); rows whose leading coefficient is
+            zero have NaN in place of the missing roots
+        """
+        coeffs = np.atleast_2d(np.asarray(coefficients, dtype=float))
+        k, degree = coeffs.shape[0], coeffs.shape[1] - 1
+        roots = np.full((k, degree), np.nan, dtype=complex)
+        if degree < 1:
+            return roots
+
+        full = coeffs[:, 0] != 0
+        lead = coeffs[full]
+        if degree == 1:
+            roots[full, 0] = -lead[:, 1] / lead[:, 0]
+        elif degree == 2:
+            x1, x2 = Algebra.solve_quadratic_batch(lead[:, 0], lead[:, 1], lead[:, 2],
+                                                   complex_roots=True)
+            roots[full] = np.stack([x1, x2], axis=-1)
+        else:
+            # Companion matrices of the monic polynomials, as built by np.roots
+            companion = np.zeros((len(lead), degree, degree))
+            companion[:, 0, :] = -lead[:, 1:] / lead[:, :1]
+            companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+            roots[full] = np.linalg.eigvals(companion)
+
+        # Lower-degree rows are rare; solve them one by one and pad with NaN
+        for row in np.flatnonzero(~full):
+            found = np.roots(coeffs[row])
+            roots[row, :len(found)] = found
+
+        if polish:
+            roots = Algebra.polish_roots(coeffs, roots, iterations)
+        return roots
+
+    @staticmethod
+    def polynomial_evaluate(coefficients: ArrayLike, x: ArrayLike) -> np.ndarray:
+        """
+        Evaluate polynomials with Horner's method, vectorized over coefficients and points
+        Args:
+            coefficients: Array of shape (..., degree + 1), highest degree first
+            x: Points, broadcast against coefficients[..., 0] (real or complex)
+        Returns:
+            Values p(x)
+        """
+        coeffs = np.asarray(coefficients)
+        result = np.zeros(np.broadcast_shapes(coeffs.shape[:-1], np.shape(x)),
+                          dtype=np.result_type(coeffs, x, float))
+        for j in range(coeffs.shape[-1]):
+            result *= x
+            result += coeffs[..., j]
+        return result
+
+    @staticmethod
+    def polish_roots(coefficients: ArrayLike, roots: ArrayLike, iterations: int = 2) -> np.ndarray:
+        """
+        Refine polynomial roots with vectorized Newton steps
+        Args:
+            coefficients: Array of shape (k, degree + 1), highest degree first
+            roots: Array of shape (k, m) of approximate roots
+            iterations: Number of Newton steps
+        Returns:
+            Polished roots; entries with a zero derivative or NaN are left unchanged
+        """
+        coeffs = np.atleast_2d(np.asarray(coefficients, dtype=float))
+        z = np.array(roots, dtype=complex)
+        degree = coeffs.shape[1] - 1
+        derivative = coeffs[:, :-1] * np.arange(degree, 0, -1)
+        # (k, 1, degree + 1) so each row's coefficients meet that row's roots
+        p, dp = coeffs[:, None, :], derivative[:, None, :]
+        for _ in range(iterations):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = Algebra.polynomial_evaluate(p, z) / Algebra.polynomial_evaluate(dp, z)
+            z = np.where(np.isfinite(step), z - step, z)
+        return z
+
+    @staticmethod
+    def matrix_operations(matrix_a: Union[List[List[float]], ArrayLike],
+                          matrix_b: Optional[Union[List[List[float]], ArrayLike]] = None,
+                          operation: str = 'multiply',
+                          out: Optional[np.ndarray] = None) -> Union[List[List[float]], np.ndarray]:
+        """
+        Perform matrix operations
+        NumPy arrays and other buffer-protocol objects are used without copying,
+        and stacked (..., n, m) inputs are processed as batches.
+        Args:
+            matrix_a: First matrix (or stack of matrices)
+            matrix_b: Second matrix for 'add', 'subtract' and 'multiply'
+            operation: One of 'add', 'subtract', 'multiply', 'transpose',
+                       'inverse' or 'determinant'
+            out: Optional preallocated result array; passing matrix_a makes
+                 'add' and 'subtract' in-place
+        Returns:
+            Resulting matrix: nested lists when matrix_a was a list, otherwise an
+            ndarray (the out array when given)
+        Raises:
+            ValueError: If matrices have incompatible dimensions
+        """
+        as_list = isinstance(matrix_a, list)
+        with instrument.phase('convert'):
+            a = np.asarray(matrix_a)
+            b = None if matrix_b is None else np.asarray(matrix_b)
+        with instrument.phase('compute'):
+            result = Algebra._matrix_operation(a, b, operation, out)
+        if as_list:
+            with instrument.phase('tolist'):
+                return result.tolist()
+        return result
+
+    @staticmethod
+    def _matrix_operation(a: np.ndarray, b: Optional[np.ndarray], operation: str,
+                          out: Optional[np.ndarray]) -> np.ndarray:
+        """Array part of matrix_operations."""
+        if operation in ('add', 'subtract', 'multiply') and b is None:
+            raise ValueError(f"Operation '{operation}' requires a second matrix")
+
+        if operation == 'add':
+            if a.shape != b.shape:
+                raise ValueError("Matrices must have same dimensions for addition")
+            result = np.add(a, b, out=out)
+        elif operation == 'subtract':
+            if a.shape != b.shape:
+                raise ValueError("Matrices must have same dimensions for subtraction")
+            result = np.subtract(a, b, out=out)
+        elif operation == 'multiply':
+            if a.ndim < 2 or b.ndim < 2 or a.shape[-1] != b.shape[-2]:
+                raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
+            result = np.matmul(a, b, out=out)
+        elif operation in ('transpose', 'inverse', 'determinant'):
+            if a.ndim < 2:
+                raise ValueError("Input must be a matrix or a stack of matrices")
+            if operation == 'transpose':
+                # A view, so no data is copied unless an out buffer is requested
+                result = np.swapaxes(a, -1, -2)
+            else:
+                if a.shape[-1] != a.shape[-2]:
+                    raise ValueError(f"Matrix must be square for {operation}")
+                if operation == 'inverse':
+                    try:
+                        result = np.linalg.inv(a)
+                    except np.linalg.LinAlgError:
+                        raise ValueError("Matrix is singular and cannot be inverted")
+                else:
+                    result = np.linalg.det(a)
+            if out is not None:
+                out[...] = result
+                result = out
+        else:
+            raise ValueError("Invalid operation. Must be 'add', 'subtract', 'multiply', "
+                             "'transpose', 'inverse', or 'determinant'")
+        return result
+
+    @staticmethod
+    def matrix_chain_product(matrices: List[ArrayLike],
+                             out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Multiply a chain of matrices in the cheapest order
+        Args:
+            matrices: Sequence of matrices (or stacks of matrices) with compatible shapes
+            out: Optional preallocated result array
+        Returns:
+            Product of all matrices
+        Raises:
+            ValueError: If adjacent matrices have incompatible dimensions
+        """
+        arrays = [np.asarray(m) for m in matrices]
+        if not arrays:
+            raise ValueError("At least one matrix is required")
+        for left, right in zip(arrays, arrays[1:]):
+            if left.ndim < 2 or right.ndim < 2 or left.shape[-1] != right.shape[-2]:
+                raise ValueError("Number of columns in each matrix must equal number of rows in the next")
+
+        dims = [arrays[0].shape[-2]] + [m.shape[-1] for m in arrays]
+        split = Algebra.matrix_chain_order(dims)
+
+        def multiply(i, j, target=None):
+            if i == j:
+                if target is None:
+                    return arrays[i]
+                target[...] = arrays[i]
+                return target
+            k = split[i][j]
+            return np.matmul(multiply(i, k), multiply(k + 1, j), out=target)
+
+        return multiply(0, len(arrays) - 1, out)
+
+    @staticmethod
+    def matrix_chain_order(dims: List[int]) -> List[List[int]]:
+        """
+        Optimal parenthesization of a matrix chain (classic O(n³) dynamic program)
+        Args:
+            dims: Dimensions [p0, p1, ..., pn]; matrix i has shape (p_i, p_{i+1})
+        Returns:
+            Table where split[i][j] is the index k at which the product of
+            matrices i..j is split into (i..k)(k+1..j)
+        """
+        n = len(dims) - 1
+        cost = [[0] * n for _ in range(n)]
+        split = [[0] * n for _ in range(n)]
+        for length in range(2, n + 1):
+            for i in range(n - length + 1):
+                j = i + length - 1
+                cost[i][j] = float('inf')
+                for k in range(i, j):
+                    candidate = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                    if candidate < cost[i][j]:
+                        cost[i][j] = candidate
+                        split[i][j] = k
+        return split
+
+
+class LinearSolver:
+    """
+    Factor a square coefficient matrix once and solve against many right-hand sides
+    Args:
+        coefficients: Square matrix of coefficients
+        method: 'auto' (Cholesky for symmetric positive definite matrices, LU
+                otherwise), 'cholesky' or 'lu'
+    Raises:
+        ValueError: If the matrix is not square or is singular
+    """
+
+    def __init__(self, coefficients: ArrayLike, method: str = 'auto'):
+        matrix = np.asarray(coefficients, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("Coefficient matrix must be square")
+        if method not in ('auto', 'cholesky', 'lu'):
+            raise ValueError("Invalid method. Choose 'auto', 'cholesky', or 'lu'")
+        self.size = matrix.shape[0]
+        self.method = None
+        self._factors = None
+
+        if method == 'cholesky' or (method == 'auto' and np.array_equal(matrix, matrix.T)):
+            try:
+                self._factors = linalg.cho_factor(matrix)
+                self.method = 'cholesky'
+            except linalg.LinAlgError:
+                if method == 'cholesky':
+                    raise ValueError("Matrix is not positive definite")
+        if self._factors is None:
+            with warnings.catch_warnings():
+                # A zero pivot is reported below as a ValueError instead
+                warnings.simplefilter('ignore', linalg.LinAlgWarning)
+                lu, pivots = linalg.lu_factor(matrix)
+            if np.any(np.diag(lu) == 0):
+                raise ValueError("System has no unique solution")
+            self._factors = (lu, pivots)
+            self.method = 'lu'
+
+    def solve(self, constants: ArrayLike) -> np.ndarray:
+        """
+        Solve against one or many right-hand sides
+        Args:
+            constants: Vector of length n, or an (n, m) matrix of m right-hand sides
+        Returns:
+            Solution vector or (n, m) matrix of solutions
+        """
+        rhs = np.asarray(constants, dtype=float)
+        if rhs.shape[:1] != (self.size,):
+            raise ValueError("Number of constants must match the number of equations")
+        if self.method == 'cholesky':
+            return linalg.cho_solve(self._factors, rhs, check_finite=False)
+        return linalg.lu_solve(self._factors, rhs, check_finite=False)
+
+
+class FactorizationCache:
+    """
+    LRU cache of LinearSolver objects keyed by a hash of the matrix contents
+    Args:
+        maxsize: Maximum number of factorizations kept
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._solvers: 'OrderedDict[bytes, LinearSolver]' = OrderedDict()
+
+    @staticmethod
+    def key(coefficients: ArrayLike) -> bytes:
+        """Content hash of a matrix (shape and float64 bytes)."""
+        matrix = np.ascontiguousarray(coefficients, dtype=float)
+        digest = hashlib.blake2b(str(matrix.shape).encode(), digest_size=16)
+        digest.update(matrix.tobytes())
+        return digest.digest()
+
+    def get(self, coefficients: ArrayLike) -> LinearSolver:
+        """
+        Return the cached solver for a matrix, factoring it on first use
+        Args:
+            coefficients: Square matrix of coefficients
+        Returns:
+            LinearSolver for the matrix
+        """
+        key = FactorizationCache.key(coefficients)
+        solver = self._solvers.get(key)
+        if solver is not None:
+            self.hits += 1
+            self._solvers.move_to_end(key)
+            return solver
+        self.misses += 1
+        solver = LinearSolver(coefficients)
+        self._solvers[key] = solver
+        if len(self._solvers) > self.maxsize:
+            self._solvers.popitem(last=False)
+        return solver
+
+    def clear(self):
+        """Drop all cached factorizations and reset the statistics."""
+        self._solvers.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        """Return hit/miss counts and the current size."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._solvers), 'maxsize': self.maxsize}
+
+
+# Shared cache used by Algebra.solve_linear_system
+factorization_cache = FactorizationCache()
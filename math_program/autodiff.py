@@ -0,0 +1,240 @@
+"""
+Automatic Differentiation Module
+Forward-mode automatic differentiation with dual numbers that work with NumPy ufuncs.
+"""
+import numpy as np
+from typing import Callable, List, Union
+from numpy.typing import ArrayLike
+
+
+def _unary_rules():
+    """Derivatives f'(u) of the supported single-argument ufuncs."""
+    return {
+        np.negative: lambda u: -np.ones_like(u),
+        np.positive: lambda u: np.ones_like(u),
+        np.absolute: lambda u: np.sign(u),
+        np.sqrt: lambda u: 0.5 / np.sqrt(u),
+        np.cbrt: lambda u: 1.0 / (3.0 * np.cbrt(u) ** 2),
+        np.square: lambda u: 2.0 * u,
+        np.reciprocal: lambda u: -1.0 / u ** 2,
+        np.exp: lambda u: np.exp(u),
+        np.exp2: lambda u: np.exp2(u) * np.log(2.0),
+        np.expm1: lambda u: np.exp(u),
+        np.log: lambda u: 1.0 / u,
+        np.log2: lambda u: 1.0 / (u * np.log(2.0)),
+        np.log10: lambda u: 1.0 / (u * np.log(10.0)),
+        np.log1p: lambda u: 1.0 / (1.0 + u),
+        np.sin: lambda u: np.cos(u),
+        np.cos: lambda u: -np.sin(u),
+        np.tan: lambda u: 1.0 / np.cos(u) ** 2,
+        np.arcsin: lambda u: 1.0 / np.sqrt(1.0 - u ** 2),
+        np.arccos: lambda u: -1.0 / np.sqrt(1.0 - u ** 2),
+        np.arctan: lambda u: 1.0 / (1.0 + u ** 2),
+        np.sinh: lambda u: np.cosh(u),
+        np.cosh: lambda u: np.sinh(u),
+        np.tanh: lambda u: 1.0 / np.cosh(u) ** 2,
+        np.arcsinh: lambda u: 1.0 / np.sqrt(u ** 2 + 1.0),
+        np.arccosh: lambda u: 1.0 / np.sqrt(u ** 2 - 1.0),
+        np.arctanh: lambda u: 1.0 / (1.0 - u ** 2),
+    }
+
+
+_UNARY = _unary_rules()
+
+
+class Dual:
+    """
+    Dual number value + sum(grad[..., i] * eps_i) with eps_i * eps_j = 0
+    Args:
+        value: Real part (scalar or array)
+        grad: Derivative part; its last axis holds one component per seed direction
+    """
+    # Make NumPy defer to Dual in mixed expressions such as ndarray * Dual
+    __array_priority__ = 1000
+
+    def __init__(self, value: ArrayLike, grad: ArrayLike):
+        self.value = np.asarray(value, dtype=float)
+        self.grad = np.asarray(grad, dtype=float)
+
+    @staticmethod
+    def variable(value: ArrayLike) -> 'Dual':
+        """Create an independent variable with derivative 1 (element-wise for arrays)."""
+        value = np.asarray(value, dtype=float)
+        return Dual(value, np.ones(value.shape + (1,)))
+
+    @staticmethod
+    def variables(values: List[float]) -> List['Dual']:
+        """Create one scalar Dual per input, seeded along the unit directions."""
+        seeds = np.eye(len(values))
+        return [Dual(v, seeds[i]) for i, v in enumerate(values)]
+
+    @staticmethod
+    def _split(x):
+        """Return (value, grad or None) for a Dual or a constant."""
+        if isinstance(x, Dual):
+            return x.value, x.grad
+        return np.asarray(x, dtype=float), None
+
+    @staticmethod
+    def _scale(factor, grad):
+        """Multiply a derivative part by the per-element factor f'(u)."""
+        return np.expand_dims(factor, -1) * grad
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs:
+            return NotImplemented
+
+        if len(inputs) == 1:
+            rule = _UNARY.get(ufunc)
+            if rule is None:
+                return NotImplemented
+            u, du = Dual._split(inputs[0])
+            return Dual(ufunc(u), Dual._scale(rule(u), du))
+
+        if len(inputs) != 2:
+            return NotImplemented
+        (u, du), (v, dv) = Dual._split(inputs[0]), Dual._split(inputs[1])
+
+        if ufunc is np.add:
+            value, parts = u + v, [(1.0, du), (1.0, dv)]
+        elif ufunc is np.subtract:
+            value, parts = u - v, [(1.0, du), (-1.0, dv)]
+        elif ufunc is np.multiply:
+            value, parts = u * v, [(v, du), (u, dv)]
+        elif ufunc is np.true_divide:
+            value, parts = u / v, [(1.0 / v, du), (-u / v ** 2, dv)]
+        elif ufunc is np.power:
+            value = u ** v
+            parts = [(v * u ** (v - 1), du)]
+            if dv is not None:
+                parts.append((value * np.log(u), dv))
+        elif ufunc is np.arctan2:
+            denominator = u ** 2 + v ** 2
+            value, parts = np.arctan2(u, v), [(v / denominator, du), (-u / denominator, dv)]
+        elif ufunc is np.hypot:
+            value = np.hypot(u, v)
+            parts = [(u / value, du), (v / value, dv)]
+        else:
+            return NotImplemented
+
+        grad = sum(Dual._scale(np.broadcast_to(factor, np.shape(value)), d)
+                   for factor, d in parts if d is not None)
+        return Dual(value, grad)
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.true_divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    # Comparisons act on the value so piecewise functions can branch
+    def __lt__(self, other):
+        return self.value < Dual._split(other)[0]
+
+    def __le__(self, other):
+        return self.value <= Dual._split(other)[0]
+
+    def __gt__(self, other):
+        return self.value > Dual._split(other)[0]
+
+    def __ge__(self, other):
+        return self.value >= Dual._split(other)[0]
+
+    def __eq__(self, other):
+        return self.value == Dual._split(other)[0]
+
+    def __ne__(self, other):
+        return self.value != Dual._split(other)[0]
+
+    # Defining __eq__ on value makes instances unhashable
+    __hash__ = None
+
+    def __float__(self):
+        raise TypeError("Dual numbers cannot be converted to float; use NumPy functions "
+                        "(np.sin, np.exp, ...) instead of the math module")
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value}, {self.grad})"
+
+
+def derivative(f: Callable, x: ArrayLike) -> Union[float, np.ndarray]:
+    """
+    Calculate the exact derivative of f at x with one evaluation
+    Args:
+        f: Function built from arithmetic and NumPy ufuncs
+        x: Point (or array of points, differentiated element-wise)
+    Returns:
+        Derivative value(s)
+    """
+    result = f(Dual.variable(x))
+    if not isinstance(result, Dual):
+        # f does not depend on its argument
+        return np.zeros(np.shape(x)) if np.ndim(x) else 0.0
+    slope = np.broadcast_to(result.grad[..., 0], result.value.shape)
+    return slope.copy() if slope.ndim else float(slope)
+
+
+def gradient(f: Callable[[List[float]], float], x: List[float]) -> np.ndarray:
+    """
+    Calculate the exact gradient of a scalar multivariable function in one evaluation
+    Args:
+        f: Function taking a sequence [x1, x2, ...] and returning a scalar
+        x: Point at which to calculate the gradient
+    Returns:
+        Array of partial derivatives
+    """
+    result = f(Dual.variables(x))
+    if not isinstance(result, Dual):
+        return np.zeros(len(x))
+    return np.broadcast_to(result.grad, (len(x),)).copy()
+
+
+def jacobian(f: Callable[[List[float]], List[float]], x: List[float]) -> np.ndarray:
+    """
+    Calculate the exact Jacobian of a vector-valued function in one evaluation
+    Args:
+        f: Function taking a sequence [x1, x2, ...] and returning a sequence of outputs
+        x: Point at which to calculate the Jacobian
+    Returns:
+        Array of shape (number of outputs, number of inputs)
+    """
+    rows = []
+    for output in f(Dual.variables(x)):
+        if isinstance(output, Dual):
+            rows.append(np.broadcast_to(output.grad, (len(x),)))
+        else:
+            rows.append(np.zeros(len(x)))
+    return np.array(rows)
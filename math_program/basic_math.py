@@ -1,52 +1,228 @@
-"""
-Basic Mathematics Module
-Contains fundamental mathematical operations and functions.
-"""
-
-class BasicMath:
-    @staticmethod
-    def add(a: float, b: float) -> float:
-        """Add two numbers."""
-        return a + b
-
-    @staticmethod
-    def subtract(a: float, b: float) -> float:
-        """Subtract b from a."""
-        return a - b
-
-    @staticmethod
-    def multiply(a: float, b: float) -> float:
-        """Multiply two numbers."""
-        return a * b
-
-    @staticmethod
-    def divide(a: float, b: float) -> float:
-        """
-        Divide a by b.
-        Raises:
-            ZeroDivisionError: If b is zero
-        """
-        if b == 0:
-            raise ZeroDivisionError("Cannot divide by zero")
-        return a / b
-
-    @staticmethod
-    def power(base: float, exponent: float) -> float:
-        """Calculate base raised to the power of exponent."""
-        return base ** exponent
-
-    @staticmethod
-    def square_root(n: float) -> float:
-        """
-        Calculate the square root of a number.
-        Raises:
-            ValueError: If n is negative
-        """
-        if n < 0:
-            raise ValueError("Cannot calculate square root of negative number")
-        return n ** 0.5
-
-    @staticmethod
-    def absolute_value(n: float) -> float:
-        """Calculate the absolute value of a number."""
-        return abs(n)
+"""
+Basic Mathematics Module
+Contains fundamental mathematical operations and functions.
+
+Every operation also accepts lists and NumPy arrays, broadcasting them like
+a NumPy ufunc. Invalid elements (division by zero, square roots of negative
+numbers, ...) are handled by the errors policy:
+    'raise': raise the scalar error if any element is invalid (default)
+    'nan':   return NaN for invalid elements
+    'mask':  return a NumPy masked array with invalid and NaN elements masked
+Scalar arguments return NaN under the 'nan' and 'mask' policies.
+
+Scalar calls can instead use exact arithmetic with mode='fraction' (rational
+results) or mode='decimal' (decimal results at the precision of the current
+decimal context, 28 digits by default). Floats are converted through their
+shortest repr, so 0.1 is taken as exactly one tenth; strings such as '1/3'
+or '0.1' are accepted as well.
+"""
+# typing alone would exceed the basic-math startup budget; see benchmarks.bench_startup
+from __future__ import annotations
+from lazy import lazy_import
+
+# Only array arguments need NumPy, so scalar calls never import it
+np = lazy_import('numpy')
+
+ERROR_POLICIES = ('raise', 'nan', 'mask')
+EXACT_MODES = ('fraction', 'decimal')
+# Types checked first so plain scalar calls stay cheap
+_PLAIN = frozenset((int, float, complex, bool, str))
+
+
+def _is_array(value: object) -> bool:
+    """True for lists, tuples and arrays with at least one dimension."""
+    return isinstance(value, (list, tuple)) or getattr(value, 'ndim', 0) > 0
+
+
+def _check_errors(errors: str):
+    if errors not in ERROR_POLICIES:
+        raise ValueError(f"Invalid errors policy. Choose from {', '.join(ERROR_POLICIES)}")
+
+
+def _arrays(errors: str, mode: str | None, *values: object) -> tuple:
+    """Validate options for an array call and convert its arguments."""
+    _check_errors(errors)
+    if mode is not None:
+        raise ValueError("Exact modes take scalar arguments")
+    return tuple(np.asarray(value) for value in values)
+
+
+def _exact(value: object, mode: str) -> object:
+    """Convert a scalar to a Fraction or Decimal."""
+    if isinstance(value, float):
+        value = repr(value)
+    try:
+        if mode == 'fraction':
+            from fractions import Fraction
+            return Fraction(value)
+        from decimal import Decimal
+        return Decimal(value)
+    except (ArithmeticError, TypeError, ValueError):
+        raise ValueError(f"Cannot convert {value!r} to an exact {mode}") from None
+
+
+def _scalars(errors: str, mode: str | None, *values: object) -> tuple | None:
+    """
+    Validate options for a scalar call and convert its arguments
+    Returns None if any argument is an array, for the caller to take its array path.
+    """
+    for value in values:
+        if type(value) not in _PLAIN and _is_array(value):
+            return None
+    if mode is None and errors == 'raise':
+        return values
+    _check_errors(errors)
+    if mode is None:
+        return values
+    if mode not in EXACT_MODES:
+        raise ValueError(f"Invalid mode. Choose from {', '.join(EXACT_MODES)}")
+    return tuple(_exact(value, mode) for value in values)
+
+
+def _scalar_error(errors: str, error: type, message: str) -> float:
+    """Raise for the 'raise' policy, otherwise stand in NaN for the result."""
+    if errors == 'raise':
+        raise error(message)
+    return float('nan')
+
+
+def _policy(result: object, invalid: object, errors: str, error: type = ValueError, message: str = '') -> object:
+    """Apply the errors policy to an array result, given a mask of invalid elements."""
+    if invalid is not None:
+        invalid = np.broadcast_to(invalid, np.shape(result))
+        if invalid.any():
+            if errors == 'raise':
+                raise error(message)
+            result = np.where(invalid, np.nan, result)
+    if errors == 'mask':
+        mask = np.isnan(result) if np.issubdtype(np.asarray(result).dtype, np.inexact) else False
+        return np.ma.masked_array(result, mask=mask)
+    return result
+
+
+def _fraction_sqrt(n: object) -> object:
+    """Exact square root of a Fraction that is a ratio of perfect squares."""
+    import math
+    from fractions import Fraction
+    p, q = math.isqrt(n.numerator), math.isqrt(n.denominator)
+    if p * p != n.numerator or q * q != n.denominator:
+        raise ValueError("Square root is not rational; use mode='decimal'")
+    return Fraction(p, q)
+
+
+class BasicMath:
+    @staticmethod
+    def add(a: float, b: float, errors: str = 'raise', mode: str | None = None) -> float:
+        """Add two numbers."""
+        scalars = _scalars(errors, mode, a, b)
+        if scalars is None:
+            return _policy(np.add(*_arrays(errors, mode, a, b)), None, errors)
+        a, b = scalars
+        return a + b
+
+    @staticmethod
+    def subtract(a: float, b: float, errors: str = 'raise', mode: str | None = None) -> float:
+        """Subtract b from a."""
+        scalars = _scalars(errors, mode, a, b)
+        if scalars is None:
+            return _policy(np.subtract(*_arrays(errors, mode, a, b)), None, errors)
+        a, b = scalars
+        return a - b
+
+    @staticmethod
+    def multiply(a: float, b: float, errors: str = 'raise', mode: str | None = None) -> float:
+        """Multiply two numbers."""
+        scalars = _scalars(errors, mode, a, b)
+        if scalars is None:
+            return _policy(np.multiply(*_arrays(errors, mode, a, b)), None, errors)
+        a, b = scalars
+        return a * b
+
+    @staticmethod
+    def divide(a: float, b: float, errors: str = 'raise', mode: str | None = None) -> float:
+        """
+        Divide a by b.
+        Raises:
+            ZeroDivisionError: If b (any element of b) is zero under the 'raise' policy
+        """
+        scalars = _scalars(errors, mode, a, b)
+        if scalars is None:
+            a, b = _arrays(errors, mode, a, b)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result = np.divide(a, b)
+            return _policy(result, b == 0, errors, ZeroDivisionError, "Cannot divide by zero")
+        a, b = scalars
+        if b == 0:
+            return _scalar_error(errors, ZeroDivisionError, "Cannot divide by zero")
+        return a / b
+
+    @staticmethod
+    def power(base: float, exponent: float, errors: str = 'raise', mode: str | None = None) -> float:
+        """
+        Calculate base raised to the power of exponent.
+        A negative real base with a fractional real exponent, or a zero base
+        with a negative exponent, is invalid: NaN under the 'nan' and 'mask'
+        policies for scalars and arrays alike. Complex arrays keep complex results. Under the 'raise' policy, array elements
+        raise ValueError while plain scalars keep Python's behaviour (complex
+        result, ZeroDivisionError).
+        Raises:
+            ValueError: If an element is invalid under the 'raise' policy, or
+                        mode='fraction' is used with a non-integer exponent
+            ZeroDivisionError: If a scalar zero base has a negative exponent
+                               under the 'raise' policy
+        """
+        scalars = _scalars(errors, mode, base, exponent)
+        if scalars is None:
+            base, exponent = _arrays(errors, mode, base, exponent)
+            # Integer arrays cannot be raised to negative powers; complex ones stay complex
+            base = base.astype(np.result_type(base, float))
+            invalid = (base == 0) & (np.real(exponent) < 0)
+            if not (np.iscomplexobj(base) or np.iscomplexobj(exponent)):
+                # A complex result is only an error when the inputs are real
+                invalid |= (base < 0) & (exponent % 1 != 0)
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                result = np.power(base, exponent)
+            return _policy(result, invalid, errors, ValueError,
+                           "Power is undefined for a negative base with a fractional exponent "
+                           "or a zero base with a negative exponent")
+        base, exponent = scalars
+        if not isinstance(base, complex) and not isinstance(exponent, complex):
+            if base == 0 and exponent < 0:
+                return _scalar_error(errors, ZeroDivisionError, "0 cannot be raised to a negative power")
+            if (mode is not None or errors != 'raise') and base < 0 and exponent % 1 != 0:
+                return _scalar_error(errors, ValueError, "Negative base with a fractional exponent has no real result")
+        if mode == 'fraction' and exponent.denominator != 1:
+            raise ValueError("Fraction mode needs an integer exponent; use mode='decimal'")
+        return base ** exponent
+
+    @staticmethod
+    def square_root(n: float, errors: str = 'raise', mode: str | None = None) -> float:
+        """
+        Calculate the square root of a number.
+        Raises:
+            ValueError: If n (any element of n) is negative under the 'raise'
+                        policy, or mode='fraction' is used with an irrational root
+        """
+        scalars = _scalars(errors, mode, n)
+        if scalars is None:
+            (n,) = _arrays(errors, mode, n)
+            with np.errstate(invalid='ignore'):
+                result = np.sqrt(n)
+            return _policy(result, n < 0, errors, ValueError, "Cannot calculate square root of negative number")
+        (n,) = scalars
+        if n < 0:
+            return _scalar_error(errors, ValueError, "Cannot calculate square root of negative number")
+        if mode == 'fraction':
+            return _fraction_sqrt(n)
+        if mode == 'decimal':
+            return n.sqrt()
+        return n ** 0.5
+
+    @staticmethod
+    def absolute_value(n: float, errors: str = 'raise', mode: str | None = None) -> float:
+        """Calculate the absolute value of a number."""
+        scalars = _scalars(errors, mode, n)
+        if scalars is None:
+            return _policy(np.abs(*_arrays(errors, mode, n)), None, errors)
+        (n,) = scalars
+        return abs(n)
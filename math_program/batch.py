@@ -0,0 +1,203 @@
+"""
+Batch Module
+Runs operation requests from JSONL or CSV job files without the interactive menus.
+"""
+import csv
+import importlib
+import json
+import sys
+from typing import IO, Any, Callable, Iterator, Tuple
+
+# Accepted module names, normalized by lower-casing and dropping underscores,
+# mapped to (module, class). Modules are imported when a job first needs them,
+# so a run of BasicMath jobs never loads NumPy or SciPy.
+MODULES = {
+    'basicmath': ('basic_math', 'BasicMath'),
+    'algebra': ('algebra', 'Algebra'),
+    'calculus': ('calculus', 'Calculus'),
+    'statistics': ('statistics', 'Statistics'),
+    'distributions': ('distributions', 'Distributions'),
+    'resampling': ('resampling', 'Resampling'),
+}
+
+
+class BatchRunner:
+    @staticmethod
+    def read_jobs(stream: IO[str], file_format: str = 'jsonl') -> Iterator[Tuple[int, Any]]:
+        """
+        Stream jobs from a file object
+        Args:
+            stream: Text stream of job records
+            file_format: 'jsonl' (one JSON object per line) or 'csv' (header with
+                         module, function and optional id, args, kwargs columns,
+                         where args and kwargs hold JSON)
+        Returns:
+            Iterator of (line number, job dict or the exception raised while parsing)
+        """
+        if file_format == 'jsonl':
+            for number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    yield number, e
+        elif file_format == 'csv':
+            for number, row in enumerate(csv.DictReader(stream), 2):
+                try:
+                    job = {'module': row['module'], 'function': row['function'],
+                           'args': json.loads(row.get('args') or '[]'),
+                           'kwargs': json.loads(row.get('kwargs') or '{}')}
+                    if row.get('id'):
+                        job['id'] = row['id']
+                    yield number, job
+                except (KeyError, ValueError) as e:
+                    yield number, e
+        else:
+            raise ValueError("Invalid format. Choose 'jsonl' or 'csv'")
+
+    @staticmethod
+    def resolve_module(name: str) -> type:
+        """
+        Import and return the class behind a job's module name
+        Args:
+            name: Module name such as 'basic_math', 'BasicMath' or 'algebra'
+        Returns:
+            The class holding the module's operations
+        Raises:
+            ValueError: If the module is unknown
+        """
+        entry = MODULES.get(str(name).lower().replace('_', ''))
+        if entry is None:
+            raise ValueError(f"Unknown module '{name}'")
+        module_name, class_name = entry
+        return getattr(importlib.import_module(module_name), class_name)
+
+    @staticmethod
+    def resolve_function(name: str) -> Callable:
+        """
+        Turn a function name or formula from a job file into a callable
+        Args:
+            name: Name of a NumPy ufunc such as 'sin', 'exp' or 'square', or a
+                  formula such as 'sin(x)*exp(-x**2)' (see expressions.py)
+        Returns:
+            The NumPy function or the compiled, vectorized expression
+        Raises:
+            ValueError: If the name is neither a NumPy ufunc nor a valid expression
+        """
+        import numpy as np
+        function = getattr(np, name, None)
+        if isinstance(function, np.ufunc):
+            return function
+        from expressions import compile_expression
+        return compile_expression(name)
+
+    @staticmethod
+    def run_job(job: dict) -> Any:
+        """
+        Dispatch one job to the math modules
+        Args:
+            job: Dictionary with 'module', 'function' and optional 'args' and 'kwargs'
+        Returns:
+            Result of the call
+        Raises:
+            ValueError: If the module or function is unknown
+        """
+        if not isinstance(job, dict):
+            raise ValueError("Job must be a JSON object")
+        module = BatchRunner.resolve_module(job.get('module', ''))
+        name = job.get('function', '')
+        function = getattr(module, name, None) if not name.startswith('_') else None
+        if not callable(function):
+            raise ValueError(f"Unknown function '{name}' in module '{job['module']}'")
+
+        args = list(job.get('args', []))
+        kwargs = dict(job.get('kwargs', {}))
+        if module.__name__ == 'Calculus':
+            # Calculus operations take a function as their first argument
+            if args and isinstance(args[0], str):
+                args[0] = BatchRunner.resolve_function(args[0])
+            if isinstance(kwargs.get('f'), str):
+                kwargs['f'] = BatchRunner.resolve_function(kwargs['f'])
+        return function(*args, **kwargs)
+
+    @staticmethod
+    def to_json(value: Any) -> Any:
+        """json.dumps fallback for NumPy, complex and exact (Fraction, Decimal) results."""
+        if isinstance(value, complex):
+            return {'real': value.real, 'imag': value.imag}
+        # Results can only contain NumPy objects if a job already imported it
+        np = sys.modules.get('numpy')
+        if np is not None:
+            if isinstance(value, np.ndarray):
+                if np.iscomplexobj(value):
+                    return {'real': value.real.tolist(), 'imag': value.imag.tolist()}
+                return value.tolist()
+            if isinstance(value, np.complexfloating):
+                return {'real': float(value.real), 'imag': float(value.imag)}
+            if isinstance(value, np.generic):
+                return value.item()
+        # Exact BasicMath results (Fraction, Decimal) keep their precision as strings
+        fractions, decimal = sys.modules.get('fractions'), sys.modules.get('decimal')
+        if ((fractions is not None and isinstance(value, fractions.Fraction))
+                or (decimal is not None and isinstance(value, decimal.Decimal))):
+            return str(value)
+        if hasattr(value, '__dict__'):
+            return {key: item for key, item in vars(value).items() if not key.startswith('_')}
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+    @staticmethod
+    def run(source: IO[str], destination: IO[str], file_format: str = 'jsonl') -> dict:
+        """
+        Process a stream of jobs, writing one JSON result line per job
+        Jobs are read, run and written one at a time, so memory use does not
+        grow with the number of jobs.
+        Args:
+            source: Text stream of jobs
+            destination: Text stream for JSONL results
+            file_format: Format of the source ('jsonl' or 'csv')
+        Returns:
+            Summary with the number of processed and failed jobs
+        """
+        encoder = json.JSONEncoder(default=BatchRunner.to_json)
+        processed = failed = 0
+        for number, job in BatchRunner.read_jobs(source, file_format):
+            job_id = job.get('id', number) if isinstance(job, dict) else number
+            try:
+                if isinstance(job, Exception):
+                    raise ValueError(f"Malformed job: {job}")
+                record = {'id': job_id, 'ok': True, 'result': BatchRunner.run_job(job)}
+                line = encoder.encode(record)
+            except Exception as e:
+                failed += 1
+                line = encoder.encode({'id': job_id, 'ok': False,
+                                       'error': f"{type(e).__name__}: {e}"})
+            destination.write(line + '\n')
+            processed += 1
+        destination.flush()
+        return {'processed': processed, 'failed': failed}
+
+    @staticmethod
+    def main(path: str, output: str = '-', file_format: str = None) -> int:
+        """
+        Run a job file from the command line
+        Args:
+            path: Job file path, or '-' for standard input
+            output: Result file path, or '-' for standard output
+            file_format: 'jsonl' or 'csv'; inferred from the extension if omitted
+        Returns:
+            Process exit code (1 if any job failed)
+        """
+        if file_format is None:
+            file_format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        source = sys.stdin if path == '-' else open(path, newline='')
+        destination = sys.stdout if output == '-' else open(output, 'w')
+        try:
+            summary = BatchRunner.run(source, destination, file_format)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if destination is not sys.stdout:
+                destination.close()
+        print(f"Processed {summary['processed']} jobs ({summary['failed']} failed)", file=sys.stderr)
+        return 1 if summary['failed'] else 0
@@ -0,0 +1,5 @@
+"""
+Benchmarks Package
+Timing scripts for the mathematics modules. Run from the math_program
+directory, e.g. python -m benchmarks.bench_integral
+"""
@@ -0,0 +1,62 @@
+"""
+Basic Math Benchmark
+Compares looping the scalar BasicMath API over arrays with the array-aware calls.
+Usage: python -m benchmarks.bench_basic [--size N]
+"""
+import argparse
+import numpy as np
+from basic_math import BasicMath
+from benchmarks.bench_integral import time_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scalar loops against array-aware BasicMath")
+    parser.add_argument('--size', type=int, default=1_000_000, help="Elements per operand")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-10, 10, args.size)
+    b = rng.integers(-5, 5, args.size).astype(float)
+    # Scalar loops are slow; time a slice and scale up
+    sample = min(args.size, 100_000)
+    scale = args.size / sample
+    a_list, b_list = a[:sample].tolist(), b[:sample].tolist()
+
+    def safe_divide(x, y):
+        try:
+            return BasicMath.divide(x, y)
+        except ZeroDivisionError:
+            return float('nan')
+
+    def safe_sqrt(x):
+        try:
+            return BasicMath.square_root(x)
+        except ValueError:
+            return float('nan')
+
+    cases = [
+        ('add', lambda: [BasicMath.add(x, y) for x, y in zip(a_list, b_list)],
+         lambda: BasicMath.add(a, b)),
+        ('divide (nan)', lambda: [safe_divide(x, y) for x, y in zip(a_list, b_list)],
+         lambda: BasicMath.divide(a, b, errors='nan')),
+        ('divide (mask)', lambda: [safe_divide(x, y) for x, y in zip(a_list, b_list)],
+         lambda: BasicMath.divide(a, b, errors='mask')),
+        ('square_root', lambda: [safe_sqrt(x) for x in a_list],
+         lambda: BasicMath.square_root(a, errors='nan')),
+        ('power', lambda: [BasicMath.power(abs(x), y) for x, y in zip(a_list, b_list)],
+         lambda: BasicMath.power(np.abs(a), b)),
+    ]
+    print(f"{args.size:,} elements per operand")
+    for name, looped, vectorized in cases:
+        loop_time = time_call(looped, repeat=1) * scale
+        array_time = time_call(vectorized)
+        print(f"{name:>14}: scalar loop {loop_time:8.3f}s ({args.size / loop_time / 1e6:7.2f} M/s) | "
+              f"array {array_time:8.4f}s ({args.size / array_time / 1e6:8.1f} M/s) | "
+              f"speedup {loop_time / array_time:7.1f}x")
+
+    exact = time_call(lambda: [BasicMath.divide(x, 7, mode='fraction') for x in range(10_000)], repeat=1)
+    print(f"{'exact divide':>14}: fraction mode {10_000 / exact / 1e3:7.1f} k/s")
+
+
+if __name__ == "__main__":
+    main()
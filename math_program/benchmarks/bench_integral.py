@@ -0,0 +1,46 @@
+"""
+Integral Benchmark
+Compares per-call Calculus.definite_integral against Calculus.definite_integral_batch.
+Usage: python -m benchmarks.bench_integral [--count K] [--points N]
+"""
+import argparse
+import time
+import numpy as np
+from calculus import Calculus
+
+
+def time_call(fn, repeat: int = 3) -> float:
+    """Return the best wall time of fn() over several runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched definite integrals")
+    parser.add_argument('--count', type=int, default=2000, help="Number of (a, b) pairs")
+    parser.add_argument('--points', type=int, default=1000, help="Sample points per integral")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-5, 0, args.count)
+    b = rng.uniform(0, 5, args.count)
+    f = np.sin
+
+    for method in ('trapezoid', 'simpson'):
+        per_call = time_call(lambda: [Calculus.definite_integral(f, lo, hi, method, args.points)
+                                      for lo, hi in zip(a, b)], repeat=1)
+        batched = time_call(lambda: Calculus.definite_integral_batch(f, a, b, method, args.points))
+        scalar = time_call(lambda: Calculus.definite_integral_batch(f, a[:100], b[:100], method,
+                                                                     args.points, vectorized=False),
+                           repeat=1) * args.count / 100
+        print(f"{method:>10}: per-call {per_call:8.3f}s | "
+              f"batch (scalar fallback, est.) {scalar:8.3f}s | "
+              f"batch (vectorized) {batched:8.4f}s | speedup {per_call / batched:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Startup Benchmark
+Measures import cost of the basic-math and batch command-line paths with
+python -X importtime and checks it against a startup budget.
+Usage: python -m benchmarks.bench_startup [--repeat R] [--top N]
+Exits with status 1 if a path exceeds its budget or imports a forbidden module.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+PROGRAM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import time allowed on top of a bare interpreter, in milliseconds
+BUDGETS_MS = {
+    'basic_math': 20.0,
+    'batch': 60.0,
+}
+# Neither path may load these; they cost hundreds of milliseconds
+FORBIDDEN = ('numpy', 'scipy')
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse -X importtime output
+    Args:
+        stderr: Standard error of a python -X importtime run
+    Returns:
+        List of (module, self microseconds, cumulative microseconds, nesting depth)
+    """
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            records.append((name, int(own), int(cumulative), (len(indent) - 1) // 2))
+    return records
+
+
+def measure(command: List[str], repeat: int) -> Tuple[float, float, List[Tuple[str, int, int, int]]]:
+    """
+    Run a command under -X importtime several times
+    Args:
+        command: Arguments after 'python -X importtime'
+        repeat: Number of runs; the fastest one is kept
+    Returns:
+        Tuple of (total import ms, wall ms, records of the fastest run)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime'] + command, cwd=PROGRAM_DIR,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        wall = (time.perf_counter() - start) * 1000
+        records = parse_importtime(result.stderr)
+        total = sum(cumulative for _, _, cumulative, depth in records if depth == 0) / 1000
+        if best is None or total < best[0]:
+            best = (total, wall, records)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check command-line startup against its budget")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per path (fastest is kept)")
+    parser.add_argument('--top', type=int, default=5, help="Heaviest imports to list per path")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as jobs:
+        jobs.write('{"module": "basic_math", "function": "add", "args": [1, 2]}\n')
+    try:
+        baseline, _, _ = measure(['-c', 'pass'], args.repeat)
+        paths: Dict[str, List[str]] = {
+            'basic_math': ['-c', 'from basic_math import BasicMath; BasicMath.add(1, 2)'],
+            'batch': ['main.py', '--batch', jobs.name, '--output', os.devnull],
+        }
+        failed = False
+        print(f"bare interpreter: {baseline:7.1f} ms of imports")
+        for name, command in paths.items():
+            total, wall, records = measure(command, args.repeat)
+            extra = total - baseline
+            loaded = {record[0].split('.')[0] for record in records}
+            forbidden = sorted(loaded.intersection(FORBIDDEN))
+            ok = extra <= BUDGETS_MS[name] and not forbidden
+            failed = failed or not ok
+            print(f"{name:>10}: imports +{extra:6.1f} ms (budget {BUDGETS_MS[name]:.0f} ms) | "
+                  f"wall {wall:6.1f} ms | {'ok' if ok else 'OVER BUDGET'}")
+            if forbidden:
+                print(f"{'':>12}loads forbidden modules: {', '.join(forbidden)}")
+            for module, _, cumulative, _ in sorted(
+                    (r for r in records if r[3] == 0), key=lambda r: -r[2])[:args.top]:
+                print(f"{'':>12}{cumulative / 1000:7.1f} ms  {module}")
+    finally:
+        os.unlink(jobs.name)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Taylor Benchmark
+Compares the coefficient methods of Calculus.taylor_polynomial on a formula,
+timing the first (compiling) call and later calls separately.
+Usage: python -m benchmarks.bench_taylor [--terms N] [--calls K]
+"""
+import argparse
+import time
+import numpy as np
+import expressions
+from calculus import Calculus
+
+FORMULA = 'sin(x)*exp(-x**2)'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Taylor coefficient methods")
+    parser.add_argument('--terms', type=int, default=16, help="Number of Taylor terms")
+    parser.add_argument('--calls', type=int, default=200, help="Expansion points after the first")
+    args = parser.parse_args()
+
+    centers = np.linspace(-1.0, 1.0, args.calls + 1)
+    reference = [Calculus.taylor_polynomial(FORMULA, a, args.terms, 'symbolic').coefficients
+                 for a in centers]
+    for method in ('interpolation', 'cauchy', 'symbolic'):
+        # Start cold so the first call includes parsing and compilation
+        expressions.clear_cache()
+        start = time.perf_counter()
+        try:
+            first = Calculus.taylor_polynomial(FORMULA, centers[0], args.terms, method, radius=0.5)
+        except ValueError as error:
+            # Sampling methods refuse term counts they cannot resolve accurately
+            print(f"{method:>13}: {error}")
+            continue
+        compile_time = time.perf_counter() - start
+        start = time.perf_counter()
+        polynomials = [Calculus.taylor_polynomial(FORMULA, a, args.terms, method, radius=0.5)
+                       for a in centers[1:]]
+        per_call = (time.perf_counter() - start) / args.calls
+        error = max(np.max(np.abs(p.coefficients - r))
+                    for p, r in zip([first] + polynomials, reference))
+        print(f"{method:>13}: first call {compile_time * 1e3:8.2f} ms | "
+              f"later calls {per_call * 1e6:8.1f} us | max |coef - symbolic| {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
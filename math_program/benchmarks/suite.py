@@ -0,0 +1,380 @@
+"""
+Benchmark Suite
+Times every public static method of BasicMath, Algebra, Calculus, Statistics,
+Distributions and Resampling over parameterized input sizes. Latency percentiles,
+throughput and peak memory go to a JSON results file, which is compared
+against a stored baseline.
+Usage: python -m benchmarks.suite [--preset quick|full] [--filter TEXT] [--output FILE]
+                                  [--baseline FILE] [--update-baseline] [--tolerance T]
+Exits with status 1 if a case fails, a method has no case, or a case is
+slower (or uses more memory) than the baseline beyond the tolerance.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, 'results.json')
+
+# Classes whose public static methods must all have a case
+CLASSES = {
+    'BasicMath': 'basic_math',
+    'Algebra': 'algebra',
+    'Calculus': 'calculus',
+    'Statistics': 'statistics',
+    'Distributions': 'distributions',
+    'Resampling': 'resampling',
+}
+
+FORMULA = 'sin(x)*exp(-x**2)'
+
+Setup = Callable[[int, np.random.Generator], Tuple[tuple, dict]]
+
+
+def _case(method: str, quick: List[int], full: List[int], setup: Setup, label: str = '') -> dict:
+    return {'method': method, 'label': label, 'sizes': {'quick': quick, 'full': full}, 'setup': setup}
+
+
+def _sum_of_squares(x):
+    """Vectorized scalar field: x has shape (N, P) for P points."""
+    return np.sum(np.sin(x) ** 2, axis=0)
+
+
+def _tridiagonal(n: int):
+    """(rows, cols, values) triplets of a diagonally dominant tridiagonal n x n matrix."""
+    index = np.arange(n)
+    rows = np.concatenate([index, index[1:], index[:-1]])
+    cols = np.concatenate([index, index[:-1], index[1:]])
+    values = np.concatenate([np.full(n, 4.0), np.full(2 * (n - 1), -1.0)])
+    return rows, cols, values
+
+
+def _sparse_system(n: int, rng: np.random.Generator) -> Tuple[tuple, dict]:
+    from algebra import Algebra
+    return (Algebra.load_sparse_matrix(_tridiagonal(n), (n, n)), rng.normal(size=n)), {}
+
+
+def _polish_setup(n: int, rng: np.random.Generator) -> Tuple[tuple, dict]:
+    from algebra import Algebra
+    coefficients = rng.normal(size=(n, 6))
+    return (coefficients, Algebra.polynomial_roots_batch(coefficients)), {}
+
+
+def _chain(n: int, rng: np.random.Generator) -> Tuple[tuple, dict]:
+    dims = [n, max(n // 4, 1), n, max(n // 4, 1), n]
+    return ([rng.normal(size=(dims[i], dims[i + 1])) for i in range(len(dims) - 1)],), {}
+
+
+# Each case: method, sizes per preset, and setup(n, rng) -> (args, kwargs).
+# Throughput is reported as n per second, where n is the case's size parameter.
+SMALL, LARGE = [1_000, 100_000], [1_000, 100_000, 10_000_000]
+CASES = [
+    _case('BasicMath.add', SMALL, LARGE, lambda n, rng: ((rng.normal(size=n), rng.normal(size=n)), {})),
+    _case('BasicMath.subtract', SMALL, LARGE, lambda n, rng: ((rng.normal(size=n), rng.normal(size=n)), {})),
+    _case('BasicMath.multiply', SMALL, LARGE, lambda n, rng: ((rng.normal(size=n), rng.normal(size=n)), {})),
+    _case('BasicMath.divide', SMALL, LARGE,
+          lambda n, rng: ((rng.normal(size=n), rng.integers(-3, 3, n).astype(float)), {'errors': 'nan'})),
+    _case('BasicMath.power', SMALL, LARGE,
+          lambda n, rng: ((rng.uniform(0, 2, n), rng.uniform(-2, 2, n)), {})),
+    _case('BasicMath.square_root', SMALL, LARGE, lambda n, rng: ((rng.normal(size=n),), {'errors': 'nan'})),
+    _case('BasicMath.absolute_value', SMALL, LARGE, lambda n, rng: ((rng.normal(size=n),), {})),
+
+    _case('Algebra.solve_quadratic', [1], [1], lambda n, rng: ((1.0, -3.0, 2.0), {})),
+    _case('Algebra.solve_quadratic_batch', SMALL, [1_000, 100_000, 1_000_000],
+          lambda n, rng: ((rng.normal(size=n), rng.normal(size=n), rng.normal(size=n)), {})),
+    _case('Algebra.solve_linear_system', [10, 200], [10, 200, 2_000],
+          lambda n, rng: ((rng.normal(size=(n, n)) + n * np.eye(n), rng.normal(size=n)), {'use_cache': False})),
+    _case('Algebra.solve_linear_system', [200], [200, 2_000],
+          lambda n, rng: ((rng.normal(size=(n, n)) + n * np.eye(n), rng.normal(size=n)), {}), 'cached'),
+    _case('Algebra.load_sparse_matrix', SMALL, [1_000, 100_000, 1_000_000],
+          lambda n, rng: ((_tridiagonal(n), (n, n)), {})),
+    _case('Algebra.solve_sparse_system', SMALL, [1_000, 100_000, 1_000_000], _sparse_system),
+    _case('Algebra.polynomial_roots', [5, 50], [5, 50, 200], lambda n, rng: ((rng.normal(size=n + 1),), {})),
+    _case('Algebra.polynomial_roots_batch', [100, 10_000], [100, 10_000, 100_000],
+          lambda n, rng: ((rng.normal(size=(n, 6)),), {})),
+    _case('Algebra.polynomial_evaluate', SMALL, LARGE,
+          lambda n, rng: ((rng.normal(size=9), rng.normal(size=n)), {})),
+    _case('Algebra.polish_roots', [100, 10_000], [100, 10_000, 100_000], _polish_setup),
+    _case('Algebra.matrix_operations', [10, 200], [10, 200, 2_000],
+          lambda n, rng: ((rng.normal(size=(n, n)), rng.normal(size=(n, n))), {})),
+    _case('Algebra.matrix_operations', [10, 100], [10, 100, 500],
+          lambda n, rng: ((rng.normal(size=(n, n)).tolist(), rng.normal(size=(n, n)).tolist()), {}), 'lists'),
+    _case('Algebra.matrix_chain_product', [50, 200], [50, 200, 1_000], _chain),
+    _case('Algebra.matrix_chain_order', [10, 50], [10, 50, 200],
+          lambda n, rng: ((rng.integers(1, 100, n + 1).tolist(),), {})),
+
+    _case('Calculus.derivative', [1], [1], lambda n, rng: ((FORMULA, 0.5), {})),
+    _case('Calculus.derivative', [1], [1], lambda n, rng: ((FORMULA, 0.5), {'method': 'symbolic'}), 'symbolic'),
+    _case('Calculus.partial_derivative', [2, 10], [2, 10, 100],
+          lambda n, rng: ((lambda v: float(np.sum(np.sin(v) ** 2)), rng.normal(size=n).tolist(), 0), {})),
+    _case('Calculus.gradient', [10, 100], [10, 100, 1_000],
+          lambda n, rng: ((_sum_of_squares, rng.normal(size=n).tolist()), {'vectorized': True})),
+    _case('Calculus.jacobian', [10, 100], [10, 100, 1_000],
+          lambda n, rng: ((np.sin, rng.normal(size=n).tolist()), {'vectorized': True})),
+    _case('Calculus.hessian', [5, 20], [5, 20, 100],
+          lambda n, rng: ((_sum_of_squares, rng.normal(size=n).tolist()), {'vectorized': True})),
+    _case('Calculus.definite_integral', SMALL, [1_000, 100_000, 1_000_000],
+          lambda n, rng: ((FORMULA, 0.0, 3.0), {'n': n})),
+    _case('Calculus.definite_integral_batch', [10, 1_000], [10, 1_000, 10_000],
+          lambda n, rng: ((FORMULA, rng.uniform(-3, 0, n), rng.uniform(0, 3, n)), {})),
+    _case('Calculus.adaptive_integral', [1], [1], lambda n, rng: ((FORMULA, 0.0, 10.0), {})),
+    _case('Calculus.limit', [1], [1], lambda n, rng: (('sin(x)/x', 0.0), {})),
+    _case('Calculus.taylor_series', [100, 100_000], [100, 100_000, 1_000_000],
+          lambda n, rng: ((FORMULA, rng.uniform(-0.5, 0.5, n), 0.0, 8), {})),
+    _case('Calculus.taylor_polynomial', [4, 16], [4, 16, 32], lambda n, rng: ((FORMULA, 0.0, n), {})),
+
+    _case('Statistics.descriptive_stats', SMALL, LARGE, lambda n, rng: ((rng.normal(size=n),), {})),
+    _case('Statistics.batch_descriptive_stats', SMALL, [1_000, 100_000, 1_000_000],
+          lambda n, rng: ((rng.normal(size=(n, 8)),), {})),
+    _case('Statistics.correlation_matrix', SMALL, [1_000, 100_000, 1_000_000],
+          lambda n, rng: ((rng.normal(size=(n, 8)),), {})),
+    _case('Statistics.correlation_analysis', SMALL, LARGE,
+          lambda n, rng: ((rng.normal(size=n), rng.normal(size=n)), {})),
+    _case('Statistics.hypothesis_testing', SMALL, LARGE,
+          lambda n, rng: ((rng.normal(size=n), rng.normal(0.1, 1, n)), {})),
+    _case('Statistics.batch_hypothesis_testing', [100, 10_000], [100, 10_000, 100_000],
+          lambda n, rng: ((rng.normal(size=(50, n)), rng.normal(0.1, 1, (50, n))), {})),
+    _case('Statistics.batch_hypothesis_testing', [100, 10_000], [100, 10_000, 100_000],
+          lambda n, rng: ((rng.normal(size=(50, n)), rng.normal(0.1, 1, (50, n))),
+                          {'test_type': 'mann_whitney'}), 'mann_whitney'),
+    _case('Statistics.probability_distribution', [1], [1], lambda n, rng: (('normal',), {'mu': 1.0, 'sigma': 2.0})),
+    _case('Statistics.confidence_interval', SMALL, LARGE, lambda n, rng: ((rng.normal(size=n),), {})),
+
+    _case('Distributions.table', [10, 1_000], [10, 1_000, 10_000],
+          lambda n, rng: (('normal',), {'mu': rng.normal(size=n), 'sigma': 1.0, 'points': 200, 'cache': False})),
+    _case('Distributions.sample', SMALL, [1_000, 100_000, 10_000_000],
+          lambda n, rng: (('poisson',), {'size': n, 'seed': 0, 'mu': 3.0})),
+
+    _case('Resampling.bootstrap', [100, 10_000], [100, 10_000, 100_000],
+          lambda n, rng: ((rng.normal(size=n),), {'resamples': 1000, 'seed': 0})),
+    _case('Resampling.confidence_interval', [100, 10_000], [100, 10_000, 100_000],
+          lambda n, rng: ((rng.exponential(size=n),), {'resamples': 1000, 'seed': 0})),
+    _case('Resampling.permutation_test', [100, 10_000], [100, 10_000, 100_000],
+          lambda n, rng: ((rng.normal(size=n), rng.normal(0.1, 1, n)), {'resamples': 1000, 'seed': 0})),
+]
+
+
+def resolve(method: str) -> Callable:
+    """Look up 'Class.method' in its module."""
+    class_name, name = method.split('.')
+    return getattr(getattr(importlib.import_module(CLASSES[class_name]), class_name), name)
+
+
+def uncovered() -> List[str]:
+    """Public static methods of CLASSES that have no case."""
+    covered = {case['method'] for case in CASES}
+    missing = []
+    for class_name, module_name in CLASSES.items():
+        cls = getattr(importlib.import_module(module_name), class_name)
+        missing += [f"{class_name}.{name}" for name, member in vars(cls).items()
+                    if isinstance(member, staticmethod) and not name.startswith('_')
+                    and f"{class_name}.{name}" not in covered]
+    return missing
+
+
+def case_key(case: dict, n: int) -> str:
+    """Stable name of one case at one size, e.g. 'Algebra.solve_linear_system[cached]/n=200'."""
+    label = f"[{case['label']}]" if case['label'] else ''
+    return f"{case['method']}{label}/n={n}"
+
+
+def measure(function: Callable, args: tuple, kwargs: dict, min_time: float,
+            min_repeat: int = 5, max_repeat: int = 1000) -> dict:
+    """
+    Time repeated calls and measure peak memory of one more
+    Args:
+        function: Function to call
+        args: Positional arguments
+        kwargs: Keyword arguments
+        min_time: Keep repeating until this many seconds have been spent (up to max_repeat)
+        min_repeat: Fewest timed calls
+        max_repeat: Most timed calls
+    Returns:
+        Dictionary with repeats, latency statistics in seconds and peak_bytes
+    """
+    # Warm-up: imports, compiled expressions and other first-call costs
+    function(*args, **kwargs)
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_repeat or (len(latencies) < max_repeat
+                                          and time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+    # Peak memory is taken on a separate call, since tracing slows allocation down
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    latencies = np.array(latencies)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {'repeats': len(latencies), 'mean_s': float(latencies.mean()), 'min_s': float(latencies.min()),
+            'p50_s': float(p50), 'p90_s': float(p90), 'p99_s': float(p99), 'peak_bytes': int(peak)}
+
+
+def run(preset: str = 'quick', pattern: str = '', min_time: float = 0.2) -> Dict[str, dict]:
+    """
+    Run every matching case
+    Args:
+        preset: Size preset, 'quick' or 'full'
+        pattern: Only run cases whose key contains this text
+        min_time: Seconds to spend timing each case and size
+    Returns:
+        Results keyed by case_key; failed cases hold an 'error' message
+    """
+    results = {}
+    for case in CASES:
+        function = resolve(case['method'])
+        for n in case['sizes'][preset]:
+            key = case_key(case, n)
+            if pattern not in key:
+                continue
+            try:
+                args, kwargs = case['setup'](n, np.random.default_rng(0))
+                record = measure(function, args, kwargs, min_time)
+            except Exception as e:
+                results[key] = {'n': n, 'error': f"{type(e).__name__}: {e}"}
+                print(f"{key:<55} FAILED {results[key]['error']}")
+                continue
+            record['n'] = n
+            record['throughput_per_s'] = n / record['p50_s'] if record['p50_s'] > 0 else float('inf')
+            results[key] = record
+            print(f"{key:<55} p50 {_seconds(record['p50_s'])} | p99 {_seconds(record['p99_s'])} | "
+                  f"{record['throughput_per_s']:10.3g}/s | peak {_size(record['peak_bytes'])}")
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = 0.25,
+            memory_tolerance: float = 0.25, min_delta: float = 20e-6) -> List[dict]:
+    """
+    Compare results with a baseline
+    Args:
+        results: Current results (from run)
+        baseline: Baseline results
+        tolerance: Allowed relative increase of the median latency
+        memory_tolerance: Allowed relative increase of peak memory
+        min_delta: Latency increases below this many seconds are treated as noise
+    Returns:
+        One row per case present in both, with a 'status' of 'ok', 'faster',
+        'slower' or 'more memory'
+    """
+    rows = []
+    for key in sorted(set(results) & set(baseline)):
+        current, previous = results[key], baseline[key]
+        if 'error' in current or 'error' in previous:
+            continue
+        ratio = current['p50_s'] / previous['p50_s'] if previous['p50_s'] > 0 else float('inf')
+        memory_ratio = (current['peak_bytes'] / previous['peak_bytes']
+                        if previous['peak_bytes'] > 0 else 1.0)
+        status = 'ok'
+        if ratio > 1 + tolerance and current['p50_s'] - previous['p50_s'] > min_delta:
+            status = 'slower'
+        elif memory_ratio > 1 + memory_tolerance and current['peak_bytes'] - previous['peak_bytes'] > 65536:
+            status = 'more memory'
+        elif ratio < 1 / (1 + tolerance):
+            status = 'faster'
+        rows.append({'case': key, 'baseline_p50_s': previous['p50_s'], 'p50_s': current['p50_s'],
+                     'ratio': ratio, 'baseline_peak_bytes': previous['peak_bytes'],
+                     'peak_bytes': current['peak_bytes'], 'memory_ratio': memory_ratio, 'status': status})
+    return rows
+
+
+def _seconds(value: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if value >= scale:
+            return f"{value / scale:7.2f} {unit:<2}"
+    return f"{value / 1e-9:7.0f} ns"
+
+
+def _size(value: int) -> str:
+    for unit, scale in (('GiB', 2 ** 30), ('MiB', 2 ** 20), ('KiB', 2 ** 10)):
+        if value >= scale:
+            return f"{value / scale:7.1f} {unit}"
+    return f"{value:7d} B  "
+
+
+def environment(preset: str) -> dict:
+    """Versions and machine details stored with results, to judge whether a baseline applies."""
+    import scipy
+    return {'preset': preset, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(), 'numpy': np.__version__, 'scipy': scipy.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(), 'system': platform.system(),
+            'cpus': os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every public math operation")
+    parser.add_argument('--preset', choices=['quick', 'full'], default='quick',
+                        help="Input sizes: 'quick' (seconds) or 'full' (includes 10M-element and n=2000 cases)")
+    parser.add_argument('--filter', default='', help="Only run cases whose name contains this text")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Seconds spent timing each case")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Results file (JSON)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store these results as the baseline instead of comparing")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative slowdown of the median latency (0.25 = 25%%)")
+    parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                        help="Allowed relative increase of peak memory")
+    args = parser.parse_args()
+
+    failed = False
+    missing = uncovered()
+    if missing:
+        print(f"No benchmark case for: {', '.join(missing)}")
+        failed = True
+
+    results = run(args.preset, args.filter, args.min_time)
+    failed = failed or any('error' in record for record in results.values())
+    document = {'environment': environment(args.preset), 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.update_baseline:
+        if os.path.exists(args.baseline) and args.filter:
+            # A filtered run only replaces the cases it ran
+            with open(args.baseline) as f:
+                stored = json.load(f)
+            stored['results'].update(results)
+            document = {'environment': document['environment'], 'results': stored['results']}
+        with open(args.baseline, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"Stored baseline in {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        differences = {key: (value, document['environment'].get(key))
+                       for key, value in stored['environment'].items()
+                       if key not in ('created',) and value != document['environment'].get(key)}
+        for key, (before, after) in differences.items():
+            print(f"warning: baseline {key} was {before!r}, now {after!r}")
+        rows = compare(results, stored['results'], args.tolerance, args.memory_tolerance)
+        regressions = [row for row in rows if row['status'] in ('slower', 'more memory')]
+        print(f"\nCompared {len(rows)} cases with {args.baseline}: "
+              f"{len(regressions)} regression(s), "
+              f"{sum(row['status'] == 'faster' for row in rows)} faster")
+        for row in rows:
+            if row['status'] != 'ok':
+                print(f"{row['status'].upper():>12}  {row['case']:<55} "
+                      f"p50 {_seconds(row['baseline_p50_s'])} -> {_seconds(row['p50_s'])} "
+                      f"({row['ratio']:5.2f}x) | peak {_size(row['baseline_peak_bytes'])} -> "
+                      f"{_size(row['peak_bytes'])} ({row['memory_ratio']:5.2f}x)")
+        failed = failed or bool(regressions)
+    else:
+        print(f"No baseline at {args.baseline}; create one with --update-baseline")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
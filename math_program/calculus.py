@@ -1,122 +1,751 @@
-"""
-Calculus Module
-Contains calculus operations including derivatives, integrals, and limits.
-"""
-import numpy as np
-from typing import Callable, Union, List
-from scipy import integrate
-
-class Calculus:
-    @staticmethod
-    def derivative(f: Callable[[float], float], x: float, h: float = 1e-7) -> float:
-        """
-        Calculate numerical derivative of function f at point x using central difference method
-        Args:
-            f: Function to differentiate
-            x: Point at which to calculate derivative
-            h: Small step size
-        Returns:
-            Derivative value
-        """
-        return (f(x + h) - f(x - h)) / (2 * h)
-
-    @staticmethod
-    def partial_derivative(f: Callable[[List[float]], float], x: List[float], 
-                         variable: int, h: float = 1e-7) -> float:
-        """
-        Calculate partial derivative with respect to one variable
-        Args:
-            f: Multivariable function to differentiate
-            x: Point at which to calculate derivative [x1, x2, ...]
-            variable: Index of variable to differentiate with respect to
-            h: Small step size
-        Returns:
-            Partial derivative value
-        """
-        x_plus = x.copy()
-        x_minus = x.copy()
-        x_plus[variable] += h
-        x_minus[variable] -= h
-        return (f(x_plus) - f(x_minus)) / (2 * h)
-
-    @staticmethod
-    def definite_integral(f: Callable[[float], float], a: float, b: float, 
-                         method: str = 'trapezoid', n: int = 1000) -> float:
-        """
-        Calculate definite integral using various methods
-        Args:
-            f: Function to integrate
-            a: Lower bound
-            b: Upper bound
-            method: Integration method ('trapezoid', 'simpson', or 'quad')
-            n: Number of intervals (for trapezoid and simpson methods)
-        Returns:
-            Integral value
-        """
-        if method == 'trapezoid':
-            x = np.linspace(a, b, n)
-            y = np.array([f(xi) for xi in x])
-            return np.trapz(y, x)
-        elif method == 'simpson':
-            return integrate.simps([f(x) for x in np.linspace(a, b, n)], np.linspace(a, b, n))
-        elif method == 'quad':
-            result, _ = integrate.quad(f, a, b)
-            return result
-        else:
-            raise ValueError("Invalid method. Choose 'trapezoid', 'simpson', or 'quad'")
-
-    @staticmethod
-    def limit(f: Callable[[float], float], x: float, side: str = 'both', h: float = 1e-7) -> float:
-        """
-        Calculate limit of function f as x approaches a point
-        Args:
-            f: Function to evaluate limit
-            x: Point to approach
-            side: 'left', 'right', or 'both'
-            h: Small step size
-        Returns:
-            Limit value
-        Raises:
-            ValueError: If left and right limits don't match for side='both'
-        """
-        if side == 'left':
-            return f(x - h)
-        elif side == 'right':
-            return f(x + h)
-        else:
-            left_limit = f(x - h)
-            right_limit = f(x + h)
-            if abs(left_limit - right_limit) < h:
-                return (left_limit + right_limit) / 2
-            raise ValueError("Left and right limits do not match")
-
-    @staticmethod
-    def taylor_series(f: Callable[[float], float], x: float, a: float, 
-                     n: int = 4) -> Callable[[float], float]:
-        """
-        Generate Taylor series approximation of function f around point a
-        Args:
-            f: Function to approximate
-            x: Variable of the resulting polynomial
-            a: Point around which to expand
-            n: Number of terms (degree + 1)
-        Returns:
-            Function representing Taylor polynomial
-        """
-        def factorial(k):
-            if k == 0:
-                return 1
-            return k * factorial(k - 1)
-
-        def taylor_term(k):
-            if k == 0:
-                return f(a)
-            h = 1e-7
-            derivative = Calculus.derivative(
-                lambda t: taylor_term(k-1), 
-                a, 
-                h
-            )
-            return derivative * (x - a)**k / factorial(k)
-
-        return sum(taylor_term(i) for i in range(n))
+"""
+Calculus Module
+Contains calculus operations including derivatives, integrals, and limits.
+"""
+import heapq
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Union, List, Optional, Tuple
+from numpy.typing import ArrayLike
+import autodiff
+from expressions import Expression, compile_expression
+import instrument
+from lazy import lazy_import
+
+# Loaded on first use by the methods that call SciPy's quadrature routines
+integrate = lazy_import('scipy.integrate')
+
+# np.trapz was renamed to np.trapezoid in NumPy 2.0
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+# Numeric Taylor expansions halve their sampling radius at most this many times
+TAYLOR_HALVINGS = 30
+# Relative size of the highest sampled coefficients below which an expansion has converged
+TAYLOR_TOLERANCE = 1e-13
+# Estimated relative error each requested Taylor coefficient must reach
+TAYLOR_ACCURACY = 1e-6
+# Rounding noise of sampled coefficients, relative to the largest
+_NOISE = 1e-15
+# Times the Cauchy circle is resampled with twice the points while aliasing decays
+CAUCHY_REFINEMENTS = 2
+
+# 15-point Gauss-Kronrod rule on [-1, 1]; the 7-point Gauss rule reuses every
+# other node, so one set of 15 evaluations yields both estimates
+_GK_NODES = np.array([
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.0,
+])
+_GK_NODES = np.concatenate([-_GK_NODES[:-1], _GK_NODES[::-1]])
+_GK_KRONROD_WEIGHTS = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+])
+_GK_KRONROD_WEIGHTS = np.concatenate([_GK_KRONROD_WEIGHTS[:-1], _GK_KRONROD_WEIGHTS[::-1]])
+_GK_GAUSS_WEIGHTS = np.zeros(15)
+_GK_GAUSS_WEIGHTS[1::2] = [
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327,
+    0.381830050505118944950369775488975, 0.279705391489276667901467771423780,
+    0.129484966168869693270611432679082,
+]
+
+
+class Calculus:
+    @staticmethod
+    def _as_function(f: Union[Callable, str]) -> Callable:
+        """Compile formula strings such as 'sin(x)*exp(-x**2)'; pass callables through."""
+        return compile_expression(f) if isinstance(f, str) else f
+
+    @staticmethod
+    def _as_expression(f: Union[Expression, str]) -> Expression:
+        """Expression for method='symbolic', which needs the formula rather than a callable."""
+        f = Calculus._as_function(f)
+        if not isinstance(f, Expression):
+            raise ValueError("method='symbolic' needs a formula string or compiled Expression")
+        return f
+
+    @staticmethod
+    def derivative(f: Union[Callable[[float], float], str], x: float, h: float = 1e-7,
+                   method: str = 'finite_difference', order: int = 1) -> float:
+        """
+        Calculate numerical derivative of function f at point x
+        Args:
+            f: Function to differentiate
+            x: Point at which to calculate derivative
+            h: Small step size (finite_difference only)
+            method: 'finite_difference' (central difference), 'autodiff'
+                    (exact, one evaluation; f must use NumPy functions) or
+                    'symbolic' (exact; f must be a formula, whose compiled
+                    derivative is cached for later calls)
+            order: Order of the derivative (above 1 needs method='symbolic')
+        Returns:
+            Derivative value
+        """
+        if method == 'symbolic':
+            return Calculus._as_expression(f).derivative(order=order)(x)
+        if order != 1:
+            raise ValueError("Derivatives of order other than 1 need method='symbolic'")
+        f = Calculus._as_function(f)
+        if method == 'autodiff':
+            return autodiff.derivative(f, x)
+        elif method != 'finite_difference':
+            raise ValueError("Invalid method. Choose 'finite_difference', 'autodiff' or 'symbolic'")
+        return (f(x + h) - f(x - h)) / (2 * h)
+
+    @staticmethod
+    def partial_derivative(f: Union[Callable[[List[float]], float], str], x: List[float], 
+                         variable: int, h: float = 1e-7,
+                         method: str = 'finite_difference') -> float:
+        """
+        Calculate partial derivative with respect to one variable
+        Args:
+            f: Multivariable function to differentiate
+            x: Point at which to calculate derivative [x1, x2, ...]
+            variable: Index of variable to differentiate with respect to
+            h: Small step size (finite_difference only)
+            method: 'finite_difference' (central difference), 'autodiff'
+                    (exact, one evaluation; f must use NumPy functions) or
+                    'symbolic' (exact; f must be a formula)
+        Returns:
+            Partial derivative value
+        """
+        if method == 'symbolic':
+            f = Calculus._as_expression(f)
+            return float(f.derivative(f.variables[variable])(*x))
+        f = Calculus._as_function(f)
+        if method == 'autodiff':
+            # Seed only the chosen variable, so a single evaluation suffices
+            result = f([autodiff.Dual(xi, [float(i == variable)]) for i, xi in enumerate(x)])
+            return float(result.grad[0]) if isinstance(result, autodiff.Dual) else 0.0
+        elif method != 'finite_difference':
+            raise ValueError("Invalid method. Choose 'finite_difference', 'autodiff' or 'symbolic'")
+        x_plus = x.copy()
+        x_minus = x.copy()
+        x_plus[variable] += h
+        x_minus[variable] -= h
+        return (f(x_plus) - f(x_minus)) / (2 * h)
+
+    @staticmethod
+    def gradient(f: Union[Callable[[List[float]], float], str], x: List[float], h: float = 1e-7,
+                 method: str = 'finite_difference', vectorized: bool = False,
+                 workers: Optional[int] = None, executor: str = 'thread') -> np.ndarray:
+        """
+        Calculate the gradient of a scalar multivariable function
+        Args:
+            f: Function taking [x1, x2, ...] and returning a scalar
+            x: Point at which to calculate the gradient
+            h: Small step size (finite_difference only)
+            method: 'finite_difference' (central difference), 'autodiff' or
+                    'symbolic' (f must be a formula)
+            vectorized: f accepts an (N, P) array whose rows are the coordinates of
+                        P points and returns P values; all 2N perturbed points are
+                        then evaluated in a single call
+            workers: Number of pool workers for non-vectorized f (None = serial)
+            executor: 'thread' or 'process' pool (process needs a picklable f)
+        Returns:
+            Array of partial derivatives
+        """
+        if method == 'symbolic':
+            return np.array(Calculus._as_expression(f).gradient()(*x), dtype=float)
+        f = Calculus._as_function(f)
+        if method == 'autodiff':
+            return autodiff.gradient(f, x)
+        elif method != 'finite_difference':
+            raise ValueError("Invalid method. Choose 'finite_difference', 'autodiff' or 'symbolic'")
+        n = len(x)
+        values = Calculus._evaluate_points(f, Calculus._central_points(x, h),
+                                           vectorized, workers, executor)
+        return (values[:n] - values[n:]) / (2 * h)
+
+    @staticmethod
+    def jacobian(f: Union[Callable[[List[float]], List[float]], str], x: List[float], h: float = 1e-7,
+                 method: str = 'finite_difference', vectorized: bool = False,
+                 workers: Optional[int] = None, executor: str = 'thread') -> np.ndarray:
+        """
+        Calculate the Jacobian of a vector-valued multivariable function
+        Args:
+            f: Function taking [x1, x2, ...] and returning [f1, f2, ...]
+            x: Point at which to calculate the Jacobian
+            h: Small step size (finite_difference only)
+            method: 'finite_difference' (central difference) or 'autodiff'
+            vectorized: f accepts an (N, P) array of P points and returns an (M, P) array
+            workers: Number of pool workers for non-vectorized f (None = serial)
+            executor: 'thread' or 'process' pool (process needs a picklable f)
+        Returns:
+            Array of shape (M outputs, N inputs)
+        """
+        f = Calculus._as_function(f)
+        if method == 'autodiff':
+            return autodiff.jacobian(f, x)
+        elif method != 'finite_difference':
+            raise ValueError("Invalid method. Choose 'finite_difference' or 'autodiff'")
+        n = len(x)
+        values = Calculus._evaluate_points(f, Calculus._central_points(x, h),
+                                           vectorized, workers, executor)
+        return ((values[:n] - values[n:]) / (2 * h)).T
+
+    @staticmethod
+    def hessian(f: Union[Callable[[List[float]], float], str], x: List[float], h: float = 1e-4,
+                method: str = 'finite_difference', vectorized: bool = False,
+                workers: Optional[int] = None, executor: str = 'thread') -> np.ndarray:
+        """
+        Calculate the Hessian matrix of a scalar multivariable function
+        Args:
+            f: Function taking [x1, x2, ...] and returning a scalar
+            x: Point at which to calculate the Hessian
+            h: Step size; second differences need a larger step than first differences
+            method: 'finite_difference' (four-point second differences) or 'autodiff'
+                    (central differences of exact gradients, 2N evaluations)
+            vectorized: f accepts an (N, P) array of P points and returns P values
+            workers: Number of pool workers for non-vectorized f (None = serial)
+            executor: 'thread' or 'process' pool (process needs a picklable f)
+        Returns:
+            Symmetric array of shape (N, N)
+        """
+        f = Calculus._as_function(f)
+        n = len(x)
+        if method == 'autodiff':
+            points = Calculus._central_points(x, h)
+            grads = np.array([autodiff.gradient(f, list(p)) for p in points])
+            hess = (grads[:n] - grads[n:]) / (2 * h)
+            return 0.5 * (hess + hess.T)
+        elif method != 'finite_difference':
+            raise ValueError("Invalid method. Choose 'finite_difference' or 'autodiff'")
+
+        # H[i, j] = (f(++) - f(+-) - f(-+) + f(--)) / (4 h^2) for every pair i <= j,
+        # with all 4 * N(N+1)/2 points built up front and evaluated together
+        rows, cols = np.triu_indices(n)
+        signs = np.array([[1, 1], [1, -1], [-1, 1], [-1, -1]], dtype=float)
+        steps = np.zeros((4, len(rows), n))
+        pairs = np.arange(len(rows))
+        for k, (si, sj) in enumerate(signs):
+            steps[k, pairs, rows] += si * h
+            steps[k, pairs, cols] += sj * h
+        points = np.asarray(x, dtype=float) + steps.reshape(-1, n)
+        values = Calculus._evaluate_points(f, points, vectorized, workers, executor)
+        values = values.reshape(4, len(rows))
+        upper = (values[0] - values[1] - values[2] + values[3]) / (4 * h * h)
+
+        hess = np.zeros((n, n))
+        hess[rows, cols] = upper
+        hess[cols, rows] = upper
+        return hess
+
+    @staticmethod
+    def _central_points(x: List[float], h: float) -> np.ndarray:
+        """Build the (2N, N) array of points x + h*e_i (first N rows) and x - h*e_i."""
+        x = np.asarray(x, dtype=float)
+        steps = h * np.eye(len(x))
+        return x + np.concatenate([steps, -steps])
+
+    @staticmethod
+    def _evaluate_points(f: Callable, points: np.ndarray, vectorized: bool = False,
+                         workers: Optional[int] = None, executor: str = 'thread') -> np.ndarray:
+        """
+        Evaluate f at each row of points
+        Vectorized functions receive points.T in one call, so f(x) can keep
+        indexing coordinates as x[0], x[1], ...; otherwise each row is passed
+        as a list, optionally through a thread or process pool. Compiled
+        expressions in the same number of variables are always vectorized.
+        """
+        if vectorized or (isinstance(f, Expression) and len(f.variables) == points.shape[1] > 1):
+            return np.moveaxis(np.asarray(f(points.T), dtype=float), -1, 0)
+        rows = points.tolist()
+        if workers:
+            if executor not in ('thread', 'process'):
+                raise ValueError("Invalid executor. Choose 'thread' or 'process'")
+            pool_type = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+            chunksize = max(1, len(rows) // (4 * workers))
+            with pool_type(max_workers=workers) as pool:
+                return np.array(list(pool.map(f, rows, chunksize=chunksize)), dtype=float)
+        return np.array([f(row) for row in rows], dtype=float)
+
+    @staticmethod
+    def definite_integral(f: Union[Callable[[float], float], str], a: float, b: float, 
+                         method: str = 'trapezoid', n: int = 1000) -> float:
+        """
+        Calculate definite integral using various methods
+        Args:
+            f: Function to integrate
+            a: Lower bound
+            b: Upper bound
+            method: Integration method ('trapezoid', 'simpson', 'quad', or 'adaptive')
+            n: Number of intervals (for trapezoid and simpson methods)
+        Returns:
+            Integral value
+        """
+        f = Calculus._as_function(f)
+        if method in ('trapezoid', 'simpson'):
+            x = np.linspace(a, b, n)
+            with instrument.phase('evaluate'):
+                if isinstance(f, Expression):
+                    y = Calculus._evaluate_grid(f, x)
+                else:
+                    y = np.array([f(xi) for xi in x])
+            with instrument.phase('integrate'):
+                if method == 'trapezoid':
+                    return _trapezoid(y, x)
+                return integrate.simpson(y, x=x)
+        elif method == 'quad':
+            result, _ = integrate.quad(f, a, b)
+            return result
+        elif method == 'adaptive':
+            return Calculus.adaptive_integral(f, a, b)['value']
+        else:
+            raise ValueError("Invalid method. Choose 'trapezoid', 'simpson', 'quad', or 'adaptive'")
+
+    @staticmethod
+    def definite_integral_batch(f: Union[Callable, str], a: ArrayLike, b: ArrayLike,
+                                method: str = 'trapezoid', n: int = 1000,
+                                vectorized: bool = True) -> np.ndarray:
+        """
+        Calculate many definite integrals of the same function at once
+        Args:
+            f: Function to integrate; if NumPy-aware it is called once on a
+               (k, n) grid of sample points
+            a: Lower bounds (scalar or array, broadcast against b)
+            b: Upper bounds (scalar or array, broadcast against a)
+            method: Integration method ('trapezoid', 'simpson', or 'quad')
+            n: Number of sample points per integral (for trapezoid and simpson methods)
+            vectorized: Try calling f on the whole grid first; f is called
+                        point by point if it cannot handle arrays
+        Returns:
+            Array of integral values with the broadcast shape of a and b
+        """
+        f = Calculus._as_function(f)
+        a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
+        if method == 'quad':
+            values = [integrate.quad(f, lo, hi)[0] for lo, hi in zip(a.ravel(), b.ravel())]
+            return np.array(values).reshape(a.shape)
+        if method not in ('trapezoid', 'simpson'):
+            raise ValueError("Invalid method. Choose 'trapezoid', 'simpson', or 'quad'")
+
+        # One shared unit grid, scaled per integral: x[..., j] = a + (b - a) * t[j]
+        t = np.linspace(0.0, 1.0, n)
+        width = b - a
+        x = a[..., None] + width[..., None] * t
+        y = Calculus._evaluate_grid(f, x, vectorized)
+
+        # Every row is a uniform grid, so integrate with unit spacing and rescale
+        dx = width / (n - 1)
+        if method == 'trapezoid':
+            unit = y.sum(axis=-1) - 0.5 * (y[..., 0] + y[..., -1])
+        else:
+            unit = integrate.simpson(y, dx=1.0, axis=-1)
+        return unit * dx
+
+    @staticmethod
+    def adaptive_integral(f: Union[Callable[[float], float], str], a: float, b: float,
+                          atol: float = 1e-10, rtol: float = 1e-8,
+                          method: str = 'gauss_kronrod', max_evals: int = 10000,
+                          vectorized: bool = True) -> dict:
+        """
+        Calculate definite integral to a requested tolerance
+        Args:
+            f: Function to integrate
+            a: Lower bound
+            b: Upper bound
+            atol: Absolute error target
+            rtol: Relative error target; stops once error <= max(atol, rtol * |value|)
+            method: 'gauss_kronrod' (adaptive bisection with a 7/15-point rule)
+                    or 'romberg' (Richardson-extrapolated trapezoid halving)
+            max_evals: Maximum number of function evaluations
+            vectorized: Try calling f on arrays of points before falling back
+                        to point-by-point evaluation
+        Returns:
+            Dictionary with 'value', 'error' (estimate), 'evaluations' and 'converged'
+        """
+        f = Calculus._as_function(f)
+        if method == 'gauss_kronrod':
+            return Calculus._gauss_kronrod(f, a, b, atol, rtol, max_evals, vectorized)
+        elif method == 'romberg':
+            return Calculus._romberg(f, a, b, atol, rtol, max_evals, vectorized)
+        else:
+            raise ValueError("Invalid method. Choose 'gauss_kronrod' or 'romberg'")
+
+    @staticmethod
+    def _gauss_kronrod(f, a, b, atol, rtol, max_evals, vectorized) -> dict:
+        """Globally adaptive 7/15-point Gauss-Kronrod integration."""
+        def panels(bounds):
+            # Evaluate all panels in one call: bounds is a (k, 2) array
+            centers = 0.5 * (bounds[:, 0] + bounds[:, 1])
+            half = 0.5 * (bounds[:, 1] - bounds[:, 0])
+            y = Calculus._evaluate_grid(f, centers[:, None] + half[:, None] * _GK_NODES, vectorized)
+            kronrod = half * (y @ _GK_KRONROD_WEIGHTS)
+            gauss = half * (y @ _GK_GAUSS_WEIGHTS)
+            return kronrod, np.abs(kronrod - gauss)
+
+        values, errors = panels(np.array([[a, b]], dtype=float))
+        evaluations = 15
+        # Max-heap on error estimate (heapq is a min-heap, so store -error)
+        heap = [(-errors[0], a, b, values[0])]
+        total, total_error = values[0], errors[0]
+
+        while total_error > max(atol, rtol * abs(total)) and evaluations + 30 <= max_evals:
+            neg_error, lo, hi, value = heapq.heappop(heap)
+            mid = 0.5 * (lo + hi)
+            halves, half_errors = panels(np.array([[lo, mid], [mid, hi]]))
+            evaluations += 30
+            total += halves.sum() - value
+            total_error += half_errors.sum() + neg_error
+            heapq.heappush(heap, (-half_errors[0], lo, mid, halves[0]))
+            heapq.heappush(heap, (-half_errors[1], mid, hi, halves[1]))
+
+        # Re-sum from the panels to avoid drift from the running updates
+        total = sum(panel[3] for panel in heap)
+        total_error = -sum(panel[0] for panel in heap)
+        return {
+            'value': float(total),
+            'error': float(total_error),
+            'evaluations': evaluations,
+            'converged': bool(total_error <= max(atol, rtol * abs(total)))
+        }
+
+    @staticmethod
+    def _romberg(f, a, b, atol, rtol, max_evals, vectorized) -> dict:
+        """Romberg integration; each level only evaluates the new midpoints."""
+        width = b - a
+        ends = Calculus._evaluate_grid(f, np.array([a, b], dtype=float), vectorized)
+        evaluations = 2
+        previous = [0.5 * width * ends.sum()]
+        value, error = previous[0], float('inf')
+        level = 0
+
+        while evaluations + 2 ** level <= max_evals:
+            level += 1
+            count = 2 ** (level - 1)
+            h = width / count
+            midpoints = a + h * (np.arange(count) + 0.5)
+            new = Calculus._evaluate_grid(f, midpoints, vectorized)
+            evaluations += count
+
+            row = [0.5 * previous[0] + 0.5 * h * new.sum()]
+            for k in range(1, level + 1):
+                factor = 4.0 ** k
+                row.append(row[k - 1] + (row[k - 1] - previous[k - 1]) / (factor - 1))
+            value, error = row[-1], abs(row[-1] - previous[-1])
+            previous = row
+            # Require a few levels so coincidental agreement does not stop early
+            if level >= 3 and error <= max(atol, rtol * abs(value)):
+                break
+
+        return {
+            'value': float(value),
+            'error': float(error),
+            'evaluations': evaluations,
+            'converged': bool(error <= max(atol, rtol * abs(value)))
+        }
+
+    @staticmethod
+    def _evaluate_grid(f: Callable, x: np.ndarray, vectorized: bool = True) -> np.ndarray:
+        """Evaluate f over an array of points, preferring a single vectorized call."""
+        if vectorized:
+            try:
+                y = np.asarray(f(x), dtype=float)
+                if y.shape == x.shape:
+                    return y
+                if y.ndim == 0:
+                    # Constant functions such as lambda x: 1.0 return a scalar
+                    return np.full(x.shape, float(y))
+            except (TypeError, ValueError):
+                pass
+        values = np.fromiter((f(xi) for xi in x.ravel()), dtype=float, count=x.size)
+        return values.reshape(x.shape)
+
+    @staticmethod
+    def limit(f: Union[Callable[[float], float], str], x: float, side: str = 'both', h: float = 1e-7) -> float:
+        """
+        Calculate limit of function f as x approaches a point
+        Args:
+            f: Function to evaluate limit
+            x: Point to approach
+            side: 'left', 'right', or 'both'
+            h: Small step size
+        Returns:
+            Limit value
+        Raises:
+            ValueError: If left and right limits don't match for side='both'
+        """
+        f = Calculus._as_function(f)
+        if side == 'left':
+            return f(x - h)
+        elif side == 'right':
+            return f(x + h)
+        else:
+            left_limit = f(x - h)
+            right_limit = f(x + h)
+            if abs(left_limit - right_limit) < h:
+                return (left_limit + right_limit) / 2
+            raise ValueError("Left and right limits do not match")
+
+    @staticmethod
+    def taylor_series(f: Union[Callable[[float], float], str], x: ArrayLike, a: float,
+                     n: int = 4, method: Optional[str] = None) -> Union[float, np.ndarray]:
+        """
+        Evaluate the Taylor series approximation of function f around point a
+        Args:
+            f: Function to approximate
+            x: Point (or array of points) at which to evaluate the polynomial
+            a: Point around which to expand
+            n: Number of terms (degree + 1)
+            method: How coefficients are computed (see taylor_polynomial)
+        Returns:
+            Value of the Taylor polynomial at x
+        """
+        f = Calculus._as_function(f)
+        return Calculus.taylor_polynomial(f, a, n, method)(x)
+
+    @staticmethod
+    def taylor_polynomial(f: Union[Callable[[float], float], str], a: float, n: int = 4,
+                          method: Optional[str] = None, radius: float = 1.0,
+                          vectorized: bool = True) -> 'TaylorPolynomial':
+        """
+        Build a reusable Taylor polynomial of f around point a
+        All derivatives up to order n-1 come from a single batch of samples.
+        Args:
+            f: Function to approximate
+            a: Point around which to expand
+            n: Number of terms (degree + 1)
+            method: 'symbolic' (exact derivatives of a formula; the default for
+                    formulas), 'interpolation' (Chebyshev interpolant on
+                    [a - r, a + r], works for any real function) or 'cauchy'
+                    (FFT of samples on a complex circle of radius r, requires f
+                    to accept complex input and be analytic). Callables default
+                    to 'interpolation', switching to 'cauchy' when real samples
+                    cannot resolve all n coefficients (e.g. n = 20 for exp)
+            radius: Largest sampling radius r; it is halved until the samples are
+                    finite and the expansion has converged, so singularities and
+                    domain boundaries near a are stepped around
+            vectorized: Try calling f on the whole sample array first
+        Returns:
+            TaylorPolynomial with coefficients f^(k)(a) / k!
+        Raises:
+            ValueError: If the coefficients do not converge for any radius down
+                        to radius / 2**TAYLOR_HALVINGS, not all n can be resolved
+                        to TAYLOR_ACCURACY, or symbolic derivatives at a are not finite
+        """
+        f = Calculus._as_function(f)
+        if n < 1:
+            raise ValueError("Number of terms must be at least 1")
+        if radius <= 0:
+            raise ValueError("Radius must be positive")
+        automatic = method is None
+        if automatic:
+            method = 'symbolic' if isinstance(f, Expression) else 'interpolation'
+
+        if method == 'interpolation':
+            try:
+                coefficients = Calculus._adaptive_taylor(Calculus._chebyshev_taylor, f, a, n, radius, vectorized)
+            except ValueError as error:
+                if not automatic:
+                    raise
+                # Real samples cannot resolve high orders of entire functions such
+                # as exp; a circle in the complex plane can, if f accepts complex input
+                try:
+                    coefficients = Calculus._adaptive_taylor(Calculus._cauchy_taylor, f, a, n, radius, vectorized)
+                except (TypeError, ValueError, ArithmeticError):
+                    raise error from None
+        elif method == 'cauchy':
+            coefficients = Calculus._adaptive_taylor(Calculus._cauchy_taylor, f, a, n, radius, vectorized)
+        elif method == 'symbolic':
+            # f(a), f'(a), ..., f^(n-1)(a) from one evaluation of the compiled derivatives
+            with np.errstate(all='ignore'):
+                derivatives = np.array(Calculus._as_expression(f).derivatives(n - 1)(a), dtype=float)
+            if not np.isfinite(derivatives).all():
+                raise ValueError(f"Derivatives of f are not finite at {a}")
+            coefficients = derivatives / np.cumprod(np.concatenate([[1.0], np.arange(1.0, n)]))
+        else:
+            raise ValueError("Invalid method. Choose 'interpolation', 'cauchy' or 'symbolic'")
+
+        coefficients = np.pad(coefficients[:n], (0, max(0, n - len(coefficients))))
+        return TaylorPolynomial(coefficients, a)
+
+    @staticmethod
+    def _adaptive_taylor(expand: Callable, f: Callable, a: float, n: int, radius: float,
+                         vectorized: bool) -> np.ndarray:
+        """
+        Taylor coefficients from expand at an adaptively chosen radius
+        The radius is halved until the expansion converges. If some of the n
+        coefficients are then below rounding level or inaccurate (entire
+        functions such as exp on a small radius), it is doubled until they are
+        resolved, or until doubling resolves no new orders (polynomials, whose
+        higher coefficients are exactly zero).
+        Raises:
+            ValueError: If no radius converges or resolves all n coefficients
+        """
+        r = radius
+        for _ in range(TAYLOR_HALVINGS + 1):
+            expansion = expand(f, a, n, r, vectorized)
+            if expansion is not None:
+                break
+            r /= 2
+        else:
+            raise ValueError(f"Taylor coefficients did not converge for any radius down to {r * 2:.3g}; "
+                             "f may not be smooth at a")
+        coefficients, last, accurate = expansion
+        complete = last >= n - 1
+        if r == radius:
+            for _ in range(TAYLOR_HALVINGS):
+                if complete and accurate:
+                    break
+                larger = expand(f, a, n, 2 * r, vectorized)
+                if larger is None:
+                    break
+                if larger[1] <= last:
+                    # No new orders appear on a larger radius: the rest are exactly zero
+                    complete = True
+                    break
+                r *= 2
+                coefficients, last, accurate = larger
+                complete = last >= n - 1
+        if not (complete and accurate):
+            raise ValueError(f"Only the first {last + 1 if accurate else 'few'} of {n} Taylor coefficients "
+                             "can be resolved from samples of f; use fewer terms or method='symbolic'")
+        return coefficients
+
+    @staticmethod
+    def _resolved(coefficients: np.ndarray, errors: np.ndarray, radius: float, n: int) -> bool:
+        """
+        Whether the first n coefficients are accurate to TAYLOR_ACCURACY
+        Errors are compared with the largest term c_j r^j of order j >= k, so
+        coefficients that are zero by symmetry do not count as unresolved.
+        """
+        terms = np.abs(coefficients) * radius ** np.arange(len(coefficients))
+        envelope = np.maximum.accumulate(terms[::-1])[::-1][:n]
+        scaled = errors[:n] * radius ** np.arange(min(n, len(errors)))
+        return bool(np.all((scaled <= TAYLOR_ACCURACY * envelope[:len(scaled)]) | (envelope[:len(scaled)] == 0)))
+
+    @staticmethod
+    def _chebyshev_taylor(f: Callable, a: float, n: int, radius: float,
+                          vectorized: bool) -> Optional[Tuple[np.ndarray, int, bool]]:
+        """
+        Taylor coefficients from a Chebyshev interpolant on [a - radius, a + radius]
+        Returns the coefficients, the highest order above rounding level and
+        whether the first n are accurate, or None if the interpolant has not converged.
+        """
+        # Interpolate at Chebyshev points of a degree high enough that the
+        # leading n coefficients have converged (same scheme as chebinterpolate);
+        # twice n leaves them well above the tail that must have decayed
+        degree = max(2 * n, 32)
+        nodes = np.polynomial.chebyshev.chebpts1(degree + 1)
+        with np.errstate(all='ignore'):
+            y = Calculus._evaluate_grid(f, a + radius * nodes, vectorized)
+        if not np.isfinite(y).all():
+            return None
+        cheb = np.polynomial.chebyshev.chebvander(nodes, degree).T @ y
+        cheb[0] /= degree + 1
+        cheb[1:] /= 0.5 * (degree + 1)
+        scale = np.abs(cheb).max()
+        # The last coefficients (both parities) must have decayed to rounding level
+        if np.abs(cheb[-4:]).max() > TAYLOR_TOLERANCE * scale:
+            return None
+        # Drop the trailing coefficients that are only rounding noise; the
+        # power-basis conversion would otherwise amplify them by up to 2^degree
+        significant = np.nonzero(np.abs(cheb) >= 1e-14 * scale)[0]
+        last = int(significant[-1]) if len(significant) else 0
+        # Row j holds the power-basis coefficients of T_j on [-1, 1]
+        conversion = np.zeros((last + 1, last + 1))
+        conversion[0, 0] = 1.0
+        for j in range(1, last + 1):
+            # T_j = 2t T_{j-1} - T_{j-2}, with T_1 = t
+            conversion[j, 1:] = (2.0 if j > 1 else 1.0) * conversion[j - 1, :-1]
+            if j > 1:
+                conversion[j] -= conversion[j - 2]
+        coefficients = (cheb[:last + 1] @ conversion) / radius ** np.arange(last + 1)
+        # Rounding noise in each Chebyshev coefficient, carried through the conversion
+        errors = _NOISE * scale * np.abs(conversion).sum(axis=0) / radius ** np.arange(last + 1)
+        return coefficients, last, Calculus._resolved(coefficients, errors, radius, n)
+
+    @staticmethod
+    def _circle_samples(f: Callable, z: np.ndarray, vectorized: bool) -> np.ndarray:
+        """Complex samples f(z), calling f on the whole array when vectorized."""
+        with np.errstate(all='ignore'):
+            if vectorized:
+                try:
+                    y = np.asarray(f(z), dtype=complex)
+                    if y.shape == z.shape:
+                        return y
+                except (TypeError, ValueError):
+                    pass
+            return np.array([f(zi) for zi in z], dtype=complex)
+
+    @staticmethod
+    def _cauchy_taylor(f: Callable, a: float, n: int, radius: float,
+                       vectorized: bool) -> Optional[Tuple[np.ndarray, int, bool]]:
+        """
+        Taylor coefficients from Cauchy's integral formula on a circle
+        Returns the coefficients, the highest order above rounding level and
+        whether the first n are accurate, or None if the samples show a
+        singularity or branch cut in the disk.
+        """
+        # f^(k)(a) / k! = mean_j f(a + r e^{i theta_j}) e^{-i k theta_j} / r^k
+        points = max(4 * n, 64)
+        tail = np.inf
+        for _ in range(CAUCHY_REFINEMENTS + 1):
+            y = Calculus._circle_samples(f, a + radius * np.exp(2j * np.pi * np.arange(points) / points),
+                                         vectorized)
+            if not np.isfinite(y).all():
+                return None
+            terms = np.fft.fft(y) / points
+            scale = np.abs(terms).max()
+            # Inside a disk where f is analytic the high (aliased) and negative
+            # powers vanish; anything left there means a singularity or branch
+            # cut, unless it shrinks on more points (slowly decaying aliasing)
+            previous, tail = tail, np.abs(terms[points // 2 - 4:]).max() / scale
+            if tail <= TAYLOR_TOLERANCE:
+                break
+            if tail > previous ** 1.5:
+                return None
+            points *= 2
+        else:
+            return None
+        terms = terms[:points // 2].real
+        significant = np.nonzero(np.abs(terms) >= 1e-14 * scale)[0]
+        last = int(significant[-1]) if len(significant) else 0
+        # Terms at rounding level are zeroed rather than amplified by 1 / r^k
+        terms[last + 1:] = 0
+        powers = radius ** np.arange(len(terms))
+        errors = np.where(terms != 0, _NOISE * scale, 0.0) / powers
+        coefficients = terms / powers
+        return coefficients[:max(n, last + 1)], last, Calculus._resolved(coefficients, errors, radius, n)
+
+
+class TaylorPolynomial:
+    """
+    Polynomial sum(c_k * (x - center)**k) evaluated with Horner's method
+    Args:
+        coefficients: Coefficients [c_0, c_1, ..., c_n] in increasing order
+        center: Expansion point
+    """
+
+    def __init__(self, coefficients: ArrayLike, center: float = 0.0):
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.center = float(center)
+
+    @property
+    def degree(self) -> int:
+        """Degree of the polynomial."""
+        return len(self.coefficients) - 1
+
+    @property
+    def derivatives(self) -> np.ndarray:
+        """Derivative values f^(k)(center) for k = 0..degree."""
+        factorials = np.cumprod(np.concatenate([[1.0], np.arange(1, len(self.coefficients))]))
+        return self.coefficients * factorials
+
+    def __call__(self, x: ArrayLike) -> Union[float, np.ndarray]:
+        """Evaluate the polynomial at x (scalar or array)."""
+        t = np.asarray(x, dtype=float) - self.center
+        result = np.full(t.shape, self.coefficients[-1])
+        for c in self.coefficients[-2::-1]:
+            result *= t
+            result += c
+        return result if result.ndim else float(result)
+
+    def __repr__(self) -> str:
+        return f"TaylorPolynomial(degree={self.degree}, center={self.center})"
@@ -0,0 +1,210 @@
+"""
+Datasets Module
+Bounded-memory access to on-disk numerical data and streaming quantile sketches.
+"""
+import itertools
+import os
+import numpy as np
+from typing import Iterator, List, Optional, Union
+from numpy.typing import ArrayLike
+
+
+class Dataset:
+    """
+    Numerical data read in bounded-memory chunks
+    Args:
+        source: Path to a .npy, .csv/.txt or raw binary file, or an in-memory array
+        dtype: Element type of raw binary files
+        column: Column to read from 2-D .npy arrays or delimited text files
+        delimiter: Field separator for text files
+        skip_header: Number of leading text lines to skip
+        chunk_size: Maximum number of values per chunk
+        file_format: 'npy', 'csv' or 'binary'; inferred from the extension if omitted
+    """
+
+    def __init__(self, source: Union[str, os.PathLike, ArrayLike], dtype: str = 'float64',
+                 column: Optional[int] = None, delimiter: str = ',', skip_header: int = 0,
+                 chunk_size: int = 1_000_000, file_format: Optional[str] = None):
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        self.source = source
+        self.column = column
+        self.delimiter = delimiter
+        self.skip_header = skip_header
+        self.chunk_size = chunk_size
+        self._array = None
+
+        if not isinstance(source, (str, os.PathLike)):
+            self.file_format = 'array'
+            self._array = np.asarray(source)
+            return
+
+        if file_format is None:
+            extension = os.path.splitext(os.fspath(source))[1].lower()
+            file_format = {'.npy': 'npy', '.csv': 'csv', '.txt': 'csv'}.get(extension, 'binary')
+        if file_format == 'npy':
+            # Memory-mapped: only the pages touched by a chunk are read
+            self._array = np.load(source, mmap_mode='r')
+        elif file_format == 'binary':
+            self._array = np.memmap(source, dtype=dtype, mode='r')
+        elif file_format != 'csv':
+            raise ValueError("Invalid file format. Choose 'npy', 'csv', or 'binary'")
+        self.file_format = file_format
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """
+        Iterate over the data
+        Returns:
+            Iterator of 1-D float64 arrays of at most chunk_size values
+        """
+        if self._array is not None:
+            array = self._array
+            if array.ndim > 1:
+                if self.column is None:
+                    array = array.reshape(-1)
+                else:
+                    array = array[:, self.column]
+            for start in range(0, len(array), self.chunk_size):
+                yield np.asarray(array[start:start + self.chunk_size], dtype=float)
+            return
+
+        with open(self.source) as handle:
+            lines = itertools.islice(handle, self.skip_header, None)
+            while True:
+                block = list(itertools.islice(lines, self.chunk_size))
+                if not block:
+                    break
+                values = np.loadtxt(block, delimiter=self.delimiter, usecols=self.column,
+                                    dtype=float, ndmin=1)
+                yield values.reshape(-1)
+
+    def __repr__(self) -> str:
+        return f"Dataset({self.source!r}, format={self.file_format!r})"
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL quantile sketch with bounded memory
+    Keeps a few times k values regardless of stream length; rank error is
+    roughly proportional to 1/k.
+    Args:
+        k: Accuracy parameter (capacity of the top compactor)
+        seed: Seed for the random compaction offsets
+    """
+
+    def __init__(self, k: int = 512, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        """Capacity of a compactor; lower levels shrink geometrically."""
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values: Union[float, ArrayLike]) -> 'QuantileSketch':
+        """
+        Add a value or a chunk of values
+        Args:
+            values: Scalar or array-like chunk
+        Returns:
+            self, to allow chaining
+        """
+        chunk = np.asarray(values, dtype=float).ravel()
+        self.compactors[0] = np.concatenate([self.compactors[0], chunk])
+        self.count += chunk.size
+        self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Fold another sketch into this one
+        Args:
+            other: Sketch built on a different part of the data
+        Returns:
+            self, to allow chaining
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _compress(self):
+        """Halve every over-full compactor, promoting alternate sorted items a level up."""
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                # An odd leftover stays behind so total weight is preserved
+                keep = len(items) % 2
+                promoted = items[keep:][self._rng.integers(2)::2]
+                self.compactors[level] = items[:keep]
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
+
+    def _weighted_items(self):
+        """Return sorted retained items with their cumulative weights."""
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2.0 ** level)
+                                  for level, c in enumerate(self.compactors)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q: Union[float, ArrayLike]) -> Union[float, np.ndarray]:
+        """
+        Estimate quantiles of everything added so far
+        Args:
+            q: Quantile or array of quantiles in [0, 1]
+        Returns:
+            Estimated value(s)
+        """
+        if self.count == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch")
+        items, cumulative = self._weighted_items()
+        target = np.asarray(q, dtype=float) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, target, side='left'), len(items) - 1)
+        result = items[index]
+        return result if result.ndim else float(result)
+
+    def cdf(self, values: ArrayLike) -> np.ndarray:
+        """
+        Estimate the fraction of data at or below each value
+        Args:
+            values: Points at which to evaluate the empirical CDF
+        Returns:
+            Array of fractions in [0, 1]
+        """
+        if self.count == 0:
+            raise ValueError("Cannot compute the CDF of an empty sketch")
+        items, cumulative = self._weighted_items()
+        index = np.searchsorted(items, np.asarray(values, dtype=float), side='right')
+        ranks = np.concatenate([[0.0], cumulative])[index]
+        return ranks / cumulative[-1]
+
+    def mid_ranks(self, values: ArrayLike) -> np.ndarray:
+        """
+        Estimate the fraction of data below each value plus half the fraction equal to it
+        Unlike cdf, ties share their average rank, so the mid-ranks of the data
+        itself have mean 1/2.
+        Args:
+            values: Points at which to evaluate the mid-ranks
+        Returns:
+            Array of fractions in [0, 1]
+        """
+        if self.count == 0:
+            raise ValueError("Cannot compute ranks for an empty sketch")
+        items, cumulative = self._weighted_items()
+        values = np.asarray(values, dtype=float)
+        ranks = np.concatenate([[0.0], cumulative])
+        lower = ranks[np.searchsorted(items, values, side='left')]
+        upper = ranks[np.searchsorted(items, values, side='right')]
+        return (lower + upper) / (2 * cumulative[-1])
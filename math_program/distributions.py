@@ -0,0 +1,183 @@
+"""
+Distributions Module
+Vectorized probability distribution tables over many parameter sets, seeded sampling
+and a cache of computed grids.
+"""
+import numpy as np
+from typing import Dict, Optional, Union
+from numpy.typing import ArrayLike
+from lazy import lazy_import
+from memoize import ResultCache, content_key
+
+stats = lazy_import('scipy.stats')
+
+# Upper tail mass left out of the default grids of unbounded distributions
+_TAIL = 1e-6
+
+# name -> (parameter defaults in order, discrete)
+FAMILIES = {
+    'normal': ({'mu': 0.0, 'sigma': 1.0}, False),
+    'uniform': ({'a': 0.0, 'b': 1.0}, False),
+    'exponential': ({'rate': 1.0}, False),
+    'poisson': ({'mu': 1.0}, True),
+    'binomial': ({'n': 10, 'p': 0.5}, True),
+}
+
+
+class Distributions:
+    # Tables already computed, keyed by a hash of the request
+    grid_cache = ResultCache(maxsize=128, max_bytes=64 * 1024 * 1024)
+
+    @staticmethod
+    def _parameters(dist_type: str, params: dict) -> Dict[str, np.ndarray]:
+        """Validate parameters and broadcast them to 1-D arrays of a common length."""
+        if dist_type not in FAMILIES:
+            raise ValueError(f"Unsupported distribution type. Choose from {', '.join(FAMILIES)}")
+        defaults, _ = FAMILIES[dist_type]
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown parameter(s) for {dist_type}: {', '.join(sorted(unknown))}")
+        values = np.broadcast_arrays(*(np.atleast_1d(np.asarray(params.get(name, default), dtype=float))
+                                       for name, default in defaults.items()))
+        if any(value.ndim != 1 for value in values):
+            raise ValueError("Distribution parameters must be scalars or 1-D arrays")
+        p = dict(zip(defaults, values))
+
+        if dist_type == 'normal' and np.any(p['sigma'] <= 0):
+            raise ValueError("sigma must be positive")
+        if dist_type == 'uniform' and np.any(p['b'] <= p['a']):
+            raise ValueError("b must be greater than a")
+        if dist_type == 'exponential' and np.any(p['rate'] <= 0):
+            raise ValueError("rate must be positive")
+        if dist_type == 'poisson' and np.any(p['mu'] < 0):
+            raise ValueError("mu must be non-negative")
+        if dist_type == 'binomial' and (np.any(p['n'] < 0) or np.any(p['n'] != np.round(p['n']))
+                                        or np.any((p['p'] < 0) | (p['p'] > 1))):
+            raise ValueError("n must be a non-negative integer and p must lie in [0, 1]")
+        return p
+
+    @staticmethod
+    def _frozen(dist_type: str, p: Dict[str, np.ndarray]):
+        """SciPy distribution with one row of parameters per table row."""
+        column = {name: value[:, None] for name, value in p.items()}
+        if dist_type == 'normal':
+            return stats.norm(column['mu'], column['sigma'])
+        if dist_type == 'uniform':
+            return stats.uniform(column['a'], column['b'] - column['a'])
+        if dist_type == 'exponential':
+            return stats.expon(scale=1.0 / column['rate'])
+        if dist_type == 'poisson':
+            return stats.poisson(column['mu'])
+        return stats.binom(column['n'], column['p'])
+
+    @staticmethod
+    def _default_grid(dist_type: str, p: Dict[str, np.ndarray], points: int) -> np.ndarray:
+        """Grid covering the bulk of each distribution: (rows, points), or one shared integer row."""
+        if dist_type == 'poisson':
+            # Integer support up to the largest (1 - _TAIL) quantile, for any mu >= 0
+            upper = stats.poisson.ppf(1 - _TAIL, p['mu']).max()
+            return np.arange(0.0, upper + 1)[None, :]
+        if dist_type == 'binomial':
+            return np.arange(0.0, p['n'].max() + 1)[None, :]
+        if dist_type == 'normal':
+            lower, upper = p['mu'] - 4 * p['sigma'], p['mu'] + 4 * p['sigma']
+        elif dist_type == 'uniform':
+            width = p['b'] - p['a']
+            lower, upper = p['a'] - 0.1 * width, p['b'] + 0.1 * width
+        else:
+            lower, upper = np.zeros_like(p['rate']), -np.log(_TAIL) / p['rate']
+        t = np.linspace(0.0, 1.0, points)
+        return lower[:, None] + (upper - lower)[:, None] * t
+
+    @staticmethod
+    def table(dist_type: str, kind: str = 'pdf', points: int = 100,
+              grid: Optional[ArrayLike] = None, cache: bool = True,
+              **params: Union[float, ArrayLike]) -> dict:
+        """
+        Evaluate a distribution for many parameter sets in one vectorized call
+        Args:
+            dist_type: 'normal' (mu, sigma), 'uniform' (a, b), 'exponential' (rate),
+                       'poisson' (mu) or 'binomial' (n, p)
+            kind: 'pdf' (probability mass for discrete distributions), 'cdf' or 'ppf'
+            points: Grid resolution when grid is not given (continuous
+                    distributions and ppf; discrete pdf/cdf use every integer
+                    of the support)
+            grid: Shared points to evaluate at (probabilities in (0, 1) for 'ppf')
+            cache: Reuse an identical earlier table from Distributions.grid_cache
+            **params: Distribution parameters as scalars or 1-D arrays, broadcast
+                      against each other; one table row per parameter set
+        Returns:
+            Dictionary with 'x' and 'values' arrays of shape (parameter sets,
+            grid points) and 'params', the broadcast 1-D parameter arrays
+        Raises:
+            ValueError: If the distribution, kind or parameters are invalid
+        """
+        if kind not in ('pdf', 'cdf', 'ppf'):
+            raise ValueError("Invalid kind. Choose 'pdf', 'cdf', or 'ppf'")
+        if points < 2:
+            raise ValueError("points must be at least 2")
+        p = Distributions._parameters(dist_type, params)
+        grid = None if grid is None else np.asarray(grid, dtype=float).ravel()
+
+        key = None
+        if cache:
+            key = content_key('Distributions.table', (dist_type, kind, points, grid), p)
+            found, result = Distributions.grid_cache.get(key, 'Distributions.table')
+            if found:
+                return result
+
+        rows = len(next(iter(p.values())))
+        if kind == 'ppf':
+            x = grid if grid is not None else np.linspace(0.0, 1.0, points + 2)[1:-1]
+            if np.any((x < 0) | (x > 1)):
+                raise ValueError("ppf grid values must be probabilities in [0, 1]")
+            x = x[None, :]
+        else:
+            x = grid[None, :] if grid is not None else Distributions._default_grid(dist_type, p, points)
+
+        distribution = Distributions._frozen(dist_type, p)
+        _, discrete = FAMILIES[dist_type]
+        if kind == 'pdf':
+            values = distribution.pmf(x) if discrete else distribution.pdf(x)
+        elif kind == 'cdf':
+            values = distribution.cdf(x)
+        else:
+            values = distribution.ppf(x)
+
+        result = {
+            'x': np.broadcast_to(x, (rows, x.shape[1])).copy(),
+            'values': np.broadcast_to(values, (rows, x.shape[1])).astype(float),
+            'params': p
+        }
+        if key is not None:
+            Distributions.grid_cache.put(key, result)
+        return result
+
+    @staticmethod
+    def sample(dist_type: str, size: int = 1000,
+               seed: Union[None, int, np.random.Generator] = None,
+               **params: Union[float, ArrayLike]) -> np.ndarray:
+        """
+        Draw random samples for many parameter sets at once
+        Args:
+            dist_type: Distribution name (see table)
+            size: Number of samples per parameter set
+            seed: Seed or Generator, for reproducible draws
+            **params: Distribution parameters as scalars or 1-D arrays
+        Returns:
+            Array of shape (parameter sets, size)
+        """
+        p = Distributions._parameters(dist_type, params)
+        rng = np.random.default_rng(seed)
+        rows = len(next(iter(p.values())))
+        shape = (rows, size)
+        column = {name: value[:, None] for name, value in p.items()}
+        if dist_type == 'normal':
+            return rng.normal(column['mu'], column['sigma'], shape)
+        if dist_type == 'uniform':
+            return rng.uniform(column['a'], column['b'], shape)
+        if dist_type == 'exponential':
+            return rng.exponential(1.0 / column['rate'], shape)
+        if dist_type == 'poisson':
+            return rng.poisson(column['mu'], shape)
+        return rng.binomial(column['n'].astype(np.int64), column['p'], shape)
@@ -0,0 +1,400 @@
+"""
+Expressions Module
+Compiles user-supplied formulas such as "sin(x)*exp(-x**2)" into vectorized NumPy functions.
+"""
+import ast
+import functools
+import numbers
+import numpy as np
+from typing import Any, Dict, Optional, Sequence, Tuple
+import instrument
+import symbolic
+
+# Longest accepted source string, to bound parsing and compilation work
+MAX_SOURCE_LENGTH = 10000
+
+# Callable names allowed in expressions, with their NumPy implementations
+FUNCTIONS: Dict[str, Any] = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'arcsinh': np.arcsinh, 'arccosh': np.arccosh, 'arctanh': np.arctanh,
+    'asinh': np.arcsinh, 'acosh': np.arccosh, 'atanh': np.arctanh,
+    'exp': np.exp, 'exp2': np.exp2, 'expm1': np.expm1,
+    'log': np.log, 'ln': np.log, 'log2': np.log2, 'log10': np.log10, 'log1p': np.log1p,
+    'sqrt': np.sqrt, 'cbrt': np.cbrt, 'square': np.square,
+    'abs': np.absolute, 'sign': np.sign, 'floor': np.floor, 'ceil': np.ceil,
+    'arctan2': np.arctan2, 'atan2': np.arctan2, 'hypot': np.hypot,
+    'minimum': np.minimum, 'maximum': np.maximum, 'min': np.minimum, 'max': np.maximum,
+    'where': np.where,
+}
+
+# Named constants, substituted when the expression is compiled
+CONSTANTS: Dict[str, float] = {
+    'pi': float(np.pi),
+    'e': float(np.e),
+    'tau': float(2 * np.pi),
+    'inf': float('inf'),
+    'nan': float('nan'),
+}
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+_COMPARISONS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+
+
+class _Validator(ast.NodeTransformer):
+    """Rejects anything outside the whitelist and normalizes the accepted tree."""
+
+    def __init__(self, variables: Sequence[str]):
+        self.variables = set(variables)
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"Unsupported constant in expression: {node.value!r}")
+        # Floats keep huge integer powers such as 9**9**9 from running unbounded
+        value = node.value if isinstance(node.value, complex) else float(node.value)
+        return ast.copy_location(ast.Constant(value), node)
+
+    def visit_Name(self, node):
+        if node.id in self.variables:
+            return node
+        if node.id in CONSTANTS:
+            return ast.copy_location(ast.Constant(CONSTANTS[node.id]), node)
+        if node.id in FUNCTIONS:
+            raise ValueError(f"Function '{node.id}' must be called, e.g. {node.id}(x)")
+        raise ValueError(f"Unknown name '{node.id}' in expression")
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BINARY_OPERATORS):
+            raise ValueError(f"Unsupported operator in expression: {type(node.op).__name__}")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return self._call('logical_not', [node.operand], node)
+        if not isinstance(node.op, _UNARY_OPERATORS):
+            raise ValueError(f"Unsupported operator in expression: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name):
+            raise ValueError("Only named functions such as sin(x) can be called in expressions")
+        if node.func.id not in FUNCTIONS:
+            raise ValueError(f"Unknown function '{node.func.id}' in expression")
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported in expressions")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+    def visit_Compare(self, node):
+        if not all(isinstance(op, _COMPARISONS) for op in node.ops):
+            raise ValueError("Unsupported comparison in expression")
+        node.left = self.visit(node.left)
+        node.comparators = [self.visit(c) for c in node.comparators]
+        if len(node.ops) == 1:
+            return node
+        # Chained a < x < b becomes (a < x) & (x < b), which works element-wise
+        operands = [node.left] + node.comparators
+        parts = [ast.Compare(left=lhs, ops=[op], comparators=[rhs])
+                 for lhs, op, rhs in zip(operands, node.ops, operands[1:])]
+        return self._combine('logical_and', parts, node)
+
+    def visit_BoolOp(self, node):
+        name = 'logical_and' if isinstance(node.op, ast.And) else 'logical_or'
+        return self._combine(name, [self.visit(value) for value in node.values], node)
+
+    def visit_IfExp(self, node):
+        # a if condition else b is evaluated element-wise
+        return self._call('where', [node.test, node.body, node.orelse], node)
+
+    def visit_Tuple(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            raise ValueError("Unsupported syntax in expression: Tuple")
+        node.elts = [self.visit(element) for element in node.elts]
+        return node
+
+    visit_List = visit_Tuple
+
+    def _call(self, name: str, args: list, node: ast.AST) -> ast.Call:
+        """Build a call to a NumPy function that is not otherwise exposed by name."""
+        call = ast.Call(func=ast.Name(id=name, ctx=ast.Load()),
+                        args=[self.visit(arg) for arg in args], keywords=[])
+        return ast.copy_location(call, node)
+
+    def _combine(self, name: str, parts: list, node: ast.AST) -> ast.Call:
+        """Fold already-validated operands with a binary logical function."""
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=[result, part], keywords=[])
+        return ast.copy_location(result, node)
+
+
+# Operators of the validated syntax tree and their graph operators
+_BINARY_NODES = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'div',
+                 ast.Pow: 'pow', ast.Mod: 'mod'}
+_COMPARISON_SYMBOLS = {ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=',
+                       ast.Eq: '==', ast.NotEq: '!='}
+
+
+def _free_names(tree: ast.AST) -> Tuple[str, ...]:
+    """Names that are not functions or constants, in alphabetical order."""
+    called = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    return tuple(sorted({node.id for node in ast.walk(tree)
+                         if isinstance(node, ast.Name) and id(node) not in called
+                         and node.id not in CONSTANTS and node.id not in FUNCTIONS}))
+
+
+def _to_graph(node: ast.AST) -> symbolic.Node:
+    """
+    Convert a validated syntax tree into an expression graph
+    The formula is kept as written (only constants are folded), so it
+    evaluates exactly like the NumPy code it reads as; derivatives built from
+    the graph are simplified.
+    """
+    if isinstance(node, ast.Constant):
+        return symbolic.constant(node.value)
+    if isinstance(node, ast.Name):
+        return symbolic.variable(node.id)
+    if isinstance(node, ast.BinOp):
+        return symbolic.operation(_BINARY_NODES[type(node.op)], _to_graph(node.left), _to_graph(node.right))
+    if isinstance(node, ast.UnaryOp):
+        operand = _to_graph(node.operand)
+        return symbolic.operation('neg', operand) if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.Call):
+        # Aliases such as asin and ln map to the NumPy function's own name
+        function = FUNCTIONS.get(node.func.id)
+        name = function.__name__ if function is not None else node.func.id
+        return symbolic.call(name, *(_to_graph(arg) for arg in node.args))
+    if isinstance(node, ast.Compare):
+        return symbolic.compare(_COMPARISON_SYMBOLS[type(node.ops[0])],
+                                _to_graph(node.left), _to_graph(node.comparators[0]))
+    return symbolic.vector([_to_graph(element) for element in node.elts])
+
+
+class Expression:
+    """
+    Compiled, vectorized form of a formula
+    Calling it evaluates the formula with NumPy, so arrays of points are
+    handled in one call. Expressions with several variables accept either one
+    argument per variable or a single sequence [x1, x2, ...] (as Calculus'
+    multivariable functions expect), whose leading axis holds the variables.
+    Args:
+        source: Formula text, e.g. "sin(x)*exp(-x**2)"
+        variables: Variable names in argument order; defaults to the free
+                   names of the formula in alphabetical order (or ('x',))
+    Raises:
+        ValueError: If the formula uses syntax, names or functions outside the whitelist
+    """
+    # Reports its own evaluations to the instrument module, so it is not wrapped
+    _counts_evaluations = True
+
+    def __init__(self, source: str, variables: Optional[Sequence[str]] = None):
+        if not isinstance(source, str):
+            raise ValueError("Expression must be a string")
+        if len(source) > MAX_SOURCE_LENGTH:
+            raise ValueError(f"Expression is longer than {MAX_SOURCE_LENGTH} characters")
+        try:
+            # Accept the common x^2 notation; replacing the token (rather than the
+            # BitXor node) gives ^ the precedence of a power
+            tree = ast.parse(source.strip().replace('^', '**'), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression: {e.msg}")
+
+        if variables is None:
+            variables = _free_names(tree) or ('x',)
+        variables = tuple(variables)
+        for name in variables:
+            # Generated code reserves names starting with _ and the NumPy function names
+            if (not name.isidentifier() or name.startswith('_') or name in FUNCTIONS
+                    or name in CONSTANTS or name in symbolic.FUNCTIONS):
+                raise ValueError(f"Invalid variable name '{name}'")
+        if len(set(variables)) != len(variables):
+            raise ValueError("Variable names must be unique")
+
+        tree = _Validator(variables).visit(tree)
+        self._setup(source, variables, _to_graph(tree.body), None)
+
+    def _setup(self, source: str, variables: Tuple[str, ...], graph: symbolic.Node, origin):
+        self.source = source
+        self.variables = variables
+        self.graph = graph
+        self.outputs = len(graph.args) if graph.op == 'vector' else None
+        # How to rebuild a derived expression when unpickled (None = from source)
+        self._origin = origin
+        self._function = symbolic.generate(graph, variables)
+
+    @staticmethod
+    def _derived(parent: 'Expression', graph: symbolic.Node, description: str,
+                 origin: tuple) -> 'Expression':
+        """Wrap a graph computed from parent, such as its derivative."""
+        try:
+            source = symbolic.to_source(graph, MAX_SOURCE_LENGTH)
+        except ValueError:
+            source = description
+        expression = Expression.__new__(Expression)
+        expression._setup(source, parent.variables, graph, origin)
+        return expression
+
+    def _variable(self, variable: Optional[str]) -> str:
+        """Default to the only variable; check named ones."""
+        if variable is None:
+            if len(self.variables) != 1:
+                raise ValueError(f"Specify the variable to differentiate by: one of {self.variables}")
+            return self.variables[0]
+        if variable not in self.variables:
+            raise ValueError(f"Unknown variable '{variable}'; expected one of {self.variables}")
+        return variable
+
+    def derivative(self, variable: Optional[str] = None, order: int = 1) -> 'Expression':
+        """
+        Symbolic derivative, simplified and compiled (cached per expression)
+        Args:
+            variable: Variable to differentiate by (optional for one variable)
+            order: Order of the derivative
+        Returns:
+            Expression for the derivative, taking the same arguments
+        Raises:
+            ValueError: If the variable is unknown or ambiguous, or order is negative
+        """
+        return _derive(self, 'derivative', self._variable(variable), order)
+
+    def derivatives(self, order: int, variable: Optional[str] = None) -> 'Expression':
+        """
+        All derivatives up to an order, evaluated together
+        Shared subexpressions of the function and its derivatives are computed
+        once per call.
+        Args:
+            order: Highest derivative order
+            variable: Variable to differentiate by (optional for one variable)
+        Returns:
+            Expression returning [f, f', ..., f^(order)]
+        """
+        return _derive(self, 'derivatives', self._variable(variable), order)
+
+    def gradient(self) -> 'Expression':
+        """
+        Symbolic gradient
+        Returns:
+            Expression returning the partial derivatives in variable order
+        """
+        return _derive(self, 'gradient', None, 1)
+
+    @property
+    def operations(self) -> int:
+        """Number of operations per evaluation after common-subexpression elimination."""
+        return symbolic.size(self.graph)
+
+    def __call__(self, *args):
+        if len(args) == 1 and len(self.variables) > 1:
+            args = tuple(args[0])
+        if len(args) != len(self.variables):
+            raise ValueError(f"Expression takes {len(self.variables)} argument(s) "
+                             f"({', '.join(self.variables)}), got {len(args)}")
+        # Plain numbers and sequences become float arrays so integer inputs
+        # and negative powers behave; other objects (e.g. dual numbers) pass through
+        args = tuple(_as_array(arg) for arg in args)
+        try:
+            result = self._function(*args)
+        except (OverflowError, ZeroDivisionError) as e:
+            raise ValueError(f"Cannot evaluate '{self.source}': {e}")
+
+        shapes = [arg.shape for arg in args if isinstance(arg, np.ndarray)]
+        shape = np.broadcast_shapes(*shapes) if shapes else ()
+        if instrument.enabled:
+            instrument.count_evaluation(int(np.prod(shape)))
+        if self.outputs is not None:
+            return [_broadcast(item, shape) for item in result]
+        return _broadcast(result, shape)
+
+    def __reduce__(self):
+        # Recompile (through the caches) on unpickling so process pools can use expressions
+        if self._origin is not None:
+            return _derive, self._origin
+        return compile_expression, (self.source, self.variables)
+
+    def __str__(self) -> str:
+        return self.source
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r}, variables={self.variables!r})"
+
+
+@functools.lru_cache(maxsize=256)
+def _derive(expression: Expression, kind: str, variable: Optional[str], order: int) -> Expression:
+    """Build and compile a derivative of an expression; see Expression.derivative."""
+    if order < 0:
+        raise ValueError("Derivative order must be non-negative")
+    if kind == 'gradient':
+        graph = symbolic.vector([symbolic.differentiate(expression.graph, name)
+                                 for name in expression.variables])
+        description = f"gradient of {expression.source}"
+    else:
+        graphs = [expression.graph]
+        for _ in range(order):
+            graphs.append(symbolic.differentiate(graphs[-1], variable))
+        graph = graphs[-1] if kind == 'derivative' else symbolic.vector(graphs)
+        description = f"d^{order}/d{variable}^{order} of {expression.source}"
+        if kind == 'derivatives':
+            description = f"derivatives up to order {order} of {expression.source}"
+    return Expression._derived(expression, graph, description, (expression, kind, variable, order))
+
+
+def _as_array(value):
+    """Convert numbers and sequences to floating arrays, leaving other objects alone."""
+    if isinstance(value, (numbers.Number, list, tuple, np.ndarray)):
+        array = np.asarray(value)
+        return array.astype(float) if array.dtype.kind in 'biu' else array
+    return value
+
+
+def _broadcast(value, shape: Tuple[int, ...]):
+    """Give results that do not depend on every input (e.g. constants) the full shape."""
+    if isinstance(value, (numbers.Number, np.ndarray)) and np.shape(value) != shape:
+        value = np.broadcast_to(value, shape).copy()
+    if isinstance(value, np.ndarray) and value.ndim == 0:
+        return value[()]
+    return value
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(source: str, variables: Optional[Tuple[str, ...]]) -> Expression:
+    return Expression(source, variables)
+
+
+def compile_expression(source: str, variables: Optional[Sequence[str]] = None) -> Expression:
+    """
+    Compile a formula, reusing earlier compilations of the same source
+    Args:
+        source: Formula text using the names in FUNCTIONS and CONSTANTS,
+                arithmetic (+ - * / ** or ^, %), comparisons, and/or/not and
+                'a if condition else b'
+        variables: Variable names in argument order (inferred if omitted)
+    Returns:
+        Cached Expression
+    Raises:
+        ValueError: If the formula is not a valid, whitelisted expression
+    """
+    return _compile(source, tuple(variables) if variables is not None else None)
+
+
+def cache_info():
+    """Hit/miss statistics of the compiled-expression cache."""
+    return _compile.cache_info()
+
+
+def clear_cache():
+    """Forget all compiled expressions and derivatives."""
+    _compile.cache_clear()
+    _derive.cache_clear()
@@ -0,0 +1,337 @@
+"""
+Instrument Module
+Opt-in profiling of the static methods of the math modules: call counts, wall
+and CPU time, function evaluations, input sizes and named phases inside hot
+paths, exported as JSON or Prometheus text.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Set while any class is instrumented; hot paths check it before doing any work
+enabled = False
+
+# Prefix of exported Prometheus metric names
+METRIC_PREFIX = 'math_program'
+
+_local = threading.local()
+_instrumented = set()
+
+
+class _Frame:
+    """Counters for one running instrumented call."""
+    __slots__ = ('evaluations', 'points', 'phases')
+
+    def __init__(self):
+        self.evaluations = 0
+        self.points = 0
+        self.phases = {}
+
+
+class _Phase:
+    """Context manager adding its elapsed time to a phase of the innermost call."""
+    __slots__ = ('frame', 'name', 'start')
+
+    def __init__(self, frame: _Frame, name: str):
+        self.frame = frame
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.frame.phases[self.name] = self.frame.phases.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NullPhase:
+    """Shared do-nothing phase used while instrumentation is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def _stack() -> List[_Frame]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def phase(name: str):
+    """
+    Time a named section of the innermost instrumented call
+    Usage: with instrument.phase('convert'): ...
+    Costs one flag check when instrumentation is off.
+    Args:
+        name: Phase name, e.g. 'convert', 'compute' or 'tolist'
+    Returns:
+        Context manager
+    """
+    if not enabled:
+        return _NULL_PHASE
+    stack = getattr(_local, 'stack', None)
+    if not stack:
+        return _NULL_PHASE
+    return _Phase(stack[-1], name)
+
+
+def count_evaluation(points: int = 1):
+    """
+    Record one call of a user function covering the given number of points
+    Counted for every instrumented call on the current thread's stack, so
+    outer calls include the evaluations of the calls they make.
+    Args:
+        points: Number of points evaluated by the call (array size for vectorized calls)
+    """
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        for frame in stack:
+            frame.evaluations += 1
+            frame.points += points
+
+
+class _Counted:
+    """Callable argument wrapper that counts evaluations; pickles as the bare function."""
+
+    def __init__(self, function: Callable):
+        self.function = function
+        functools.update_wrapper(self, function, updated=())
+
+    def __call__(self, *args, **kwargs):
+        size = getattr(args[0], 'size', 1) if args else 1
+        count_evaluation(size if isinstance(size, int) else 1)
+        return self.function(*args, **kwargs)
+
+    def __reduce__(self):
+        # Process pools get the plain function; their evaluations are not counted
+        return _identity, (self.function,)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# Argument types checked by identity first to keep per-call overhead low
+_NUMBERS = frozenset((bool, int, float, complex))
+_SEQUENCES = frozenset((list, tuple))
+
+
+def _counted(value: Any) -> Any:
+    """Wrap user-supplied callables; classes and self-counting objects pass through."""
+    if (type(value) not in _NUMBERS and callable(value) and not isinstance(value, type)
+            and not getattr(value, '_counts_evaluations', False)):
+        return _Counted(value)
+    return value
+
+
+def _elements(value: Any) -> int:
+    """Number of elements in an argument (nested lists are estimated from their first item)."""
+    kind = type(value)
+    if kind in _NUMBERS:
+        return 1
+    if kind in _SEQUENCES:
+        return len(value) * _elements(value[0]) if value else 0
+    size = getattr(value, 'size', None)
+    return size if isinstance(size, int) else 0
+
+
+class Recorder:
+    """
+    Collected measurements, one entry per instrumented function
+    Each entry holds calls, errors, wall_seconds, wall_max_seconds,
+    cpu_seconds (process CPU time, so it includes threads started by the call),
+    evaluations and evaluated_points of user functions, input_elements and
+    phases (seconds per named phase).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.functions = {}
+        self.started = time.time()
+
+    def record(self, name: str, frame: _Frame, wall: float, cpu: float, elements: int, failed: bool):
+        """Fold one finished call into the totals."""
+        with self._lock:
+            entry = self.functions.get(name)
+            if entry is None:
+                entry = self.functions[name] = {
+                    'calls': 0, 'errors': 0, 'wall_seconds': 0.0, 'wall_max_seconds': 0.0,
+                    'cpu_seconds': 0.0, 'evaluations': 0, 'evaluated_points': 0,
+                    'input_elements': 0, 'phases': {}
+                }
+            entry['calls'] += 1
+            entry['errors'] += failed
+            entry['wall_seconds'] += wall
+            entry['wall_max_seconds'] = max(entry['wall_max_seconds'], wall)
+            entry['cpu_seconds'] += cpu
+            entry['evaluations'] += frame.evaluations
+            entry['evaluated_points'] += frame.points
+            entry['input_elements'] += elements
+            for phase_name, seconds in frame.phases.items():
+                entry['phases'][phase_name] = entry['phases'].get(phase_name, 0.0) + seconds
+
+    def stats(self) -> Dict[str, dict]:
+        """Copy of the per-function measurements."""
+        with self._lock:
+            return {name: {**entry, 'phases': dict(entry['phases'])}
+                    for name, entry in self.functions.items()}
+
+    def reset(self):
+        """Discard all measurements."""
+        with self._lock:
+            self.functions.clear()
+            self.started = time.time()
+
+    def to_json(self) -> str:
+        """Measurements as a JSON document."""
+        return json.dumps({'started': self.started, 'exported': time.time(),
+                           'functions': self.stats()}, indent=2, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Measurements in the Prometheus text exposition format."""
+        metrics = [
+            ('calls_total', 'counter', 'Number of calls', 'calls'),
+            ('errors_total', 'counter', 'Number of calls that raised', 'errors'),
+            ('wall_seconds_total', 'counter', 'Wall-clock time spent in calls', 'wall_seconds'),
+            ('wall_seconds_max', 'gauge', 'Longest single call', 'wall_max_seconds'),
+            ('cpu_seconds_total', 'counter', 'Process CPU time spent in calls', 'cpu_seconds'),
+            ('evaluations_total', 'counter', 'Calls of user-supplied functions', 'evaluations'),
+            ('evaluated_points_total', 'counter', 'Points evaluated by user-supplied functions',
+             'evaluated_points'),
+            ('input_elements_total', 'counter', 'Elements in the call arguments', 'input_elements'),
+        ]
+        functions = self.stats()
+        lines = []
+        for suffix, kind, description, key in metrics:
+            metric = f"{METRIC_PREFIX}_{suffix}"
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+            lines += [f'{metric}{{function="{name}"}} {entry[key]!r}'
+                      for name, entry in sorted(functions.items())]
+        metric = f"{METRIC_PREFIX}_phase_seconds_total"
+        lines += [f"# HELP {metric} Time spent in named phases of calls", f"# TYPE {metric} counter"]
+        for name, entry in sorted(functions.items()):
+            lines += [f'{metric}{{function="{name}",phase="{phase_name}"}} {seconds!r}'
+                      for phase_name, seconds in sorted(entry['phases'].items())]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str, file_format: Optional[str] = None):
+        """
+        Write the measurements to a file
+        Args:
+            path: Destination file
+            file_format: 'json' or 'prometheus' (default: 'json' for a .json
+                         extension, Prometheus text otherwise)
+        """
+        if file_format is None:
+            file_format = 'json' if os.path.splitext(path)[1].lower() == '.json' else 'prometheus'
+        if file_format not in ('json', 'prometheus'):
+            raise ValueError("Invalid format. Choose 'json' or 'prometheus'")
+        text = self.to_json() if file_format == 'json' else self.to_prometheus()
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+def instrument(function: Callable, recorder: Recorder) -> Callable:
+    """
+    Wrap a function so each call is measured into recorder
+    Args:
+        function: Function to wrap
+        recorder: Recorder receiving the measurements
+    Returns:
+        Wrapped function, with the recorder as its .recorder attribute
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        elements = 0
+        for value in args:
+            elements += _elements(value)
+        args = tuple(map(_counted, args))
+        if kwargs:
+            for value in kwargs.values():
+                elements += _elements(value)
+            kwargs = {key: _counted(value) for key, value in kwargs.items()}
+        stack = _stack()
+        frame = _Frame()
+        stack.append(frame)
+        failed = True
+        cpu = time.process_time()
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu
+            stack.pop()
+            recorder.record(name, frame, wall, cpu, elements, failed)
+
+    wrapper.recorder = recorder
+    return wrapper
+
+
+def enable(*classes: type, recorder: Optional[Recorder] = None) -> Recorder:
+    """
+    Turn on instrumentation for every public static method of the given classes
+    Args:
+        classes: Classes such as Algebra, Calculus and Statistics
+        recorder: Recorder to collect into (a new one if omitted)
+    Returns:
+        The Recorder shared by the wrapped methods
+    """
+    global enabled
+    recorder = recorder if recorder is not None else Recorder()
+    for cls in classes:
+        disable(cls)
+        for name, member in list(vars(cls).items()):
+            if isinstance(member, staticmethod) and not name.startswith('_'):
+                setattr(cls, name, staticmethod(instrument(member.__func__, recorder)))
+        _instrumented.add(cls)
+    enabled = bool(_instrumented)
+    return recorder
+
+
+def disable(*classes: type):
+    """
+    Restore the uninstrumented static methods of the given classes
+    Args:
+        classes: Classes previously passed to enable
+    """
+    global enabled
+    for cls in classes:
+        for name, member in list(vars(cls).items()):
+            if isinstance(member, staticmethod) and hasattr(member.__func__, 'recorder'):
+                setattr(cls, name, staticmethod(member.__func__.__wrapped__))
+        _instrumented.discard(cls)
+    enabled = bool(_instrumented)
+
+
+def enable_modules(recorder: Optional[Recorder] = None) -> Recorder:
+    """
+    enable() for BasicMath, Algebra, Calculus, Statistics and Distributions together
+    Args:
+        recorder: Recorder to collect into (a new one if omitted)
+    Returns:
+        The shared Recorder
+    """
+    from basic_math import BasicMath
+    from algebra import Algebra
+    from calculus import Calculus
+    from statistics import Statistics
+    from distributions import Distributions
+    return enable(BasicMath, Algebra, Calculus, Statistics, Distributions, recorder=recorder)
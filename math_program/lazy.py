@@ -0,0 +1,39 @@
+"""
+Lazy Import Module
+Defers loading of heavy dependencies until one of their attributes is first used.
+"""
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access
+    Args:
+        name: Fully qualified module name, e.g. 'scipy.stats'
+    """
+
+    def __getattr__(self, attribute: str):
+        # Only reached for attributes not yet copied from the real module
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r}>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module lazily
+    Importing a math module then does not pay for SciPy sub-packages it may
+    never use; the import runs the first time an attribute such as
+    stats.norm is looked up.
+    Args:
+        name: Fully qualified module name
+    Returns:
+        The module itself if it is already loaded, otherwise a LazyModule
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
@@ -0,0 +1,411 @@
+"""
+Memoize Module
+Opt-in result caching for the static methods of the math modules, keyed by
+content hashes of the arguments, with LRU/TTL/memory-bound eviction and an
+optional on-disk store shared between runs.
+"""
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+
+# Methods whose results depend on more than their arguments (file contents)
+_NEVER_CACHED = {'load_sparse_matrix'}
+
+# Methods with an argument that may be a file path, keyed by the file's state instead
+_FILE_ARGUMENTS = {'solve_sparse_system': 'coefficients'}
+
+
+class Uncacheable(Exception):
+    """Raised by content_key for arguments that have no stable content hash."""
+
+
+def _file_state(path) -> tuple:
+    """Identify a file by path, size and modification time."""
+    try:
+        status = os.stat(path)
+    except OSError:
+        raise Uncacheable("missing file")
+    return ('file', os.path.abspath(os.fspath(path)), status.st_size, status.st_mtime_ns)
+
+
+def _feed(digest, value: Any):
+    """Add a canonical encoding of value to a hash."""
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise Uncacheable("object arrays")
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        digest.update(f"{value.dtype.str}:{value!r};".encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}[".encode())
+        for item in value:
+            _feed(digest, item)
+        digest.update(b"]")
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}{{".encode())
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, np.ufunc):
+        digest.update(f"ufunc:{value.__name__};".encode())
+    elif type(value).__name__ == 'Expression' and type(value).__module__ == 'expressions':
+        # Derived expressions (derivatives) have formula text as their source too
+        digest.update(f"expression:{value.source}:{value.variables};".encode())
+    elif type(value).__name__ == '_Counted' and type(value).__module__ == 'instrument':
+        # Evaluation counters added by the instrument module hash as the function they wrap
+        _feed(digest, value.function)
+    elif type(value).__name__ == 'Dataset' and type(value).__module__ == 'datasets':
+        digest.update(b"dataset:")
+        if value.file_format == 'array':
+            _feed(digest, value._array)
+        else:
+            # Files are identified by path, size and modification time
+            _feed(digest, (_file_state(value.source), value.file_format, value.column,
+                           value.delimiter, value.skip_header, value.chunk_size,
+                           str(value._array.dtype) if value._array is not None else None))
+    elif type(value).__module__.startswith('scipy.sparse'):
+        matrix = value.tocsr()
+        digest.update(f"sparse:{matrix.shape};".encode())
+        for part in (matrix.data, matrix.indices, matrix.indptr):
+            _feed(digest, part)
+    else:
+        # Arbitrary callables and objects: their behaviour is not captured by content
+        raise Uncacheable(type(value).__name__)
+
+
+def content_key(name: str, args: tuple, kwargs: dict) -> bytes:
+    """
+    Hash a call by the content of its arguments
+    Args:
+        name: Qualified function name
+        args: Positional arguments
+        kwargs: Keyword arguments
+    Returns:
+        16-byte digest
+    Raises:
+        Uncacheable: If an argument (e.g. a lambda) has no content hash
+    """
+    digest = hashlib.blake2b(name.encode(), digest_size=16)
+    _feed(digest, args)
+    _feed(digest, kwargs)
+    return digest.digest()
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory footprint of a result in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + _sizeof(vars(value))
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Bounded cache of function results
+    Entries are evicted least-recently-used first once maxsize entries or
+    max_bytes of results are held, and expire ttl seconds after being stored.
+    Cached values are copied on the way in and out, so callers may modify
+    what they get back.
+    Args:
+        maxsize: Maximum number of entries in memory
+        ttl: Seconds an entry stays valid (None = no expiry)
+        max_bytes: Approximate memory budget for cached results (None = unbounded)
+        path: Directory for an on-disk copy of every entry, reused between runs
+              (entries are pickles, so only point this at a trusted directory)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, path: Optional[str] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.path = path
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self.hits = self.misses = self.bypassed = 0
+        self.disk_hits = self.evictions = self.expirations = 0
+        self.bytes = 0
+        self.functions: Dict[str, Dict[str, int]] = {}
+        # key -> (value, size, expiry on the monotonic clock or None)
+        self._entries: 'OrderedDict[bytes, Tuple[Any, int, Optional[float]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, name: str, outcome: str):
+        counts = self.functions.setdefault(name, {'hits': 0, 'misses': 0, 'bypassed': 0})
+        counts[outcome] += 1
+
+    def _file(self, key: bytes) -> str:
+        return os.path.join(self.path, key.hex() + '.pkl')
+
+    def get(self, key: bytes, name: str = '') -> Tuple[bool, Any]:
+        """
+        Look up a result
+        Args:
+            key: Key from content_key
+            name: Function name, for per-function statistics
+        Returns:
+            Tuple of (found, copy of the value or None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._count(name, 'hits')
+                return True, copy.deepcopy(entry[0])
+
+        stored = self._load(key) if self.path is not None else None
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                self._count(name, 'misses')
+                return False, None
+            value, expires = stored
+            self.hits += 1
+            self.disk_hits += 1
+            self._count(name, 'hits')
+            ttl = None if expires is None else expires - time.time()
+            self._insert(key, value, ttl)
+            return True, copy.deepcopy(value)
+
+    def put(self, key: bytes, value: Any):
+        """
+        Store a result (in memory, and on disk if a path was given)
+        Args:
+            key: Key from content_key
+            value: Result to cache
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._insert(key, value, self.ttl)
+        if self.path is not None:
+            self._save(key, value)
+
+    def _insert(self, key: bytes, value: Any, ttl: Optional[float]):
+        size = _sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (value, size, expires)
+        self.bytes += size
+        while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self.bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: bytes):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def _load(self, key: bytes) -> Optional[Tuple[Any, Optional[float]]]:
+        """Read an entry from disk; expired or unreadable files count as misses."""
+        filename = self._file(key)
+        try:
+            with open(filename, 'rb') as handle:
+                expires, value = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if expires is not None and expires <= time.time():
+            with self._lock:
+                self.expirations += 1
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            return None
+        return value, expires
+
+    def _save(self, key: bytes, value: Any):
+        """Write an entry to disk atomically; unpicklable results stay memory-only."""
+        expires = None if self.ttl is None else time.time() + self.ttl
+        try:
+            payload = pickle.dumps((expires, value), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        handle, temporary = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as stream:
+                stream.write(payload)
+            os.replace(temporary, self._file(key))
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def clear(self, disk: bool = True):
+        """
+        Drop all entries and reset the statistics
+        Args:
+            disk: Also delete the on-disk entries
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.bypassed = 0
+            self.disk_hits = self.evictions = self.expirations = 0
+            self.functions.clear()
+        if disk and self.path is not None:
+            for filename in os.listdir(self.path):
+                if filename.endswith('.pkl'):
+                    os.remove(os.path.join(self.path, filename))
+
+    def info(self) -> dict:
+        """Return hit/miss/eviction counts, sizes, limits and per-function counts."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bypassed': self.bypassed,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'bytes': self.bytes,
+                'maxsize': self.maxsize,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'path': self.path,
+                'functions': copy.deepcopy(self.functions),
+            }
+
+
+# Cache used by memoize when none is given
+default_cache = ResultCache()
+
+
+def memoize(function: Optional[Callable] = None, *, cache: Optional[ResultCache] = None):
+    """
+    Decorator caching a function's results by argument content
+    Calls with arguments that cannot be content-hashed (e.g. lambdas), with
+    an out= buffer, or without a seed to a function taking one (random
+    results) run uncached and count as bypassed. File paths given to the
+    arguments in _FILE_ARGUMENTS are keyed by the file's size and modification
+    time, so rewritten files are read again. Exceptions are not cached.
+    Args:
+        function: Function to wrap (when used as @memoize)
+        cache: ResultCache to use (default_cache if omitted, as @memoize(cache=...))
+    Returns:
+        Wrapped function, with the cache as its .cache attribute
+    """
+    def decorate(function: Callable) -> Callable:
+        name = f"{function.__module__}.{function.__qualname__}"
+        signature = inspect.signature(function)
+        seeded = 'seed' in signature.parameters
+        buffered = 'out' in signature.parameters
+        file_argument = _FILE_ARGUMENTS.get(function.__name__)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            store = wrapper.cache
+            try:
+                bound = None
+                if buffered or seeded or file_argument is not None:
+                    # Arguments by name, whether they were passed by position or keyword
+                    bound = signature.bind(*args, **kwargs)
+                if buffered and bound.arguments.get('out') is not None:
+                    raise Uncacheable('out')
+                if seeded and bound.arguments.get('seed') is None:
+                    raise Uncacheable('unseeded')
+                key_args, key_kwargs = args, kwargs
+                if file_argument is not None:
+                    source = bound.arguments.get(file_argument)
+                    if isinstance(source, (str, os.PathLike)):
+                        # A rewritten file must not return the old file's result
+                        bound.arguments[file_argument] = _file_state(source)
+                        key_args, key_kwargs = bound.args, bound.kwargs
+                key = content_key(name, key_args, key_kwargs)
+            except Uncacheable:
+                with store._lock:
+                    store.bypassed += 1
+                    store._count(name, 'bypassed')
+                return function(*args, **kwargs)
+            found, value = store.get(key, name)
+            if found:
+                return value
+            value = function(*args, **kwargs)
+            store.put(key, value)
+            return value
+
+        wrapper.cache = cache if cache is not None else default_cache
+        return wrapper
+
+    return decorate(function) if function is not None else decorate
+
+
+def enable(*classes: type, maxsize: int = 1024, ttl: Optional[float] = None,
+           max_bytes: Optional[int] = None, path: Optional[str] = None) -> ResultCache:
+    """
+    Turn on caching for every public static method of the given classes
+    Args:
+        classes: Classes such as Algebra, Calculus and Statistics
+        maxsize: Maximum number of cached results
+        ttl: Seconds a result stays valid (None = no expiry)
+        max_bytes: Approximate memory budget (None = unbounded)
+        path: Directory for persisting results between runs (None = memory only)
+    Returns:
+        The ResultCache shared by the wrapped methods (see its info())
+    """
+    cache = ResultCache(maxsize, ttl, max_bytes, path)
+    for cls in classes:
+        disable(cls)
+        for name, member in list(vars(cls).items()):
+            if (isinstance(member, staticmethod) and not name.startswith('_')
+                    and name not in _NEVER_CACHED):
+                setattr(cls, name, staticmethod(memoize(member.__func__, cache=cache)))
+    return cache
+
+
+def disable(*classes: type):
+    """
+    Restore the uncached static methods of the given classes
+    Args:
+        classes: Classes previously passed to enable
+    """
+    for cls in classes:
+        for name, member in list(vars(cls).items()):
+            if isinstance(member, staticmethod) and hasattr(member.__func__, 'cache'):
+                setattr(cls, name, staticmethod(member.__func__.__wrapped__))
+
+
+def enable_modules(**options) -> ResultCache:
+    """
+    enable() for Algebra, Calculus and Statistics together
+    Args:
+        options: Keyword arguments of enable (maxsize, ttl, max_bytes, path)
+    Returns:
+        The shared ResultCache
+    """
+    from algebra import Algebra
+    from calculus import Calculus
+    from statistics import Statistics
+    return enable(Algebra, Calculus, Statistics, **options)
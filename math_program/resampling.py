@@ -0,0 +1,264 @@
+"""
+Resampling Module
+Vectorized bootstrap confidence intervals and permutation tests. Resamples are
+drawn as (rows, n) matrices (bootstrap indices, shuffled or sign-flipped
+values) from seeded generators and reduced along their last axis, in chunks
+that bound memory and can be spread over processes.
+"""
+import functools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Optional, Tuple, Union
+from numpy.typing import ArrayLike
+from lazy import lazy_import
+
+special = lazy_import('scipy.special')
+
+# Named statistics reduce a (resamples, n) matrix along its last axis
+STATISTICS = {
+    'mean': np.mean,
+    'median': np.median,
+    'std': functools.partial(np.std, ddof=1),
+    'var': functools.partial(np.var, ddof=1),
+}
+
+# Bytes of working memory per resampled element (indices, gathered values, temporaries)
+_BYTES_PER_ELEMENT = 24
+
+# Delete-a-group jackknife size for BCa acceleration of statistics without a closed form
+JACKKNIFE_GROUPS = 200
+
+Statistic = Union[str, Callable[..., np.ndarray]]
+
+
+def _statistic(statistic: Statistic) -> Callable[..., np.ndarray]:
+    """Function computing statistic(array, axis=-1)."""
+    if callable(statistic):
+        return statistic
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic. Choose from {', '.join(STATISTICS)} or pass a function")
+    return STATISTICS[statistic]
+
+
+def _resample_chunk(kind: str, source: Union[np.ndarray, Tuple[str, int]], statistic: Statistic,
+                    rows: int, seed: np.random.SeedSequence, split: int) -> np.ndarray:
+    """
+    Statistics of one chunk of resamples (also the process-pool worker)
+    Args:
+        kind: 'bootstrap' (draw with replacement), 'permutation' (shuffle the
+              pooled data and compare its first split values with the rest) or
+              'sign' (flip the signs of the data at random)
+        source: The data, or (shared memory name, length) in a worker process
+        statistic: Statistic name or function
+        rows: Number of resamples in this chunk
+        seed: Seed of this chunk, so results do not depend on how chunks are spread
+        split: Size of the first sample for 'permutation'
+    """
+    block = None
+    if isinstance(source, tuple):
+        block = shared_memory.SharedMemory(name=source[0])
+        data = np.ndarray((source[1],), dtype=float, buffer=block.buf)
+    else:
+        data = source
+    try:
+        reduce = _statistic(statistic)
+        rng = np.random.default_rng(seed)
+        n = len(data)
+        if kind == 'bootstrap':
+            return reduce(data[rng.integers(0, n, (rows, n))], axis=-1)
+        if kind == 'sign':
+            return reduce(data * rng.choice(np.array([-1.0, 1.0]), (rows, n)), axis=-1)
+        # Shuffling the values themselves avoids a separate gather through an index matrix
+        pooled = rng.permuted(np.broadcast_to(data, (rows, n)), axis=-1)
+        return reduce(pooled[:, :split], axis=-1) - reduce(pooled[:, split:], axis=-1)
+    finally:
+        if block is not None:
+            del data
+            block.close()
+
+
+def _resample(kind: str, data: np.ndarray, statistic: Statistic, resamples: int,
+              seed: Union[None, int, np.random.SeedSequence], workers: Optional[int],
+              chunk_bytes: int, split: int = 0) -> np.ndarray:
+    """Run resamples in chunks of at most chunk_bytes, optionally across processes."""
+    if resamples < 1:
+        raise ValueError("resamples must be at least 1")
+    n = len(data)
+    rows = int(min(resamples, max(1, chunk_bytes // (_BYTES_PER_ELEMENT * n))))
+    sizes = [rows] * (resamples // rows) + ([resamples % rows] if resamples % rows else [])
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = root.spawn(len(sizes))
+
+    if not workers or workers < 2 or len(sizes) < 2:
+        return np.concatenate([_resample_chunk(kind, data, statistic, size, chunk_seed, split)
+                               for size, chunk_seed in zip(sizes, seeds)])
+
+    # Workers read the data from shared memory instead of receiving a copy per chunk
+    block = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+    try:
+        shared = np.ndarray(data.shape, dtype=float, buffer=block.buf)
+        shared[:] = data
+        count = len(sizes)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_resample_chunk, [kind] * count, [(block.name, n)] * count,
+                                  [statistic] * count, sizes, seeds, [split] * count,
+                                  chunksize=max(1, count // (4 * workers))))
+        del shared
+    finally:
+        block.close()
+        block.unlink()
+    return np.concatenate(parts)
+
+
+def _as_sample(data: ArrayLike, minimum: int = 2) -> np.ndarray:
+    values = np.asarray(data, dtype=float).ravel()
+    if values.size < minimum:
+        raise ValueError(f"Resampling requires at least {minimum} values")
+    return values
+
+
+def _jackknife(data: np.ndarray, statistic: Statistic, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Leave-one-out values (closed form for mean/var/std, delete-a-group otherwise)
+    Groups are drawn at random from seed, so the result does not depend on
+    the order of the data.
+    """
+    n = len(data)
+    if statistic == 'mean':
+        return (data.sum() - data) / (n - 1)
+    if statistic in ('var', 'std') and n > 2:
+        deviations = data - data.mean()
+        s1, s2 = deviations.sum(), (deviations * deviations).sum()
+        rest = s1 - deviations
+        variance = (s2 - deviations * deviations - rest * rest / (n - 1)) / (n - 2)
+        return variance if statistic == 'var' else np.sqrt(variance)
+    reduce = _statistic(statistic)
+    groups = np.array_split(np.random.default_rng(seed).permutation(n), min(n, JACKKNIFE_GROUPS))
+    return np.array([reduce(np.delete(data, group), axis=-1) for group in groups])
+
+
+class Resampling:
+    @staticmethod
+    def bootstrap(data: ArrayLike, statistic: Statistic = 'mean', resamples: int = 9999,
+                  seed: Optional[int] = None, workers: Optional[int] = None,
+                  chunk_bytes: int = 64 * 1024 * 1024) -> np.ndarray:
+        """
+        Bootstrap distribution of a statistic
+        Args:
+            data: Sample values
+            statistic: 'mean', 'median', 'std', 'var', or a function called as
+                       statistic(matrix, axis=-1) on (rows, n) resample matrices
+            resamples: Number of bootstrap resamples
+            seed: Seed for reproducible results (the same for any number of workers)
+            workers: Number of processes (None = single process); a function
+                     statistic must then be picklable
+            chunk_bytes: Working memory per chunk of resamples
+        Returns:
+            Array of the statistic for each resample
+        """
+        data = _as_sample(data)
+        _statistic(statistic)
+        return _resample('bootstrap', data, statistic, resamples, seed, workers, chunk_bytes)
+
+    @staticmethod
+    def confidence_interval(data: ArrayLike, statistic: Statistic = 'mean', confidence: float = 0.95,
+                            method: str = 'bca', resamples: int = 9999, seed: Optional[int] = None,
+                            workers: Optional[int] = None,
+                            chunk_bytes: int = 64 * 1024 * 1024) -> Tuple[float, float]:
+        """
+        Bootstrap confidence interval of a statistic
+        Args:
+            data: Sample values
+            statistic: Statistic name or function (see bootstrap)
+            confidence: Confidence level (0 to 1)
+            method: 'percentile' or 'bca' (bias-corrected and accelerated)
+            resamples: Number of bootstrap resamples
+            seed: Seed for reproducible results
+            workers: Number of processes (None = single process)
+            chunk_bytes: Working memory per chunk of resamples
+        Returns:
+            Tuple of (lower bound, upper bound)
+        Raises:
+            ValueError: If the method or confidence is invalid, or BCa is
+                        undefined because every resample lies on one side of the estimate
+        """
+        if method not in ('percentile', 'bca'):
+            raise ValueError("Invalid method. Choose 'percentile' or 'bca'")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        data = _as_sample(data)
+        _statistic(statistic)
+        # One seed sequence for the resamples and the jackknife groups
+        root = np.random.SeedSequence(seed)
+        distribution = _resample('bootstrap', data, statistic, resamples, root, workers, chunk_bytes)
+        alpha = (1 - confidence) / 2
+        levels = np.array([alpha, 1 - alpha])
+
+        if method == 'bca':
+            estimate = _statistic(statistic)(data, axis=-1)
+            below = np.mean(distribution < estimate) + 0.5 * np.mean(distribution == estimate)
+            if below <= 0 or below >= 1:
+                raise ValueError("BCa interval is undefined: all bootstrap statistics lie on one "
+                                 "side of the estimate; use method='percentile'")
+            bias = special.ndtri(below)
+            jackknife = _jackknife(data, statistic, root.spawn(1)[0])
+            deviations = jackknife.mean() - jackknife
+            spread = np.sum(deviations ** 2)
+            acceleration = np.sum(deviations ** 3) / (6 * spread ** 1.5) if spread > 0 else 0.0
+            z = special.ndtri(levels)
+            levels = special.ndtr(bias + (bias + z) / (1 - acceleration * (bias + z)))
+
+        lower, upper = np.quantile(distribution, levels)
+        return float(lower), float(upper)
+
+    @staticmethod
+    def permutation_test(sample1: ArrayLike, sample2: Optional[ArrayLike] = None,
+                         statistic: Statistic = 'mean', resamples: int = 9999,
+                         alternative: str = 'two-sided', seed: Optional[int] = None,
+                         workers: Optional[int] = None,
+                         chunk_bytes: int = 64 * 1024 * 1024) -> dict:
+        """
+        Permutation test of a difference in a statistic
+        With two samples, the pooled values are shuffled and the statistic of
+        the first len(sample1) values is compared with that of the rest. With
+        one sample, signs are flipped at random to test symmetry about zero
+        (the statistic should then be 'mean' or another odd function).
+        Args:
+            sample1: First sample
+            sample2: Second sample (optional)
+            statistic: Statistic name or function (see bootstrap)
+            resamples: Number of random permutations
+            alternative: 'two-sided', 'greater' or 'less'
+            seed: Seed for reproducible results
+            workers: Number of processes (None = single process)
+            chunk_bytes: Working memory per chunk of permutations
+        Returns:
+            Dictionary with the observed 'statistic', its 'p_value' and 'resamples'
+        """
+        if alternative not in ('two-sided', 'greater', 'less'):
+            raise ValueError("Invalid alternative. Choose 'two-sided', 'greater', or 'less'")
+        reduce = _statistic(statistic)
+        first = _as_sample(sample1, 1)
+        if sample2 is None:
+            observed = reduce(first, axis=-1)
+            null = _resample('sign', first, statistic, resamples, seed, workers, chunk_bytes)
+        else:
+            second = _as_sample(sample2, 1)
+            observed = reduce(first, axis=-1) - reduce(second, axis=-1)
+            null = _resample('permutation', np.concatenate([first, second]), statistic,
+                             resamples, seed, workers, chunk_bytes, split=len(first))
+
+        # Relative tolerance so permutations equal to the observed value count as extreme
+        tolerance = 1e-12 * max(1.0, abs(observed))
+        if alternative == 'greater':
+            extreme = np.count_nonzero(null >= observed - tolerance)
+        elif alternative == 'less':
+            extreme = np.count_nonzero(null <= observed + tolerance)
+        else:
+            extreme = np.count_nonzero(np.abs(null) >= abs(observed) - tolerance)
+        return {
+            'statistic': float(observed),
+            'p_value': float((extreme + 1) / (resamples + 1)),
+            'resamples': resamples
+        }
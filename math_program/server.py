@@ -0,0 +1,288 @@
+"""
+Server Module
+Asyncio HTTP/JSON service exposing the math modules, backed by a process pool.
+"""
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Tuple
+from batch import BatchRunner
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+            422: 'Unprocessable Entity', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+def _run_jobs(jobs: List[dict]) -> List[Tuple[bool, Any]]:
+    """Process-pool worker: run a coalesced batch of jobs, capturing errors per job."""
+    results = []
+    for job in jobs:
+        try:
+            results.append((True, BatchRunner.run_job(job)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _init_worker(cache_options: Optional[dict]):
+    """Process-pool initializer: enable result caching in the worker."""
+    if cache_options is not None:
+        import memoize
+        memoize.enable_modules(**cache_options)
+
+
+class ServerOverloaded(Exception):
+    """Raised when the number of pending jobs reaches the back-pressure limit."""
+
+
+class MathServer:
+    """
+    HTTP/JSON front end for BasicMath, Algebra, Calculus and Statistics
+    Routes:
+        GET  /health               -> {"status": "ok", "pending": n}
+        POST /<module>/<function>  body {"args": [...], "kwargs": {...}}
+        POST /batch                body [job, ...] in the batch-file job format
+    Jobs are queued and coalesced into groups that are sent to the process
+    pool together, so the event loop never runs math itself.
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port, see self.port after start)
+        workers: Number of pool processes (None = CPU count)
+        batch_size: Maximum number of jobs sent to a worker at once
+        batch_window: Seconds to wait for more jobs before dispatching a partial batch
+        max_pending: Queued and running jobs beyond which requests get 503; a
+                     job that timed out counts until its batch leaves the pool
+        timeout: Per-request timeout in seconds (504 when exceeded)
+        max_body: Largest accepted request body in bytes
+        cache_options: memoize.enable options for each worker (None = no caching);
+                       with a path, workers share results through the disk cache
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, workers: Optional[int] = None,
+                 batch_size: int = 32, batch_window: float = 0.002, max_pending: int = 1024,
+                 timeout: float = 30.0, max_body: int = 16 * 1024 * 1024,
+                 cache_options: Optional[dict] = None):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_body = max_body
+        self.cache_options = cache_options
+        self.pending = 0
+        self._encoder = json.JSONEncoder(default=BatchRunner.to_json)
+        self._pool = None
+        self._queue = None
+        self._dispatcher = None
+        self._server = None
+        self._tasks = set()
+
+    async def start(self):
+        """Start the worker pool, the batch dispatcher and the listening socket."""
+        # Plain fork would hand open client sockets to workers started mid-request,
+        # keeping connections alive after the server closes them
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                         initializer=_init_worker, initargs=(self.cache_options,))
+        # Warm the pool so the first requests do not pay for worker start-up
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _run_jobs, [])
+                               for _ in range(self.workers or 1)))
+        self._queue = asyncio.Queue()
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop accepting connections and shut down the dispatcher and pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    async def serve_forever(self):
+        """Start the server and run until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def submit(self, job: dict) -> Any:
+        """
+        Queue one job and wait for its result
+        Args:
+            job: Job dictionary as accepted by BatchRunner.run_job
+        Returns:
+            Result of the job
+        Raises:
+            ServerOverloaded: If max_pending jobs are already queued or running
+            asyncio.TimeoutError: If the job does not finish within timeout
+            ValueError: If the job itself failed
+        """
+        if self.pending >= self.max_pending:
+            raise ServerOverloaded("Too many pending requests")
+        # Released by _execute once the job's batch has left the pool, so jobs
+        # that time out still count while a worker is busy with them
+        self.pending += 1
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((job, future))
+        ok, value = await asyncio.wait_for(future, self.timeout)
+        if not ok:
+            raise ValueError(value)
+        return value
+
+    async def _dispatch(self):
+        """Collect queued jobs into batches of up to batch_size within batch_window."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and self._queue.empty():
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), max(remaining, 0)))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.ensure_future(self._execute(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, batch: List[Tuple[dict, asyncio.Future]]):
+        """Run one batch in the pool, resolve each request's future and release its jobs."""
+        # Requests that already timed out are dropped before reaching a worker
+        live = [(job, future) for job, future in batch if not future.done()]
+        self.pending -= len(batch) - len(live)
+        if not live:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._pool, _run_jobs, [job for job, _ in live])
+        except Exception as e:
+            results = [(False, f"{type(e).__name__}: {e}")] * len(live)
+        finally:
+            self.pending -= len(live)
+        for (_, future), result in zip(live, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection, honouring keep-alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'ok': False, 'error': 'Malformed request line'})
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = headers.get('content-length', '') or '0'
+                # Digits only: int() would also take signs, spaces and underscores
+                if not (length.isascii() and length.isdigit()):
+                    await self._respond(writer, 400, {'ok': False, 'error': 'Invalid Content-Length'})
+                    break
+                length = int(length)
+                if length > self.max_body:
+                    await self._respond(writer, 413, {'ok': False, 'error': 'Request body too large'})
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self._route(method, path, body)
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Map a request to a status code and JSON payload."""
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if method == 'GET' and parts == ['health']:
+            return 200, {'status': 'ok', 'pending': self.pending}
+        if method != 'POST' or not 1 <= len(parts) <= 2:
+            return 404, {'ok': False, 'error': f"No route for {method} {path}"}
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError as e:
+            return 400, {'ok': False, 'error': f"Invalid JSON: {e}"}
+
+        if parts == ['batch']:
+            if not isinstance(request, list):
+                return 400, {'ok': False, 'error': "Batch body must be a JSON array of jobs"}
+            outcomes = await asyncio.gather(*(self._outcome(job) for job in request))
+            return 200, [{'id': job.get('id', index) if isinstance(job, dict) else index, **record}
+                         for index, (job, (_, record)) in enumerate(zip(request, outcomes))]
+        if len(parts) != 2 or not isinstance(request, dict):
+            return 404 if len(parts) != 2 else 400, {'ok': False, 'error': "Expected /<module>/<function>"}
+
+        job = {'module': parts[0], 'function': parts[1],
+               'args': request.get('args', []), 'kwargs': request.get('kwargs', {})}
+        return await self._outcome(job)
+
+    async def _outcome(self, job: Any) -> Tuple[int, dict]:
+        """Run a job and return its HTTP status and response record."""
+        try:
+            return 200, {'ok': True, 'result': await self.submit(job)}
+        except ServerOverloaded as e:
+            return 503, {'ok': False, 'error': str(e)}
+        except asyncio.TimeoutError:
+            return 504, {'ok': False, 'error': f"Timed out after {self.timeout}s"}
+        except ValueError as e:
+            return 422, {'ok': False, 'error': str(e)}
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Any,
+                       keep_alive: bool = False):
+        """Write a JSON HTTP response."""
+        try:
+            body = self._encoder.encode(payload).encode()
+        except TypeError as e:
+            status, body = 422, json.dumps({'ok': False, 'error': str(e)}).encode()
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    @staticmethod
+    def main(host: str = '127.0.0.1', port: int = 8080, workers: Optional[int] = None,
+             cache_options: Optional[dict] = None) -> int:
+        """
+        Run the server from the command line until interrupted
+        Args:
+            host: Interface to bind
+            port: Port to bind
+            workers: Number of pool processes
+            cache_options: Result caching options for the workers (None = off)
+        Returns:
+            Process exit code
+        """
+        server = MathServer(host, port, workers, cache_options=cache_options)
+        print(f"Serving on http://{host}:{port} (Ctrl+C to stop)")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
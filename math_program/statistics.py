@@ -1,142 +1,714 @@
-"""
-Statistics Module
-Contains statistical calculations, probability functions, and data analysis tools.
-"""
-import numpy as np
-from typing import List, Union, Tuple
-from scipy import stats
-
-class Statistics:
-    @staticmethod
-    def descriptive_stats(data: List[float]) -> dict:
-        """
-        Calculate comprehensive descriptive statistics for a dataset
-        Args:
-            data: List of numerical values
-        Returns:
-            Dictionary containing various statistical measures
-        """
-        return {
-            'mean': np.mean(data),
-            'median': np.median(data),
-            'mode': stats.mode(data, keepdims=True)[0][0],
-            'std_dev': np.std(data),
-            'variance': np.var(data),
-            'min': np.min(data),
-            'max': np.max(data),
-            'range': np.max(data) - np.min(data),
-            'q1': np.percentile(data, 25),
-            'q3': np.percentile(data, 75),
-            'iqr': np.percentile(data, 75) - np.percentile(data, 25),
-            'skewness': stats.skew(data),
-            'kurtosis': stats.kurtosis(data)
-        }
-
-    @staticmethod
-    def correlation_analysis(x: List[float], y: List[float]) -> dict:
-        """
-        Perform correlation analysis between two variables
-        Args:
-            x: First dataset
-            y: Second dataset
-        Returns:
-            Dictionary containing correlation coefficients and p-values
-        """
-        pearson_corr, pearson_p = stats.pearsonr(x, y)
-        spearman_corr, spearman_p = stats.spearmanr(x, y)
-        
-        return {
-            'pearson_correlation': pearson_corr,
-            'pearson_p_value': pearson_p,
-            'spearman_correlation': spearman_corr,
-            'spearman_p_value': spearman_p
-        }
-
-    @staticmethod
-    def hypothesis_testing(sample1: List[float], sample2: List[float] = None, 
-                         test_type: str = 't_test', alpha: float = 0.05) -> dict:
-        """
-        Perform various statistical hypothesis tests
-        Args:
-            sample1: First sample data
-            sample2: Second sample data (optional)
-            test_type: Type of test ('t_test', 'wilcoxon', 'mann_whitney')
-            alpha: Significance level
-        Returns:
-            Dictionary containing test results
-        """
-        if test_type == 't_test':
-            if sample2 is None:
-                # One-sample t-test against mean=0
-                t_stat, p_value = stats.ttest_1samp(sample1, 0)
-                test_name = "One-sample t-test"
-            else:
-                # Two-sample t-test
-                t_stat, p_value = stats.ttest_ind(sample1, sample2)
-                test_name = "Two-sample t-test"
-        elif test_type == 'wilcoxon':
-            if sample2 is None:
-                # Wilcoxon signed-rank test
-                t_stat, p_value = stats.wilcoxon(sample1)
-                test_name = "Wilcoxon signed-rank test"
-            else:
-                raise ValueError("Wilcoxon test requires only one sample")
-        elif test_type == 'mann_whitney':
-            if sample2 is not None:
-                # Mann-Whitney U test
-                t_stat, p_value = stats.mannwhitneyu(sample1, sample2)
-                test_name = "Mann-Whitney U test"
-            else:
-                raise ValueError("Mann-Whitney U test requires two samples")
-        else:
-            raise ValueError("Invalid test type")
-
-        return {
-            'test_name': test_name,
-            'statistic': t_stat,
-            'p_value': p_value,
-            'significant': p_value < alpha
-        }
-
-    @staticmethod
-    def probability_distribution(dist_type: str, **params) -> Tuple[np.ndarray, np.ndarray]:
-        """
-        Generate probability distribution
-        Args:
-            dist_type: Type of distribution ('normal', 'uniform', 'poisson', etc.)
-            **params: Distribution parameters
-        Returns:
-            Tuple of (x values, probability values)
-        """
-        if dist_type == 'normal':
-            mu = params.get('mu', 0)
-            sigma = params.get('sigma', 1)
-            x = np.linspace(mu - 4*sigma, mu + 4*sigma, 100)
-            y = stats.norm.pdf(x, mu, sigma)
-        elif dist_type == 'uniform':
-            a = params.get('a', 0)
-            b = params.get('b', 1)
-            x = np.linspace(a - 0.1*(b-a), b + 0.1*(b-a), 100)
-            y = stats.uniform.pdf(x, a, b-a)
-        elif dist_type == 'poisson':
-            mu = params.get('mu', 1)
-            x = np.arange(0, mu*3)
-            y = stats.poisson.pmf(x, mu)
-        else:
-            raise ValueError("Unsupported distribution type")
-            
-        return x, y
-
-    @staticmethod
-    def confidence_interval(data: List[float], confidence: float = 0.95) -> Tuple[float, float]:
-        """
-        Calculate confidence interval for the mean
-        Args:
-            data: Sample data
-            confidence: Confidence level (0 to 1)
-        Returns:
-            Tuple of (lower bound, upper bound)
-        """
-        mean = np.mean(data)
-        sem = stats.sem(data)
-        return stats.t.interval(confidence, len(data)-1, mean, sem)
+"""
+Statistics Module
+Contains statistical calculations, probability functions, and data analysis tools.
+"""
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Union, Tuple
+from datasets import Dataset, QuantileSketch
+from distributions import Distributions
+from resampling import Resampling
+from lazy import lazy_import
+
+# scipy.stats is the slowest import in the package; load it on first use
+stats = lazy_import('scipy.stats')
+
+# Multiple-testing corrections of batch_hypothesis_testing (None leaves p-values as they are)
+CORRECTIONS = ('benjamini_hochberg', 'bonferroni')
+
+
+def _shared_block_stats(name: str, shape: Tuple[int, int], start: int, stop: int) -> dict:
+    """Process-pool worker: descriptive stats for rows start:stop of a shared (k, n) block."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        columns = np.ndarray(shape, dtype=float, buffer=block.buf)
+        return Statistics._sorted_stats(np.sort(columns[start:stop], axis=-1))
+    finally:
+        block.close()
+
+
+class Statistics:
+    @staticmethod
+    def descriptive_stats(data: List[float]) -> dict:
+        """
+        Calculate comprehensive descriptive statistics for a dataset
+        The input is converted and sorted once; order statistics and the mode
+        come from the sorted copy and the moments from its deviations.
+        Args:
+            data: List of numerical values, or a Dataset to process in bounded-memory
+                  chunks (quantiles are then sketch estimates and 'mode' is omitted)
+        Returns:
+            Dictionary containing various statistical measures
+        """
+        if isinstance(data, Dataset):
+            return Statistics._chunked_descriptive_stats(data)
+        values = np.sort(np.asarray(data, dtype=float).ravel())
+        if values.size == 0:
+            raise ValueError("Cannot compute statistics of an empty dataset")
+        return Statistics._sorted_stats(values)
+
+    @staticmethod
+    def _sorted_stats(values: np.ndarray) -> dict:
+        """Descriptive statistics of data sorted along its last axis (one row per column)."""
+        mean = values.mean(axis=-1)
+        deviations = values - mean[..., None]
+        squared = deviations * deviations
+        m2 = squared.mean(axis=-1)
+        m3 = (squared * deviations).mean(axis=-1)
+        m4 = (squared * squared).mean(axis=-1)
+        q1, median, q3 = Statistics._sorted_quantiles(values, [0.25, 0.5, 0.75])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skewness = np.where(m2 > 0, m3 / m2 ** 1.5, np.nan)
+            kurtosis = np.where(m2 > 0, m4 / m2 ** 2 - 3.0, np.nan)
+
+        result = {
+            'mean': mean,
+            'median': median,
+            'mode': np.apply_along_axis(Statistics._sorted_mode, -1, values),
+            'std_dev': np.sqrt(m2),
+            'variance': m2,
+            'min': values[..., 0],
+            'max': values[..., -1],
+            'range': values[..., -1] - values[..., 0],
+            'q1': q1,
+            'q3': q3,
+            'iqr': q3 - q1,
+            'skewness': skewness,
+            'kurtosis': kurtosis
+        }
+        # 0-d arrays become NumPy scalars for single datasets
+        return {key: value[()] for key, value in result.items()}
+
+    @staticmethod
+    def batch_descriptive_stats(data: Union[np.ndarray, Dict[str, List[float]]],
+                                workers: Optional[int] = None) -> dict:
+        """
+        Calculate descriptive statistics for many columns at once
+        Args:
+            data: 2-D array of shape (samples, columns) or a dict of named columns
+            workers: Number of processes; columns are split into blocks that
+                     workers read from shared memory (None = single process)
+        Returns:
+            Columnar dictionary: 'column' holds the column names and every other
+            key holds an array with one value per column
+        """
+        names, columns = Statistics._as_columns(data)
+        if columns is None:
+            # Ragged columns cannot share one block; fall back to one call per column
+            rows = [Statistics.descriptive_stats(data[name]) for name in names]
+            result = {key: np.array([row[key] for row in rows]) for key in rows[0]}
+        elif not workers or workers < 2 or len(names) < 2:
+            result = Statistics._sorted_stats(np.sort(columns, axis=-1))
+        else:
+            result = Statistics._parallel_column_stats(columns, workers)
+        return {'column': names, **result}
+
+    @staticmethod
+    def _parallel_column_stats(columns: np.ndarray, workers: int) -> dict:
+        """Split a (k, n) column block across a process pool via shared memory."""
+        block = shared_memory.SharedMemory(create=True, size=max(1, columns.nbytes))
+        try:
+            shared = np.ndarray(columns.shape, dtype=float, buffer=block.buf)
+            shared[:] = columns
+            bounds = np.linspace(0, len(columns), min(workers, len(columns)) + 1).astype(int)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_shared_block_stats,
+                                      [block.name] * (len(bounds) - 1),
+                                      [columns.shape] * (len(bounds) - 1),
+                                      bounds[:-1], bounds[1:]))
+            del shared
+        finally:
+            block.close()
+            block.unlink()
+        return {key: np.concatenate([np.atleast_1d(part[key]) for part in parts])
+                for key in parts[0]}
+
+    @staticmethod
+    def correlation_matrix(data: Union[np.ndarray, Dict[str, List[float]]],
+                           method: str = 'pearson') -> dict:
+        """
+        Calculate all pairwise correlations between columns
+        Args:
+            data: 2-D array of shape (samples, columns) or a dict of equal-length columns
+            method: 'pearson' or 'spearman' (Pearson on average ranks)
+        Returns:
+            Dictionary with 'column' names and (columns x columns) arrays
+            'correlation' and 'p_value'; rows and columns of constant
+            columns are NaN
+        """
+        names, columns = Statistics._as_columns(data)
+        if columns is None:
+            raise ValueError("All columns must have the same length")
+        n = columns.shape[1]
+        if n < 3:
+            raise ValueError("Correlation analysis requires at least 3 samples per column")
+        if method == 'spearman':
+            columns = stats.rankdata(columns, axis=-1)
+        elif method != 'pearson':
+            raise ValueError("Invalid method. Choose 'pearson' or 'spearman'")
+
+        centered = columns - columns.mean(axis=-1, keepdims=True)
+        # A constant column would otherwise keep rounding noise from its mean
+        centered[np.ptp(columns, axis=-1) == 0] = 0.0
+        norms = np.linalg.norm(centered, axis=-1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized = centered / norms
+        correlation = np.clip(normalized @ normalized.T, -1.0, 1.0)
+        # Constant columns have no correlation, not even with themselves
+        diagonal = np.flatnonzero(norms[:, 0] > 0)
+        correlation[diagonal, diagonal] = 1.0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_stat = correlation * np.sqrt((n - 2) / (1.0 - correlation ** 2))
+        p_value = 2 * stats.t.sf(np.abs(t_stat), n - 2)
+        return {'column': names, 'correlation': correlation, 'p_value': p_value}
+
+    @staticmethod
+    def _as_columns(data) -> Tuple[list, Optional[np.ndarray]]:
+        """
+        Normalize batch input to column names and a C-contiguous (k, n) float array
+        The array is None when a dict holds columns of different lengths.
+        """
+        if isinstance(data, dict):
+            names = list(data)
+            if not names:
+                raise ValueError("No columns given")
+            if len({len(data[name]) for name in names}) > 1:
+                return names, None
+            columns = np.array([np.asarray(data[name], dtype=float) for name in names])
+            return names, columns
+        matrix = np.asarray(data, dtype=float)
+        if matrix.ndim != 2:
+            raise ValueError("Batch data must be a 2-D array of shape (samples, columns)")
+        return list(range(matrix.shape[1])), np.ascontiguousarray(matrix.T)
+
+    @staticmethod
+    def _chunked_descriptive_stats(data: Dataset) -> dict:
+        """descriptive_stats over a Dataset in one streaming pass."""
+        running = RunningStats()
+        sketch = QuantileSketch()
+        for chunk in data.chunks():
+            running.update(chunk)
+            sketch.update(chunk)
+        result = running.to_dict()
+        q1, median, q3 = sketch.quantile([0.25, 0.5, 0.75])
+        result.update({'median': median, 'q1': q1, 'q3': q3, 'iqr': q3 - q1})
+        return result
+
+    @staticmethod
+    def _sorted_quantiles(values: np.ndarray, q: List[float]) -> np.ndarray:
+        """Quantiles of data sorted along its last axis (linear interpolation, as np.percentile)."""
+        size = values.shape[-1]
+        position = np.asarray(q, dtype=float) * (size - 1)
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, size - 1)
+        fraction = position - lower
+        result = values[..., lower] + (values[..., upper] - values[..., lower]) * fraction
+        return np.moveaxis(result, -1, 0)
+
+    @staticmethod
+    def _sorted_mode(values: np.ndarray) -> float:
+        """Most frequent value of sorted data; ties go to the smallest, as scipy.stats.mode."""
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(values)) + 1])
+        counts = np.diff(np.concatenate([starts, [len(values)]]))
+        return values[starts[np.argmax(counts)]]
+
+    @staticmethod
+    def correlation_analysis(x: List[float], y: List[float]) -> dict:
+        """
+        Perform correlation analysis between two variables
+        Args:
+            x: First dataset (list, or a Dataset read in chunks together with y)
+            y: Second dataset of the same length and kind
+        Returns:
+            Dictionary containing correlation coefficients and p-values
+        """
+        if isinstance(x, Dataset) or isinstance(y, Dataset):
+            return Statistics._chunked_correlation(Statistics._as_dataset(x),
+                                                   Statistics._as_dataset(y))
+        pearson_corr, pearson_p = stats.pearsonr(x, y)
+        spearman_corr, spearman_p = stats.spearmanr(x, y)
+        
+        return {
+            'pearson_correlation': pearson_corr,
+            'pearson_p_value': pearson_p,
+            'spearman_correlation': spearman_corr,
+            'spearman_p_value': spearman_p
+        }
+
+    @staticmethod
+    def _as_dataset(data) -> Dataset:
+        """Wrap in-memory data so it can be chunked alongside a Dataset."""
+        return data if isinstance(data, Dataset) else Dataset(np.asarray(data, dtype=float))
+
+    @staticmethod
+    def _paired_chunks(x: Dataset, y: Dataset):
+        """Iterate over aligned chunks of two datasets of equal length."""
+        buffer_x, buffer_y = np.empty(0), np.empty(0)
+        chunks_x, chunks_y = x.chunks(), y.chunks()
+        done_x = done_y = False
+        while True:
+            # Top up whichever side is short, since chunk sizes may differ
+            if len(buffer_x) == 0 and not done_x:
+                chunk = next(chunks_x, None)
+                done_x = chunk is None
+                if not done_x:
+                    buffer_x = np.concatenate([buffer_x, chunk])
+            if len(buffer_y) < len(buffer_x) and not done_y:
+                chunk = next(chunks_y, None)
+                done_y = chunk is None
+                if not done_y:
+                    buffer_y = np.concatenate([buffer_y, chunk])
+                continue
+            size = min(len(buffer_x), len(buffer_y))
+            if size == 0:
+                break
+            yield buffer_x[:size], buffer_y[:size]
+            buffer_x, buffer_y = buffer_x[size:], buffer_y[size:]
+        if len(buffer_x) or len(buffer_y) or next(chunks_y, None) is not None:
+            raise ValueError("x and y must have the same length")
+
+    @staticmethod
+    def _chunked_correlation(x: Dataset, y: Dataset) -> dict:
+        """
+        correlation_analysis over two datasets in two streaming passes
+        The first pass collects means and quantile sketches; the second
+        accumulates co-moments of the values and of their sketch ranks, so
+        the Spearman coefficient is approximate.
+        """
+        running_x, running_y = RunningStats(), RunningStats()
+        sketch_x, sketch_y = QuantileSketch(), QuantileSketch()
+        for chunk_x, chunk_y in Statistics._paired_chunks(x, y):
+            running_x.update(chunk_x)
+            running_y.update(chunk_y)
+            sketch_x.update(chunk_x)
+            sketch_y.update(chunk_y)
+
+        n = running_x.count
+        if n < 3:
+            raise ValueError("Correlation analysis requires at least 3 paired values")
+        # Mid-ranks scaled to [0, 1] have mean 1/2, ties included
+        sums = np.zeros(6)
+        for chunk_x, chunk_y in Statistics._paired_chunks(x, y):
+            dx, dy = chunk_x - running_x.mean, chunk_y - running_y.mean
+            rx = sketch_x.mid_ranks(chunk_x) - 0.5
+            ry = sketch_y.mid_ranks(chunk_y) - 0.5
+            sums += [np.dot(dx, dy), np.dot(dx, dx), np.dot(dy, dy),
+                     np.dot(rx, ry), np.dot(rx, rx), np.dot(ry, ry)]
+
+        pearson_corr = sums[0] / np.sqrt(sums[1] * sums[2])
+        spearman_corr = sums[3] / np.sqrt(sums[4] * sums[5])
+        return {
+            'pearson_correlation': pearson_corr,
+            'pearson_p_value': Statistics._correlation_p_value(pearson_corr, n),
+            'spearman_correlation': spearman_corr,
+            'spearman_p_value': Statistics._correlation_p_value(spearman_corr, n)
+        }
+
+    @staticmethod
+    def _correlation_p_value(r: float, n: int) -> float:
+        """Two-sided p-value of a correlation coefficient via the t distribution."""
+        r = min(max(r, -1.0), 1.0)
+        if abs(r) == 1.0:
+            return 0.0
+        t_stat = r * np.sqrt((n - 2) / (1.0 - r * r))
+        return 2 * stats.t.sf(abs(t_stat), n - 2)
+
+    @staticmethod
+    def hypothesis_testing(sample1: List[float], sample2: List[float] = None, 
+                         test_type: str = 't_test', alpha: float = 0.05,
+                         resamples: int = 9999, seed: Optional[int] = None,
+                         workers: Optional[int] = None) -> dict:
+        """
+        Perform various statistical hypothesis tests
+        Args:
+            sample1: First sample data
+            sample2: Second sample data (optional)
+            test_type: Type of test ('t_test', 'wilcoxon', 'mann_whitney', or
+                       'permutation' for a difference in means; with one sample,
+                       a sign-flip test of a zero mean)
+            alpha: Significance level
+            resamples: Number of permutations (permutation test only)
+            seed: Seed for reproducible permutations
+            workers: Number of processes for the permutations (None = single process)
+        Returns:
+            Dictionary containing test results
+        See batch_hypothesis_testing to run many tests at once.
+        """
+        if test_type == 't_test':
+            if sample2 is None:
+                # One-sample t-test against mean=0
+                t_stat, p_value = stats.ttest_1samp(sample1, 0)
+                test_name = "One-sample t-test"
+            else:
+                # Two-sample t-test
+                t_stat, p_value = stats.ttest_ind(sample1, sample2)
+                test_name = "Two-sample t-test"
+        elif test_type == 'wilcoxon':
+            if sample2 is None:
+                # Wilcoxon signed-rank test
+                t_stat, p_value = stats.wilcoxon(sample1)
+                test_name = "Wilcoxon signed-rank test"
+            else:
+                raise ValueError("Wilcoxon test requires only one sample")
+        elif test_type == 'mann_whitney':
+            if sample2 is not None:
+                # Mann-Whitney U test
+                t_stat, p_value = stats.mannwhitneyu(sample1, sample2)
+                test_name = "Mann-Whitney U test"
+            else:
+                raise ValueError("Mann-Whitney U test requires two samples")
+        elif test_type == 'permutation':
+            result = Resampling.permutation_test(sample1, sample2, 'mean', resamples,
+                                                 seed=seed, workers=workers)
+            t_stat, p_value = result['statistic'], result['p_value']
+            test_name = ("Sign-flip permutation test" if sample2 is None
+                         else "Two-sample permutation test")
+        else:
+            raise ValueError("Invalid test type")
+
+        return {
+            'test_name': test_name,
+            'statistic': t_stat,
+            'p_value': p_value,
+            'significant': p_value < alpha
+        }
+
+    @staticmethod
+    def batch_hypothesis_testing(groups1, groups2=None, test_type: str = 't_test',
+                                 alpha: float = 0.05, correction: Optional[str] = 'benjamini_hochberg',
+                                 equal_var: bool = True, axis: int = 0) -> dict:
+        """
+        Run many independent tests at once with a multiple-testing correction
+        Groups are padded with NaN into one (tests, samples) matrix and every
+        test is computed by the same array operations, so the cost does not
+        grow with a Python loop over tests. NaN values are ignored.
+        Args:
+            groups1: First sample of each test: a 2-D array with samples along
+                     axis and one test per column, a list of (possibly ragged)
+                     sequences, or a dict of named sequences
+            groups2: Second sample of each test, in the same layout (optional);
+                     dicts are paired with groups1 by name
+            test_type: 't_test' (one-sample against mean 0, or two-sample) or
+                       'mann_whitney' (two samples; normal approximation with
+                       tie and continuity correction)
+            alpha: Significance level applied to the adjusted p-values
+            correction: 'benjamini_hochberg' (false discovery rate),
+                        'bonferroni' (family-wise error rate) or None
+            equal_var: Pooled-variance t-test; False for Welch's t-test
+            axis: Sample axis of 2-D array input
+        Returns:
+            Columnar dictionary: 'test_name', 'correction', 'column' (test
+            names) and arrays 'n1', 'n2', 'statistic', 'p_value', 'p_adjusted'
+            and 'significant' with one value per test. Tests with too few
+            values get NaN statistics and are left out of the correction.
+        """
+        if correction is not None and correction not in CORRECTIONS:
+            raise ValueError(f"Invalid correction. Choose from {', '.join(CORRECTIONS)} or None")
+        names, first = Statistics._as_groups(groups1, axis)
+        second = None
+        if groups2 is not None:
+            if isinstance(groups1, dict) and isinstance(groups2, dict):
+                # Named groups are paired by name, not by position
+                if set(groups2) != set(groups1):
+                    raise ValueError("groups1 and groups2 must have the same group names")
+                groups2 = {name: groups2[name] for name in groups1}
+            _, second = Statistics._as_groups(groups2, axis)
+            if len(second) != len(first):
+                raise ValueError("groups1 and groups2 must hold the same number of tests")
+
+        if test_type == 't_test':
+            statistic, p_value, n1, n2 = Statistics._batch_t_test(first, second, equal_var)
+            test_name = ("One-sample t-test" if second is None
+                         else "Two-sample t-test" if equal_var else "Welch's t-test")
+        elif test_type == 'mann_whitney':
+            if second is None:
+                raise ValueError("Mann-Whitney U test requires two samples")
+            statistic, p_value, n1, n2 = Statistics._batch_mann_whitney(first, second)
+            test_name = "Mann-Whitney U test"
+        else:
+            raise ValueError("Invalid test type. Choose 't_test' or 'mann_whitney'")
+
+        p_adjusted = Statistics._adjust_p_values(p_value, correction)
+        return {
+            'test_name': test_name,
+            'correction': correction,
+            'column': names,
+            'n1': n1,
+            'n2': n2,
+            'statistic': statistic,
+            'p_value': p_value,
+            'p_adjusted': p_adjusted,
+            'significant': p_adjusted < alpha
+        }
+
+    @staticmethod
+    def _as_groups(data, axis: int = 0) -> Tuple[list, np.ndarray]:
+        """Normalize batch test input to group names and a NaN-padded (tests, samples) array."""
+        if isinstance(data, dict):
+            names, groups = list(data), list(data.values())
+        elif isinstance(data, (list, tuple)):
+            names, groups = list(range(len(data))), data
+        else:
+            matrix = np.asarray(data, dtype=float)
+            if matrix.ndim != 2:
+                raise ValueError("Batch test data must be a 2-D array, a list of sequences or a dict")
+            matrix = np.moveaxis(matrix, axis, -1)
+            return list(range(len(matrix))), matrix
+        if not groups:
+            raise ValueError("No groups given")
+        lengths = np.array([len(group) for group in groups])
+        padded = np.full((len(groups), max(1, lengths.max())), np.nan)
+        # One concatenate and one masked assignment fill every row
+        padded[np.arange(padded.shape[1]) < lengths[:, None]] = np.concatenate(
+            [np.asarray(group, dtype=float).ravel() for group in groups])
+        return names, padded
+
+    @staticmethod
+    def _group_moments(groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Count, mean and sample variance of each row, ignoring NaN."""
+        valid = ~np.isnan(groups)
+        n = valid.sum(axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(valid, groups, 0.0).sum(axis=-1) / n
+            deviations = np.where(valid, groups - mean[:, None], 0.0)
+            variance = (deviations * deviations).sum(axis=-1) / (n - 1)
+        return n, mean, variance
+
+    @staticmethod
+    def _batch_t_test(first: np.ndarray, second: Optional[np.ndarray],
+                      equal_var: bool) -> Tuple[np.ndarray, ...]:
+        """t statistics and two-sided p-values for each row (second=None: one-sample, mean 0)."""
+        n1, mean1, var1 = Statistics._group_moments(first)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if second is None:
+                n2 = np.zeros_like(n1)
+                t_stat = mean1 / np.sqrt(var1 / n1)
+                df = n1 - 1.0
+            else:
+                n2, mean2, var2 = Statistics._group_moments(second)
+                if equal_var:
+                    df = n1 + n2 - 2.0
+                    pooled = ((n1 - 1) * var1 + (n2 - 1) * var2) / df
+                    t_stat = (mean1 - mean2) / np.sqrt(pooled * (1.0 / n1 + 1.0 / n2))
+                else:
+                    se1, se2 = var1 / n1, var2 / n2
+                    t_stat = (mean1 - mean2) / np.sqrt(se1 + se2)
+                    df = (se1 + se2) ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+            df = np.where(df > 0, df, np.nan)
+        p_value = 2 * stats.t.sf(np.abs(t_stat), df)
+        return t_stat, p_value, n1, n2
+
+    @staticmethod
+    def _batch_mann_whitney(first: np.ndarray, second: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """U statistics of first and asymptotic two-sided p-values for each row."""
+        combined = np.concatenate([first, second], axis=-1)
+        rows, width = combined.shape
+        # NaN padding sorts last, so each row's valid values take ranks 1..n1+n2
+        order = np.argsort(combined, axis=-1, kind='stable')
+        ordered = np.take_along_axis(combined, order, axis=-1)
+        starts = np.ones(ordered.shape, dtype=bool)
+        starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        # Tied runs across the flattened matrix; rows always start a new run
+        flat_starts = np.flatnonzero(starts)
+        counts = np.diff(np.append(flat_starts, starts.size))
+        average = flat_starts % width + (counts + 1) / 2.0
+        ranks = average[np.cumsum(starts) - 1].reshape(rows, width)
+
+        valid = ~np.isnan(ordered)
+        n1 = (~np.isnan(first)).sum(axis=-1)
+        n2 = (~np.isnan(second)).sum(axis=-1)
+        in_first = (order < first.shape[1]) & valid
+        u1 = (ranks * in_first).sum(axis=-1) - n1 * (n1 + 1) / 2.0
+
+        # Runs of NaN padding have one element each and add nothing to the tie term
+        run_rows = flat_starts // width
+        ties = np.bincount(run_rows, weights=counts ** 3.0 - counts, minlength=rows)
+        n = n1 + n2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+            u = np.maximum(u1, n1 * n2 - u1)
+            z = (u - n1 * n2 / 2.0 - 0.5) / np.sqrt(variance)
+        p_value = np.clip(2 * stats.norm.sf(z), 0.0, 1.0)
+        empty = (n1 == 0) | (n2 == 0)
+        u1[empty] = np.nan
+        p_value[empty] = np.nan
+        return u1, p_value, n1, n2
+
+    @staticmethod
+    def _adjust_p_values(p_value: np.ndarray, correction: Optional[str]) -> np.ndarray:
+        """Multiple-testing adjusted p-values over the tests with a finite p-value."""
+        adjusted = np.array(p_value, dtype=float)
+        finite = np.flatnonzero(np.isfinite(adjusted))
+        m = len(finite)
+        if correction is None or m == 0:
+            return adjusted
+        values = adjusted[finite]
+        if correction == 'bonferroni':
+            adjusted[finite] = np.minimum(values * m, 1.0)
+            return adjusted
+        order = np.argsort(values)
+        scaled = values[order] * m / np.arange(1, m + 1)
+        # Step-up: each adjusted p-value is the smallest scaled value at or above its rank
+        stepped = np.minimum.accumulate(scaled[::-1])[::-1]
+        adjusted[finite[order]] = np.minimum(stepped, 1.0)
+        return adjusted
+
+    @staticmethod
+    def probability_distribution(dist_type: str, **params) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate probability distribution
+        Args:
+            dist_type: Type of distribution ('normal', 'uniform', 'poisson'); see
+                       Distributions.table for more types and many parameter sets
+            **params: Distribution parameters (scalars)
+        Returns:
+            Tuple of (x values, probability values)
+        """
+        if dist_type not in ('normal', 'uniform', 'poisson'):
+            raise ValueError("Unsupported distribution type")
+        # Poisson covers its support up to the 1 - 1e-6 quantile, so small and
+        # non-integer means still get a full, non-empty range
+        table = Distributions.table(dist_type, 'pdf', points=100, **params)
+        return table['x'][0], table['values'][0]
+
+    @staticmethod
+    def confidence_interval(data: List[float], confidence: float = 0.95, method: str = 't',
+                            statistic: str = 'mean', resamples: int = 9999,
+                            seed: Optional[int] = None, workers: Optional[int] = None) -> Tuple[float, float]:
+        """
+        Calculate confidence interval for the mean (or another statistic when bootstrapping)
+        Args:
+            data: Sample data, or a Dataset to process in bounded-memory chunks
+                  (t interval only)
+            confidence: Confidence level (0 to 1)
+            method: 't' (Student t interval of the mean), or bootstrap 'percentile'
+                    or 'bca' (bias-corrected and accelerated)
+            statistic: Statistic to bootstrap: 'mean', 'median', 'std', 'var' or
+                       a function taking (array, axis)
+            resamples: Number of bootstrap resamples
+            seed: Seed for reproducible bootstrap intervals
+            workers: Number of processes for the resamples (None = single process)
+        Returns:
+            Tuple of (lower bound, upper bound)
+        """
+        if method in ('percentile', 'bca'):
+            if isinstance(data, Dataset):
+                raise ValueError("Bootstrap intervals need the sample in memory; use method='t' for a Dataset")
+            return Resampling.confidence_interval(data, statistic, confidence, method, resamples,
+                                                  seed, workers)
+        if method != 't':
+            raise ValueError("Invalid method. Choose 't', 'percentile', or 'bca'")
+        if isinstance(data, Dataset):
+            running = RunningStats()
+            for chunk in data.chunks():
+                running.update(chunk)
+            n = running.count
+            sem = np.sqrt(running.m2 / (n - 1) / n)
+            return stats.t.interval(confidence, n - 1, running.mean, sem)
+        mean = np.mean(data)
+        sem = stats.sem(data)
+        return stats.t.interval(confidence, len(data)-1, mean, sem)
+
+
+class RunningStats:
+    """
+    Online (streaming) accumulator for count, mean, variance, skewness,
+    kurtosis, min and max. Chunks are folded in with the pairwise update
+    of Chan et al. / Pebay, so states built on separate chunks or
+    processes can be merged exactly.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: Union[float, List[float], np.ndarray]) -> 'RunningStats':
+        """
+        Add a value or a chunk of values
+        Args:
+            values: Scalar or array-like chunk
+        Returns:
+            self, to allow chaining
+        """
+        chunk = np.asarray(values, dtype=float).ravel()
+        if chunk.size == 0:
+            return self
+        other = RunningStats()
+        other.count = chunk.size
+        other.mean = chunk.mean()
+        deviations = chunk - other.mean
+        squared = deviations * deviations
+        other.m2 = squared.sum()
+        other.m3 = (squared * deviations).sum()
+        other.m4 = (squared * squared).sum()
+        other.min = chunk.min()
+        other.max = chunk.max()
+        return self._combine(other)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        Combine two accumulators into a new one
+        Args:
+            other: Accumulator built on a different part of the data
+        Returns:
+            New RunningStats covering both inputs
+        """
+        merged = RunningStats()
+        merged._combine(self)
+        return merged._combine(other)
+
+    def _combine(self, other: 'RunningStats') -> 'RunningStats':
+        """Fold other's state into self in place."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+
+        m2 = self.m2 + other.m2 + delta * delta_n * na * nb
+        m3 = (self.m3 + other.m3
+              + delta * delta_n ** 2 * na * nb * (na - nb)
+              + 3.0 * delta_n * (na * other.m2 - nb * self.m2))
+        m4 = (self.m4 + other.m4
+              + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6.0 * delta_n ** 2 * (na * na * other.m2 + nb * nb * self.m2)
+              + 4.0 * delta_n * (na * other.m3 - nb * self.m3))
+
+        self.mean += delta_n * nb
+        self.count, self.m2, self.m3, self.m4 = n, m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def to_dict(self) -> dict:
+        """
+        Return the current statistics
+        Returns:
+            Dictionary with the moment-based measures of descriptive_stats
+        """
+        if self.count == 0:
+            raise ValueError("Cannot compute statistics of an empty dataset")
+        variance = self.m2 / self.count
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std_dev': np.sqrt(variance),
+            'variance': variance,
+            'min': self.min,
+            'max': self.max,
+            'range': self.max - self.min,
+            'skewness': self.m3 / self.count / variance ** 1.5 if variance > 0 else np.nan,
+            'kurtosis': self.m4 / self.count / variance ** 2 - 3.0 if variance > 0 else np.nan
+        }
@@ -0,0 +1,482 @@
+"""
+Symbolic Module
+Expression graphs with exact and simplifying constructors, symbolic
+differentiation and code generation that computes every shared subexpression once.
+"""
+import weakref
+import numpy as np
+from typing import Callable, Dict, List, Sequence
+
+# NumPy functions that may appear in a graph, by their canonical (NumPy) name
+FUNCTIONS: Dict[str, Callable] = {function.__name__: function for function in (
+    np.sin, np.cos, np.tan, np.arcsin, np.arccos, np.arctan,
+    np.sinh, np.cosh, np.tanh, np.arcsinh, np.arccosh, np.arctanh,
+    np.exp, np.exp2, np.expm1, np.log, np.log2, np.log10, np.log1p,
+    np.sqrt, np.cbrt, np.square, np.absolute, np.sign, np.floor, np.ceil,
+    np.arctan2, np.hypot, np.minimum, np.maximum, np.where,
+    np.logical_and, np.logical_or, np.logical_not,
+)}
+
+_OPERATORS = {'add': ('+', np.add), 'sub': ('-', np.subtract), 'mul': ('*', np.multiply),
+              'div': ('/', np.true_divide), 'pow': ('**', np.power), 'mod': ('%', np.mod)}
+_COMPARISONS = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+                '==': np.equal, '!=': np.not_equal}
+
+
+class Node:
+    """
+    Interned node of an expression graph
+    Nodes are created only through the constructor functions of this module,
+    which return the existing object for a structurally equal node, so shared
+    subexpressions are shared objects and equality is identity.
+    Args:
+        op: 'const', 'var', an operator in _OPERATORS, 'neg', 'call', 'cmp' or 'vector'
+        args: Child nodes, preceded by the function name or comparison symbol
+              for 'call' and 'cmp'; the value or name for 'const' and 'var'
+    """
+    __slots__ = ('op', 'args', '__weakref__')
+    _table = weakref.WeakValueDictionary()
+
+    def __init__(self, op: str, args: tuple):
+        self.op = op
+        self.args = args
+
+    @staticmethod
+    def make(op: str, *args) -> 'Node':
+        """Return the unique node for op and args."""
+        # Children are keyed by identity: a parent keeps its children alive,
+        # so their ids cannot be reused while the key is in the table
+        key = (op,) + tuple(id(arg) if isinstance(arg, Node) else (type(arg), arg) for arg in args)
+        node = Node._table.get(key)
+        if node is None:
+            node = Node(op, args)
+            Node._table[key] = node
+        return node
+
+    @property
+    def children(self) -> List['Node']:
+        return [arg for arg in self.args if isinstance(arg, Node)]
+
+    def __repr__(self) -> str:
+        return f"Node({to_source(self)!r})"
+
+
+def _value(node: Node):
+    """Value of a constant node, or None."""
+    return node.args[0] if node.op == 'const' else None
+
+
+def _is(node: Node, value: float) -> bool:
+    return node.op == 'const' and node.args[0] == value
+
+
+def _fold(function: Callable, *values):
+    """Evaluate a function of constants the way NumPy would; None if not finite."""
+    with np.errstate(all='ignore'):
+        result = function(*(np.asarray(value) for value in values))
+    if np.ndim(result) or np.asarray(result).dtype.kind not in 'fc' or not np.isfinite(result):
+        return None
+    return complex(result) if np.iscomplexobj(result) else float(result)
+
+
+def constant(value) -> Node:
+    """Numeric constant."""
+    return Node.make('const', complex(value) if isinstance(value, complex) else float(value))
+
+
+def variable(name: str) -> Node:
+    """Independent variable."""
+    return Node.make('var', name)
+
+
+ZERO = constant(0.0)
+ONE = constant(1.0)
+
+
+def _binary(op: str, a: Node, b: Node) -> Node:
+    if a.op == 'const' and b.op == 'const':
+        folded = _fold(_OPERATORS[op][1], a.args[0], b.args[0])
+        if folded is not None:
+            return constant(folded)
+    return Node.make(op, a, b)
+
+
+def operation(op: str, a: Node, b: Node = None) -> Node:
+    """
+    a <op> b for an operator in _OPERATORS, or -a for 'neg', exactly as written
+    Only constants are folded, so a formula's graph evaluates like the formula
+    itself under IEEE arithmetic (x/x is NaN at 0, 0*x is NaN at inf). The
+    simplifying constructors below are for derivative graphs.
+    """
+    if op == 'neg':
+        return constant(-a.args[0]) if a.op == 'const' else Node.make('neg', a)
+    if op not in _OPERATORS:
+        raise ValueError(f"Unknown operator '{op}'")
+    return _binary(op, a, b)
+
+
+def add(a: Node, b: Node) -> Node:
+    """a + b"""
+    if _is(a, 0):
+        return b
+    if _is(b, 0):
+        return a
+    if a is b:
+        return multiply(constant(2.0), a)
+    if b.op == 'neg':
+        return subtract(a, b.args[0])
+    if a.op == 'neg':
+        return subtract(b, a.args[0])
+    return _binary('add', a, b)
+
+
+def subtract(a: Node, b: Node) -> Node:
+    """a - b"""
+    if _is(b, 0):
+        return a
+    if _is(a, 0):
+        return negative(b)
+    if a is b:
+        return ZERO
+    if b.op == 'neg':
+        return add(a, b.args[0])
+    return _binary('sub', a, b)
+
+
+def multiply(a: Node, b: Node) -> Node:
+    """a * b"""
+    if b.op == 'const' and a.op != 'const':
+        # Constants go first so that c1 * (c2 * x) can be merged
+        a, b = b, a
+    if _is(a, 0):
+        return ZERO
+    if _is(a, 1):
+        return b
+    if _is(a, -1):
+        return negative(b)
+    if a.op == 'neg':
+        return negative(multiply(a.args[0], b))
+    if b.op == 'neg':
+        return negative(multiply(a, b.args[0]))
+    if a.op == 'const' and b.op == 'mul' and b.args[0].op == 'const':
+        return multiply(multiply(a, b.args[0]), b.args[1])
+    if a is b:
+        return power(a, constant(2.0))
+    return _binary('mul', a, b)
+
+
+def divide(a: Node, b: Node) -> Node:
+    """a / b"""
+    if _is(a, 0):
+        return ZERO
+    if _is(b, 1):
+        return a
+    if a is b:
+        return ONE
+    if a.op == 'neg':
+        return negative(divide(a.args[0], b))
+    return _binary('div', a, b)
+
+
+def power(a: Node, b: Node) -> Node:
+    """a ** b"""
+    if _is(b, 0) or _is(a, 1):
+        return ONE
+    if _is(b, 1):
+        return a
+    exponent = _value(b)
+    if (a.op == 'pow' and a.args[1].op == 'const' and isinstance(exponent, float)
+            and exponent.is_integer() and isinstance(a.args[1].args[0], float)
+            and a.args[1].args[0].is_integer()):
+        # (x**m)**n = x**(m*n) holds for integer m and n
+        return power(a.args[0], constant(exponent * a.args[1].args[0]))
+    return _binary('pow', a, b)
+
+
+def modulo(a: Node, b: Node) -> Node:
+    """a % b"""
+    return _binary('mod', a, b)
+
+
+def negative(a: Node) -> Node:
+    """-a"""
+    if a.op == 'const':
+        return constant(-a.args[0])
+    if a.op == 'neg':
+        return a.args[0]
+    if a.op == 'sub':
+        return subtract(a.args[1], a.args[0])
+    return Node.make('neg', a)
+
+
+def call(name: str, *args: Node) -> Node:
+    """name(*args) for a function in FUNCTIONS."""
+    if name not in FUNCTIONS:
+        raise ValueError(f"Unknown function '{name}'")
+    # where is the only function here that is not a ufunc
+    arity = getattr(FUNCTIONS[name], 'nin', 3)
+    if len(args) != arity:
+        raise ValueError(f"Function '{name}' takes {arity} argument(s), got {len(args)}")
+    if name == 'where' and args[1] is args[2]:
+        return args[1]
+    if all(arg.op == 'const' for arg in args):
+        folded = _fold(FUNCTIONS[name], *(arg.args[0] for arg in args))
+        if folded is not None:
+            return constant(folded)
+    return Node.make('call', name, *args)
+
+
+def compare(symbol: str, a: Node, b: Node) -> Node:
+    """Element-wise comparison a <symbol> b."""
+    if symbol not in _COMPARISONS:
+        raise ValueError(f"Unknown comparison '{symbol}'")
+    return Node.make('cmp', symbol, a, b)
+
+
+def vector(items: Sequence[Node]) -> Node:
+    """Several outputs computed together."""
+    return Node.make('vector', *items)
+
+
+def postorder(root: Node) -> List[Node]:
+    """Every distinct node reachable from root, children before parents."""
+    order, seen, stack = [], set(), [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node in seen:
+            continue
+        seen.add(node)
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.children) if child not in seen)
+    return order
+
+
+def _call_rule(node: Node, d: Dict[Node, Node]) -> Node:
+    """Chain rule for a function call, given the derivatives d of its arguments."""
+    name, args = node.args[0], node.args[1:]
+    if name in ('arctan2', 'hypot', 'minimum', 'maximum'):
+        (u, v), (du, dv) = args, (d[args[0]], d[args[1]])
+        if name == 'arctan2':
+            return divide(subtract(multiply(v, du), multiply(u, dv)),
+                          add(power(u, constant(2.0)), power(v, constant(2.0))))
+        if name == 'hypot':
+            return divide(add(multiply(u, du), multiply(v, dv)), node)
+        symbol = '<=' if name == 'minimum' else '>='
+        return call('where', compare(symbol, u, v), du, dv)
+    if name == 'where':
+        return call('where', args[0], d[args[1]], d[args[2]])
+    if name in ('sign', 'floor', 'ceil', 'logical_and', 'logical_or', 'logical_not'):
+        return ZERO
+
+    u = args[0]
+    du = d[u]
+    if du is ZERO:
+        return ZERO
+    two = constant(2.0)
+    rules = {
+        'sin': lambda: call('cos', u),
+        'cos': lambda: negative(call('sin', u)),
+        'tan': lambda: divide(ONE, power(call('cos', u), two)),
+        'arcsin': lambda: divide(ONE, call('sqrt', subtract(ONE, power(u, two)))),
+        'arccos': lambda: negative(divide(ONE, call('sqrt', subtract(ONE, power(u, two))))),
+        'arctan': lambda: divide(ONE, add(ONE, power(u, two))),
+        'sinh': lambda: call('cosh', u),
+        'cosh': lambda: call('sinh', u),
+        'tanh': lambda: divide(ONE, power(call('cosh', u), two)),
+        'arcsinh': lambda: divide(ONE, call('sqrt', add(power(u, two), ONE))),
+        'arccosh': lambda: divide(ONE, call('sqrt', subtract(power(u, two), ONE))),
+        'arctanh': lambda: divide(ONE, subtract(ONE, power(u, two))),
+        'exp': lambda: node,
+        'exp2': lambda: multiply(constant(np.log(2.0)), node),
+        'expm1': lambda: call('exp', u),
+        'log': lambda: divide(ONE, u),
+        'log2': lambda: divide(ONE, multiply(constant(np.log(2.0)), u)),
+        'log10': lambda: divide(ONE, multiply(constant(np.log(10.0)), u)),
+        'log1p': lambda: divide(ONE, add(ONE, u)),
+        'sqrt': lambda: divide(constant(0.5), node),
+        'cbrt': lambda: divide(ONE, multiply(constant(3.0), power(node, two))),
+        'square': lambda: multiply(two, u),
+        'absolute': lambda: call('sign', u),
+    }
+    return multiply(rules[name](), du)
+
+
+def differentiate(root: Node, name: str) -> Node:
+    """
+    Differentiate an expression graph
+    Each distinct node is differentiated once, so the result shares structure
+    with the input and stays compact for repeated differentiation.
+    Args:
+        root: Expression graph
+        name: Variable to differentiate with respect to
+    Returns:
+        Simplified graph of the derivative
+    """
+    d: Dict[Node, Node] = {}
+    for node in postorder(root):
+        op, args = node.op, node.args
+        if op == 'const':
+            d[node] = ZERO
+        elif op == 'var':
+            d[node] = ONE if args[0] == name else ZERO
+        elif op in ('add', 'sub'):
+            d[node] = (add if op == 'add' else subtract)(d[args[0]], d[args[1]])
+        elif op == 'mul':
+            u, v = args
+            d[node] = add(multiply(d[u], v), multiply(u, d[v]))
+        elif op == 'div':
+            u, v = args
+            d[node] = subtract(divide(d[u], v), divide(multiply(u, d[v]), power(v, constant(2.0))))
+        elif op == 'pow':
+            u, v = args
+            if d[v] is ZERO:
+                d[node] = multiply(multiply(v, power(u, subtract(v, ONE))), d[u])
+            else:
+                d[node] = multiply(node, add(multiply(d[v], call('log', u)),
+                                             divide(multiply(v, d[u]), u)))
+        elif op == 'mod':
+            u, v = args
+            d[node] = subtract(d[u], multiply(call('floor', divide(u, v)), d[v]))
+        elif op == 'neg':
+            d[node] = negative(d[args[0]])
+        elif op == 'call':
+            d[node] = _call_rule(node, d)
+        elif op == 'cmp':
+            d[node] = ZERO
+        else:
+            d[node] = vector([d[item] for item in args])
+    return d[root]
+
+
+def _literal(value) -> str:
+    """Python source for a constant; non-finite values use names bound at compile time."""
+    if isinstance(value, float) and not np.isfinite(value):
+        text = '_nan' if np.isnan(value) else '_inf'
+        return f"(-{text})" if value < 0 else text
+    text = repr(value)
+    return f"({text})" if text.startswith('-') else text
+
+
+def generate(root: Node, variables: Sequence[str]) -> Callable:
+    """
+    Compile an expression graph to a Python function of NumPy operations
+    Every distinct non-leaf node becomes one assignment, so a subexpression
+    shared by several parts of the graph is computed once per call.
+    Args:
+        root: Expression graph
+        variables: Argument names, in order; they must not start with _ or be
+                   names in FUNCTIONS, which the generated code uses itself
+    Returns:
+        Function taking one value per variable
+    """
+    names: Dict[Node, str] = {}
+    lines = []
+    for node in postorder(root):
+        op, args = node.op, node.args
+        if op == 'const':
+            names[node] = _literal(args[0])
+            continue
+        if op == 'var':
+            names[node] = args[0]
+            continue
+        if op in _OPERATORS:
+            code = f"{names[args[0]]} {_OPERATORS[op][0]} {names[args[1]]}"
+        elif op == 'neg':
+            code = f"-{names[args[0]]}"
+        elif op == 'call':
+            code = f"{args[0]}({', '.join(names[arg] for arg in args[1:])})"
+        elif op == 'cmp':
+            code = f"{names[args[1]]} {args[0]} {names[args[2]]}"
+        else:
+            code = f"[{', '.join(names[item] for item in args)}]"
+        names[node] = f"_t{len(lines)}"
+        lines.append(f"    {names[node]} = {code}")
+    # Only whitelisted operators, function names, variables and numeric
+    # literals can appear in the generated code
+    source = (f"def _expression({', '.join(variables)}):\n" + ''.join(line + '\n' for line in lines)
+              + f"    return {names[root]}\n")
+    namespace = {'__builtins__': {}, '_inf': float('inf'), '_nan': float('nan'), **FUNCTIONS}
+    exec(compile(source, '<expression>', 'exec'), namespace)
+    return namespace['_expression']
+
+
+def size(root: Node) -> int:
+    """Number of operations evaluated by the generated code."""
+    return sum(node.op not in ('const', 'var') for node in postorder(root))
+
+
+# Binding strength when printing; higher binds tighter
+_PRECEDENCE = {'or': 1, 'and': 2, 'not': 3, 'cmp': 4, 'add': 5, 'sub': 5, 'mul': 6, 'div': 6,
+               'mod': 6, 'neg': 7, 'pow': 8}
+_ATOM = 10
+
+
+class _TooLong(Exception):
+    pass
+
+
+def to_source(root: Node, limit: int = None) -> str:
+    """
+    Formula text for an expression graph, parseable by expressions.compile_expression
+    Args:
+        root: Expression graph
+        limit: Maximum length of the text (None = unlimited)
+    Returns:
+        Formula text
+    Raises:
+        ValueError: If the text would exceed limit (shared subexpressions are
+                    written out in full, so text can be much larger than the graph)
+    """
+    text: Dict[Node, tuple] = {}
+
+    def wrap(node: Node, minimum: int) -> str:
+        string, precedence = text[node]
+        return string if precedence >= minimum else f"({string})"
+
+    try:
+        for node in postorder(root):
+            op, args = node.op, node.args
+            if op == 'const':
+                value = args[0]
+                if not np.isfinite(value):
+                    string = 'nan' if np.isnan(value) else ('inf' if value.real > 0 else '-inf')
+                elif isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+                    string = str(int(value))
+                else:
+                    string = repr(value)
+                entry = (string, _PRECEDENCE['neg'] if string.startswith('-') else _ATOM)
+            elif op == 'var':
+                entry = (args[0], _ATOM)
+            elif op in _OPERATORS:
+                level = _PRECEDENCE[op]
+                if op == 'pow':
+                    # Right-associative: parenthesize a power on the left
+                    left, right = wrap(args[0], level + 1), wrap(args[1], level)
+                else:
+                    left, right = wrap(args[0], level), wrap(args[1], level + 1)
+                entry = (f"{left} {_OPERATORS[op][0]} {right}", level)
+            elif op == 'neg':
+                entry = (f"-{wrap(args[0], _PRECEDENCE['neg'])}", _PRECEDENCE['neg'])
+            elif op == 'call' and args[0] in ('logical_and', 'logical_or'):
+                word = args[0][len('logical_'):]
+                level = _PRECEDENCE[word]
+                entry = (f"{wrap(args[1], level + 1)} {word} {wrap(args[2], level + 1)}", level)
+            elif op == 'call' and args[0] == 'logical_not':
+                entry = (f"not {wrap(args[1], _PRECEDENCE['not'])}", _PRECEDENCE['not'])
+            elif op == 'call':
+                name = 'abs' if args[0] == 'absolute' else args[0]
+                entry = (f"{name}({', '.join(wrap(arg, 0) for arg in args[1:])})", _ATOM)
+            elif op == 'cmp':
+                level = _PRECEDENCE['cmp']
+                entry = (f"{wrap(args[1], level + 1)} {args[0]} {wrap(args[2], level + 1)}", level)
+            else:
+                entry = (f"[{', '.join(wrap(item, 0) for item in args)}]", _ATOM)
+            if limit is not None and len(entry[0]) > limit:
+                raise _TooLong
+            text[node] = entry
+    except _TooLong:
+        raise ValueError(f"Formula text is longer than {limit} characters")
+    return text[root][0]